@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Navegação em várias abas no mesmo Chrome
+Abre K abas na mesma sessão, dispara a navegação de cada uma sem esperar
+(window.location via JS) e colhe o JSON-LD da aba que terminar primeiro. A
+latência de rede se sobrepõe dentro de um único processo do navegador, sem o
+custo de memória de K Chromes. Todas as abas dividem os cookies, então um lote
+de abas é sempre de uma cidade só.
+"""
+
+import time
+
+from carrefour_comum import (
+    ESPERA_PRODUTO,
+    FALHA_BLOQUEIO,
+    FALHA_NAVEGACAO,
+    FALHA_SEM_JSONLD,
+    FALHA_SEM_PRECO,
+    FALHA_TIMEOUT,
+    JS_SONDA,
+    aplicar_bloqueio,
+    classificar_pagina,
+    extrair_produto,
+    registro,
+    sessao_viva,
+)
+from carrefour_ritmo import controle
+from carrefour_listagem import JS_LISTAGEM, eh_listagem, produtos_da_listagem, registros_da_listagem
+
+
+ABAS = 4
+
+# Marca o documento antigo antes de sair dele: enquanto a marca existir, a aba
+# ainda mostra a página anterior (vale mesmo com redirecionamento).
+JS_NAVEGAR = """
+document.documentElement.dataset.coletado = '1';
+window.location.href = arguments[0];
+"""
+
+JS_ESTADO = """
+if (!document.documentElement || document.documentElement.dataset.coletado) {
+    return {pendente: true};
+}
+// arguments[0]: página de busca -> devolve também o material da listagem
+if (arguments[0]) {
+    return {pendente: false, pronto: document.readyState, listagem: (function () {%s})()};
+}
+const sonda = (function () {%s})();
+return {pendente: false, pronto: document.readyState, produto: sonda.produto, pagina: sonda.pagina};
+""" % (JS_LISTAGEM, JS_SONDA)
+
+
+def _abrir_abas(driver, abas: int) -> list:
+    handles = [driver.current_window_handle]
+    while len(handles) < abas:
+        driver.switch_to.new_window("tab")
+        # o bloqueio do CDP vale só para a aba em que foi aplicado
+        aplicar_bloqueio(driver, "produto")
+        handles.append(driver.current_window_handle)
+    return handles
+
+
+def _fechar_extras(driver, handles: list):
+    for h in handles[1:]:
+        try:
+            driver.switch_to.window(h)
+            driver.close()
+        except Exception:
+            pass
+    try:
+        driver.switch_to.window(handles[0])
+    except Exception:
+        pass
+
+
+def _avaliar(estado: dict, decorrido: float, espera_max: float):
+    """
+    None = aba ainda carregando; senão (nome, preço) ou () quando desistiu.
+    Termina com preço > 0, ou no teto de espera com o que houver na página.
+    """
+    if not estado or estado.get("pendente"):
+        return None if decorrido < espera_max else ()
+    obj = estado.get("produto")
+    achado = extrair_produto(obj) if isinstance(obj, dict) else None
+    if achado and achado[1] > 0:
+        return achado
+    if decorrido < espera_max:
+        return None
+    return achado or ()
+
+
+def _avaliar_listagem(estado: dict, decorrido: float, espera_max: float, url: str):
+    """Como _avaliar, para páginas de busca: None = carregando; senão a lista de produtos."""
+    if not estado or estado.get("pendente"):
+        return None if decorrido < espera_max else []
+    dados = estado.get("listagem") or {}
+    produtos = produtos_da_listagem(dados.get("ld"), dados.get("estado"), url)
+    if produtos or decorrido >= espera_max:
+        return produtos
+    return None
+
+
+def coletar_abas(driver, proxima, entregar, cidade_tag: str,
+                 abas: int = ABAS, espera_max: float = ESPERA_PRODUTO, devolver=None) -> int:
+    """
+    proxima(): (índice, url) da próxima URL desta cidade, ou None para parar de
+    alimentar as abas (fila vazia, troca de cidade, hora de reciclar o Chrome).
+    entregar(índice, registro): chamado na ordem em que as abas terminam; para
+    páginas de busca o registro é a lista dos produtos listados.
+    devolver(índice, url) -> bool: se o driver cair, as URLs em voo são
+    oferecidas de volta à fila; as recusadas (ou sem devolver) saem como erro.
+    Retorna quantas páginas foram colhidas.
+    """
+    handles = _abrir_abas(driver, abas)
+    livres = list(handles)
+    ocupadas = {}  # handle -> (idx, url, início)
+    colhidas = 0
+    esgotado = False
+    aguardando = None  # item já tirado da fila, esperando vaga no controle de ritmo
+    try:
+        while True:
+            while livres and not esgotado:
+                item = aguardando or proxima()
+                if item is None:
+                    esgotado = True
+                    break
+                idx, url = item
+                # tentar() não bloqueia: as abas em voo seguem sendo colhidas
+                # enquanto a janela do Chrome está cheia ou em pausa
+                if not controle(url, "chrome").tentar():
+                    aguardando = item
+                    break
+                aguardando = None
+                h = livres.pop()
+                driver.switch_to.window(h)
+                print(f"\n🔗 [{cidade_tag}] {url}")
+                ocupadas[h] = (idx, url, time.monotonic())
+                driver.execute_script(JS_NAVEGAR, url)
+
+            if not ocupadas and aguardando is None:
+                break
+
+            terminou = False
+            for h, (idx, url, inicio) in list(ocupadas.items()):
+                driver.switch_to.window(h)
+                busca = eh_listagem(url)
+                try:
+                    estado = driver.execute_script(JS_ESTADO, busca)
+                except Exception:
+                    if not sessao_viva(driver):
+                        raise  # o Chrome caiu: não adianta esperar o teto das abas
+                    estado = None  # contexto trocando no meio da navegação
+                decorrido = time.monotonic() - inicio
+                carregou = bool(estado) and not estado.get("pendente")
+                # bloqueio/página de erro do site: a aba sai na hora, sem esperar o teto
+                classe = carregou and classificar_pagina(
+                    estado.get("pagina") or (estado.get("listagem") or {}).get("pagina"))
+                if classe:
+                    achado = [] if busca else ()
+                elif busca:
+                    achado = _avaliar_listagem(estado, decorrido, espera_max, url)
+                else:
+                    achado = _avaliar(estado, decorrido, espera_max)
+                if achado is None:
+                    continue
+                sinal = "ok" if achado else ("bloqueio" if classe == FALHA_BLOQUEIO else
+                                             "neutro" if carregou else "timeout")
+                controle(url, "chrome").liberar(sinal, decorrido)
+
+                falha = classe or (FALHA_SEM_JSONLD if carregou else FALHA_TIMEOUT)
+                if busca:
+                    print(f"✅ {len(achado)} produtos na listagem" if achado else f"⚠️ Nada listado nessa busca: {url}")
+                    rec = registros_da_listagem(achado, cidade_tag, url) or [registro(cidade_tag, url, falha=falha)]
+                elif achado:
+                    name, price = achado
+                    print("✅" if price > 0 else "⚠️ Produto sem preço:", name, "| R$", price)
+                    rec = registro(cidade_tag, url, name, price, None if price > 0 else FALHA_SEM_PRECO)
+                else:
+                    print(f"⚠️ Nada encontrado nessa URL: {url}")
+                    rec = registro(cidade_tag, url, falha=falha)
+                del ocupadas[h]
+                livres.append(h)
+                colhidas += 1
+                terminou = True
+                entregar(idx, rec)
+
+            if not terminou:
+                time.sleep(0.1)
+    except Exception:
+        # driver caiu: as URLs em voo voltam para a fila (ou saem como erro),
+        # quem chamou decide o resto
+        em_voo = [(idx, url) for idx, url, _ in ocupadas.values()]
+        for idx, url in em_voo:
+            controle(url, "chrome").liberar("neutro")
+        if aguardando is not None:
+            em_voo.append(aguardando)
+        for idx, url in em_voo:
+            if devolver is None or not devolver(idx, url):
+                rec = registro(cidade_tag, url, falha=FALHA_NAVEGACAO)
+                entregar(idx, [rec] if eh_listagem(url) else rec)
+        raise
+    _fechar_extras(driver, handles)
+    return colhidas
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Preços em lote pela API de catálogo da loja (VTEX)
+Toda URL de produto termina no id numérico (...-tio-joao-2kg-115657/p). Em vez
+de abrir ~150 páginas por cidade, a API de busca do catálogo responde dezenas de
+produtos por requisição (fq=productId:<id> repetido). O número da URL costuma
+ser o productId; os que não voltarem são pedidos de novo como skuId (fq=skuId:)
+e casados pelo itemId do SKU. Como productId, skuId e RefId dividem a mesma
+faixa de inteiros, o acerto só vale se o linkText do produto for o slug da URL;
+o resto segue pelo HTML. A região vem do mesmo header Cookie da sessão regional
+usado no modo HTTP.
+"""
+
+from urllib.parse import urlsplit, unquote
+
+import requests
+
+from carrefour_comum import CIDADES, registro, coerce_price
+from carrefour_catalogo import id_produto
+from carrefour_http import TIMEOUT
+from carrefour_ritmo import controle, sinal_http, retry_after
+
+
+API_BUSCA = "/api/catalog_system/pub/products/search"
+LOTE_SKUS = 50  # a API devolve no máximo 50 produtos por página (_from/_to)
+
+def slug_da_url(url: str) -> str:
+    """Slug da página de produto (o linkText da VTEX): o path sem o "/p" final."""
+    caminho = unquote(urlsplit(url).path).strip("/")
+    return caminho[:-2] if caminho.endswith("/p") else caminho
+
+
+def preco_produto(prod: dict, sku: str = None) -> float:
+    """
+    Preço do primeiro vendedor com estoque; sem estoque, o primeiro preço > 0.
+    sku: considera só esse item (itemId) do produto.
+    """
+    ofertas = [
+        (seller.get("commertialOffer") or {})
+        for item in prod.get("items") or []
+        if sku is None or str(item.get("itemId")) == sku
+        for seller in item.get("sellers") or []
+    ]
+    for of in ofertas:
+        if of.get("AvailableQuantity", 0) > 0 and coerce_price(of.get("Price")) > 0:
+            return coerce_price(of.get("Price"))
+    for of in ofertas:
+        if coerce_price(of.get("Price")) > 0:
+            return coerce_price(of.get("Price"))
+    return 0.0
+
+
+def buscar_lote(base: str, ids: list, session: requests.Session, cookies: str = None,
+                campo: str = "productId") -> list:
+    """
+    Uma requisição à API para até LOTE_SKUS ids (campo: productId ou skuId);
+    lista de produtos (vazia se falhar).
+    """
+    params = [("fq", f"{campo}:{i}") for i in ids] + [("_from", 0), ("_to", len(ids) - 1)]
+    with controle(base).vaga() as vaga:
+        try:
+            resp = session.get(base + API_BUSCA, params=params, timeout=TIMEOUT,
+                               headers={"Cookie": cookies} if cookies else None)
+        except requests.RequestException as e:
+            vaga.marcar("timeout" if isinstance(e, requests.Timeout) else "servidor")
+            print(f"↪️ API de catálogo falhou ({type(e).__name__})")
+            return []
+        vaga.marcar(sinal_http(resp.status_code), retry_after(resp.headers.get("Retry-After")))
+    # 206 = resposta paginada, normal na busca do catálogo
+    if resp.status_code not in (200, 206):
+        print(f"↪️ API de catálogo HTTP {resp.status_code}")
+        return []
+    try:
+        dados = resp.json()
+    except ValueError:
+        return []
+    return dados if isinstance(dados, list) else []
+
+
+def coletar_por_sku(tarefas: list, session: requests.Session, cookies: dict = None) -> dict:
+    """
+    tarefas: lista de (chave_cidade, índice, url).
+    Devolve {(chave_cidade, índice): registro}; None = não veio pela API.
+    """
+    cookies = cookies or {}
+    resultado = {(chave, idx): None for chave, idx, _ in tarefas}
+
+    # agrupa por cidade (cookie) e host (base da API)
+    grupos = {}
+    for chave, idx, url in tarefas:
+        pid = id_produto(url)
+        if pid is None:
+            continue
+        partes = urlsplit(url)
+        grupos.setdefault((chave, f"{partes.scheme}://{partes.netloc}"), []).append((idx, url, pid))
+
+    requisicoes = rejeitados = 0
+    for (chave, base), itens in grupos.items():
+        tag = CIDADES[chave]["tag"]
+        slugs = {}
+        for _, url, pid in itens:
+            slugs.setdefault(pid, set()).add(slug_da_url(url))
+        ids = list(slugs)
+        por_id = {}  # número da URL -> (nome, preço, linkText)
+
+        def conferir(numero: str, prod: dict, sku: str = None):
+            # o número pode ser de outro produto: só vale com o linkText de uma das URLs
+            nonlocal rejeitados
+            if prod.get("linkText") not in slugs[numero]:
+                rejeitados += 1
+                return
+            por_id[numero] = (prod.get("productName") or "Não encontrado",
+                              preco_produto(prod, sku), prod["linkText"])
+
+        for i in range(0, len(ids), LOTE_SKUS):
+            requisicoes += 1
+            for prod in buscar_lote(base, ids[i:i + LOTE_SKUS], session, cookies.get(chave)):
+                if str(prod.get("productId")) in slugs:
+                    conferir(str(prod.get("productId")), prod)
+
+        # número que não é productId (ou é o de outro produto): segunda passada como skuId
+        faltam = [pid for pid in ids if pid not in por_id]
+        for i in range(0, len(faltam), LOTE_SKUS):
+            requisicoes += 1
+            lote = set(faltam[i:i + LOTE_SKUS])
+            for prod in buscar_lote(base, sorted(lote), session, cookies.get(chave), campo="skuId"):
+                for item in prod.get("items") or []:
+                    sku = str(item.get("itemId"))
+                    if sku in lote and sku not in por_id:
+                        conferir(sku, prod, sku)
+
+        for idx, url, pid in itens:
+            achado = por_id.get(pid)
+            if achado and achado[2] == slug_da_url(url) and achado[1] > 0:
+                resultado[(chave, idx)] = registro(tag, url, achado[0], achado[1])
+
+    if rejeitados:
+        print(f"⚠️ API de catálogo: {rejeitados} produtos com o id, mas outro linkText (ficam para o HTML)")
+    ok = sum(rec is not None for rec in resultado.values())
+    print(f"\n📦 API de catálogo: {ok}/{len(tarefas)} preços em {requisicoes} requisições")
+    return resultado
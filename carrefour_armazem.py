@@ -0,0 +1,425 @@
+# -*- coding: utf-8 -*-
+"""
+Armazém de preços em Parquet, particionado por cidade/mês/dia
+<pasta da cidade>/precos/mes=YYYY-MM/dia=YYYY-MM-DD/registros.parquet
+
+Cada execução grava só a partição do próprio dia (rerun no mesmo dia
+substitui a partição), em vez de ler, mesclar e regravar o Excel do mês
+inteiro. Os Excel mensais (precos_*/erros_*) viram uma exportação opcional,
+montada a partir das partições do mês; no dia a dia, o dia entra nelas no
+lugar (coluna nova via índice persistido), sem recarregar nada no pandas.
+Além disso, um log longo append-only por cidade e mês (historico_*.csv):
+cada execução só anexa as próprias linhas, com id do produto e da execução.
+"""
+
+import io
+import os
+import re
+import csv
+import glob
+import json
+import shutil
+from datetime import datetime
+
+import pandas as pd
+
+from carrefour_comum import COLUNA_DIA, EXECUCAO, STAMP_MONTH, caminhos_cidade, today
+from carrefour_catalogo import id_produto
+from carrefour_planilha import PlanilhaXlsx
+
+
+COLUNAS = ["Cidade", "Nome do Produto", "Preço", "URL", "Falha", "Data"]
+ARQUIVO_PARTICAO = "registros.parquet"
+CAMPOS_HISTORICO = ["Cidade", "ID", "Nome do Produto", "Preço", "URL", "Data", "Execução"]
+_RE_COLUNA_DIA = re.compile(r"Preço_(\d{8})")
+
+
+# =========================
+# 1) Partições
+# =========================
+def pasta_mes(cidade: dict, mes: str = STAMP_MONTH) -> str:
+    return os.path.join(caminhos_cidade(cidade)["armazem"], f"mes={mes}")
+
+
+def caminho_dia(cidade: dict, data: str) -> str:
+    """Arquivo da partição do dia (data no formato YYYY-MM-DD)."""
+    return os.path.join(pasta_mes(cidade, data[:7]), f"dia={data}", ARQUIVO_PARTICAO)
+
+
+def gravar_dia(cidade: dict, df: pd.DataFrame, data: str) -> str:
+    """Grava (ou substitui) a partição do dia; escrita atômica, como a sessão regional."""
+    arq = caminho_dia(cidade, data)
+    os.makedirs(os.path.dirname(arq), exist_ok=True)
+    df = df.assign(Data=data)[COLUNAS].reset_index(drop=True)
+    df["Falha"] = df["Falha"].astype("string")
+    df["URL"] = df["URL"].astype("string")
+    tmp = arq + ".tmp"
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, arq)
+    return arq
+
+
+def ler_mes(cidade: dict, mes: str = STAMP_MONTH) -> pd.DataFrame:
+    """Todos os registros do mês (formato longo), em ordem de dia."""
+    arquivos = sorted(glob.glob(os.path.join(pasta_mes(cidade, mes), "dia=*", ARQUIVO_PARTICAO)))
+    if not arquivos:
+        return pd.DataFrame(columns=COLUNAS)
+    return pd.concat([pd.read_parquet(a) for a in arquivos], ignore_index=True)
+
+
+def _dias_da_aba_precos(base: pd.DataFrame, cidade: dict) -> pd.DataFrame:
+    """Aba "Precos" (uma coluna Preço_YYYYMMDD por dia) no formato longo, sem URL."""
+    partes = []
+    for col in [c for c in base.columns if str(c).startswith("Preço_")]:
+        m = _RE_COLUNA_DIA.fullmatch(str(col))
+        try:
+            data = datetime.strptime(m.group(1), "%Y%m%d").strftime("%Y-%m-%d") if m else None
+        except ValueError:
+            data = None
+        if data is None:
+            print(f"⚠️ [{cidade['tag']}] Coluna '{col}' do Excel não é um dia (Preço_YYYYMMDD): ignorada")
+            continue
+        ok = base[base[col] > 0][["Nome do Produto", col]].rename(columns={col: "Preço"})
+        partes.append(ok.assign(Cidade=cidade["tag"], URL=None, Falha=None, Data=data))
+    return pd.concat(partes, ignore_index=True) if partes else pd.DataFrame(columns=COLUNAS)
+
+
+def _com_data(df: pd.DataFrame, mes: str) -> pd.DataFrame:
+    """Data como YYYY-MM-DD (a planilha pode trazer texto ou datetime); só as linhas do mês."""
+    df = df.reindex(columns=COLUNAS)
+    df["Data"] = pd.to_datetime(df["Data"], errors="coerce").dt.strftime("%Y-%m-%d")
+    return df[df["Data"].str.startswith(mes, na=False)]
+
+
+def migrar_excel(cidade: dict, mes: str = STAMP_MONTH) -> int:
+    """
+    Primeira gravação do mês com Excel já existente (mês iniciado antes do
+    armazém): os dias da planilha viram partições, uma vez só. Os preços vêm
+    da aba "Historico" (formato longo, com URL e Data); dias que só existem
+    como coluna Preço_YYYYMMDD da aba "Precos" entram sem URL. Outras colunas
+    (cópias, anotações como Preço_20250918_x) ficam de fora, com aviso. As
+    linhas de erro vêm do erros_*.xlsx, inclusive de dias sem nenhum preço.
+    Se nada pôde ser migrado de um Excel com conteúdo, ele é copiado para
+    *.legado.xlsx antes que a exportação do mês o substitua.
+    Retorna quantos dias foram migrados.
+    """
+    paths = caminhos_cidade(cidade, mes)
+    if os.path.isdir(pasta_mes(cidade, mes)) or not os.path.exists(paths["mensal"]):
+        return 0
+    abas = pd.read_excel(paths["mensal"], sheet_name=None)
+    hist = _com_data(abas["Historico"], mes) if "Historico" in abas else pd.DataFrame(columns=COLUNAS)
+    precos = _com_data(_dias_da_aba_precos(abas.get("Precos", pd.DataFrame()), cidade), mes)
+    ok = pd.concat([hist, precos[~precos["Data"].isin(hist["Data"])]], ignore_index=True)
+    ok = ok[ok["Preço"] > 0]
+    erros = _com_data(pd.read_excel(paths["erros"]), mes) if os.path.exists(paths["erros"]) else pd.DataFrame(columns=COLUNAS)
+
+    dias = 0
+    for data in sorted(set(ok["Data"]) | set(erros["Data"])):
+        dia = pd.concat([ok[ok["Data"] == data], erros[erros["Data"] == data]], ignore_index=True)
+        gravar_dia(cidade, dia.assign(Preço=dia["Preço"].astype(float)), data)
+        dias += 1
+    if dias:
+        print(f"📦 [{cidade['tag']}] {dias} dias do Excel de {mes} migrados para o armazém")
+    elif any(not aba.empty for aba in abas.values()):
+        for arq in (paths["mensal"], paths["erros"]):
+            if os.path.exists(arq):
+                shutil.copy2(arq, arq[:-len(".xlsx")] + ".legado.xlsx")
+        print(f"⚠️ [{cidade['tag']}] Nenhum dia do Excel de {mes} pôde ser migrado; cópia em *.legado.xlsx")
+    return dias
+
+
+# =========================
+# 2) Log longo (append-only)
+# =========================
+def _cortar_linha_incompleta(arq: str) -> bool:
+    """
+    Tira do fim do log a linha sem quebra (job morto no meio da escrita), para
+    a próxima execução não colar nela; lê só o fim do arquivo.
+    Retorna se sobrou conteúdo (False = arquivo novo ou só cabeçalho cortado).
+    """
+    if not os.path.exists(arq):
+        return False
+    with open(arq, "rb+") as f:
+        fim = f.seek(0, os.SEEK_END)
+        if fim == 0:
+            return False
+        f.seek(max(0, fim - 65536))
+        cauda = f.read()
+        if cauda.endswith(b"\n"):
+            return True
+        corte = fim - len(cauda) + cauda.rfind(b"\n") + 1
+        f.truncate(corte)
+        return corte > 0
+
+
+def anexar_historico(cidade: dict, registros: list, data: str) -> int:
+    """
+    Anexa os preços válidos da execução ao log do mês, linha a linha; nunca
+    relê o que já está no arquivo. Retorna quantas linhas entraram.
+    """
+    arq = caminhos_cidade(cidade)["historico"]
+    novo = not _cortar_linha_incompleta(arq)
+    linhas = 0
+    with open(arq, "a", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        if novo:
+            w.writerow(CAMPOS_HISTORICO)
+        for rec in registros:
+            if rec["Preço"] <= 0:
+                continue
+            w.writerow([rec["Cidade"], id_produto(rec["URL"]) or "", rec["Nome do Produto"],
+                        rec["Preço"], rec["URL"], data, EXECUCAO])
+            linhas += 1
+    return linhas
+
+
+def ler_historico(cidade: dict, mes: str = STAMP_MONTH) -> pd.DataFrame:
+    """O mês inteiro do log longo (linha truncada por job morto no meio é ignorada)."""
+    arq = caminhos_cidade(cidade, mes)["historico"]
+    if not os.path.exists(arq):
+        return pd.DataFrame(columns=CAMPOS_HISTORICO)
+    with open(arq, encoding="utf-8", newline="") as f:
+        texto = f.read()
+    texto = texto[:texto.rfind("\n") + 1]  # a última linha sem quebra ficou pela metade
+    return pd.read_csv(io.StringIO(texto), dtype={"ID": "string", "Execução": "string"}, on_bad_lines="skip")
+
+
+# =========================
+# 3) Exportação Excel
+# =========================
+# O Excel do mês tem um índice persistido ao lado (indice_*.json): linha de
+# cada produto e coluna de cada dia na aba "Precos", e o bloco de linhas de
+# cada dia no "Historico" e no erros_*.xlsx. Com ele, o dia entra no lugar
+# (uma coluna nova e linhas no fim) sem passar as planilhas pelo pandas; sem
+# índice válido, a exportação completa refaz planilhas e índice.
+COLUNAS_HISTORICO_XLSX = ["Cidade", "ID", "Nome do Produto", "Preço", "URL", "Data"]
+CHAVE_INDICE = "id"  # versão do índice: linhas por id do produto (antes: por nome)
+ABA_ERROS = "Sheet1"  # nome padrão do to_excel, mantido dos arquivos antigos
+
+
+def _tamanhos(paths: dict) -> dict:
+    # tamanho (não mtime): o checkout do Actions muda o mtime, não o conteúdo
+    return {k: os.path.getsize(paths[k]) if os.path.exists(paths[k]) else None for k in ("mensal", "erros")}
+
+
+def _ler_indice(paths: dict):
+    """Índice do Excel do mês, ou None se faltar ou não bater com os arquivos."""
+    if not (os.path.exists(paths["indice"]) and os.path.exists(paths["mensal"])):
+        return None
+    try:
+        with open(paths["indice"], encoding="utf-8") as f:
+            indice = json.load(f)
+    except ValueError:
+        return None
+    valido = indice.get("tamanhos") == _tamanhos(paths) and indice.get("chave") == CHAVE_INDICE
+    return indice if valido else None
+
+
+def _gravar_indice(paths: dict, indice: dict):
+    indice["tamanhos"] = _tamanhos(paths)
+    tmp = paths["indice"] + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(indice, f, ensure_ascii=False)
+    os.replace(tmp, paths["indice"])
+
+
+def chave_linha(url, nome: str) -> str:
+    """Chave da linha no Excel: id numérico do slug; sem URL/id (dia migrado), o nome."""
+    return id_produto(url if isinstance(url, str) else None) or f"nome:{nome}"
+
+
+def _com_id(ok: pd.DataFrame) -> pd.DataFrame:
+    """
+    Acrescenta "ID" (id do slug) e "_chave" (chave_linha). Só linha sem URL
+    (dia migrado do Excel antigo) pega o id de outra linha com o mesmo nome;
+    URL sem id (ex.: busca sem resultado) fica com a chave pelo nome.
+    """
+    ids = ok["URL"].map(lambda u: id_produto(u) if isinstance(u, str) else None)
+    conhecidos = ids.notna()
+    por_nome = dict(zip(ok["Nome do Produto"][conhecidos], ids[conhecidos]))
+    sem_url = ok["URL"].isna()
+    ids = ids.where(~sem_url, ids.fillna(ok["Nome do Produto"].map(por_nome)))
+    return ok.assign(ID=ids, _chave=ids.fillna("nome:" + ok["Nome do Produto"].astype(str)))
+
+
+def _blocos(df: pd.DataFrame) -> dict:
+    """{data: [primeira, última] linha no Excel} de um DataFrame ordenado por Data (linha 1 = cabeçalho)."""
+    pos = df.reset_index(drop=True).reset_index().groupby("Data")["index"].agg(["min", "max"])
+    return {data: [int(b["min"]) + 2, int(b["max"]) + 2] for data, b in pos.iterrows()}
+
+
+def exportar_excel(cidade: dict, mes: str = STAMP_MONTH, df: pd.DataFrame = None):
+    """
+    Monta os Excel do mês a partir do armazém (ou de `df`, no formato de
+    ler_mes, ex.: vindo do SQLite): aba "Precos" com uma coluna
+    Preço_YYYYMMDD por dia, aba "Historico" no formato longo e erros_*.xlsx.
+    As linhas de "Precos" são por id do produto (do slug da URL), com o nome
+    como atributo: nome repetido ou renomeado não multiplica linhas.
+    """
+    paths = caminhos_cidade(cidade, mes)
+    df = ler_mes(cidade, mes) if df is None else df
+    df = df.sort_values("Data", kind="stable")
+    ok = df[df["Preço"] > 0]
+    err = df[df["Preço"] <= 0]
+
+    if not err.empty:
+        err.to_excel(paths["erros"], index=False, sheet_name=ABA_ERROS)
+        print(f"⚠️ [{cidade['tag']}] Erros/zeros do mês: {paths['erros']}")
+    if ok.empty:
+        return
+
+    # base "wide": 1 linha por id de produto (join por hash no pivot), colunas
+    # por dia; o nome é atributo (o do dia mais recente), não chave
+    ok = _com_id(ok)
+    dias = ok.drop_duplicates(["_chave", "Data"])
+    precos = dias.pivot(index="_chave", columns="Data", values="Preço")
+    precos.columns = [f"Preço_{d.replace('-', '')}" for d in precos.columns]
+    atributos = dias.groupby("_chave", sort=False).agg(**{"ID": ("ID", "last"), "Nome do Produto": ("Nome do Produto", "last")})
+    base = atributos.join(precos)
+    with pd.ExcelWriter(paths["mensal"], engine="openpyxl", mode="w") as w:
+        base.to_excel(w, index=False, sheet_name="Precos")
+        ok[COLUNAS_HISTORICO_XLSX].to_excel(w, index=False, sheet_name="Historico")
+
+    _gravar_indice(paths, {
+        "chave": CHAVE_INDICE,
+        "linhas": {chave: i + 2 for i, chave in enumerate(base.index)},
+        "colunas": {col: j + 1 for j, col in enumerate(base.columns)},
+        "historico": _blocos(ok),
+        "erros": _blocos(err) if not err.empty else {},
+    })
+    print(f"📁 [{cidade['tag']}] Exportado: {paths['mensal']}")
+
+
+def _ultimo_bloco(blocos: dict, data: str):
+    """Bloco do dia, se ele é o último da aba; False se existe mas não é (não dá para trocar no lugar)."""
+    bloco = blocos.get(data)
+    if bloco and bloco[1] != max(b[1] for b in blocos.values()):
+        return False
+    return bloco
+
+
+def anexar_dia_excel(cidade: dict, registros: list, data: str) -> bool:
+    """
+    Põe o dia nos Excel do mês no lugar (carrefour_planilha): a coluna
+    Preço_YYYYMMDD (limpa antes, num rerun) nas linhas dadas pelo índice,
+    produto novo numa linha nova, e o bloco do dia no fim do "Historico" e do
+    erros_*.xlsx. False = sem índice válido (ou o dia não é o último bloco,
+    ou o arquivo de erros ainda não existe): quem chamou faz a exportação completa.
+    """
+    paths = caminhos_cidade(cidade)
+    indice = _ler_indice(paths)
+    if indice is None:
+        return False
+    ok = [r for r in registros if r["Preço"] > 0]
+    err = [r for r in registros if r["Preço"] <= 0]
+    bloco_hist = _ultimo_bloco(indice["historico"], data)
+    bloco_err = _ultimo_bloco(indice["erros"], data)
+    if bloco_hist is False or bloco_err is False or (err and not os.path.exists(paths["erros"])):
+        return False
+
+    coluna = f"Preço_{data.replace('-', '')}"
+    rerun = coluna in indice["colunas"]
+    col = indice["colunas"].setdefault(coluna, max(indice["colunas"].values()) + 1)
+    proxima = max(indice["linhas"].values(), default=1) + 1
+    celulas = {(1, col): coluna}
+    for rec in ok:
+        chave = chave_linha(rec["URL"], rec["Nome do Produto"])
+        linha = indice["linhas"].get(chave)
+        if linha is None:
+            linha = indice["linhas"][chave] = proxima
+            proxima += 1
+            celulas[(linha, 1)] = id_produto(rec["URL"])
+        if (linha, col) in celulas:
+            continue  # id repetido no dia: vale o primeiro
+        # o nome é atributo: fica o mais recente (produto renomeado não vira linha nova)
+        celulas[(linha, 2)] = rec["Nome do Produto"]
+        celulas[(linha, col)] = rec["Preço"]
+
+    planilha = PlanilhaXlsx(paths["mensal"])
+    planilha.gravar_celulas("Precos", celulas, limpar_coluna=col if rerun else None)
+    indice["historico"][data] = list(planilha.anexar_linhas(
+        "Historico",
+        [[r["Cidade"], id_produto(r["URL"]), r["Nome do Produto"], r["Preço"], r["URL"], data] for r in ok],
+        desde=bloco_hist[0] if bloco_hist else None,
+    ))
+    planilha.salvar()
+
+    if err or bloco_err:
+        erros = PlanilhaXlsx(paths["erros"])
+        indice["erros"][data] = list(erros.anexar_linhas(
+            ABA_ERROS,
+            [[r["Cidade"], r["Nome do Produto"], r["Preço"], r["URL"], r.get("Falha"), data] for r in err],
+            desde=bloco_err[0] if bloco_err else None,
+        ))
+        erros.salvar()
+        if err:
+            print(f"⚠️ [{cidade['tag']}] Erros/zeros do dia anexados: {paths['erros']}")
+    _gravar_indice(paths, indice)
+    print(f"📁 [{cidade['tag']}] Coluna {coluna} gravada no lugar: {paths['mensal']}")
+    return True
+
+
+# =========================
+# 4) Gravação do dia
+# =========================
+def migrar_para_banco(cidade: dict, banco, mes: str = STAMP_MONTH) -> int:
+    """
+    Mês começado no armazém Parquet (ou no Excel antigo, que vira partições
+    antes): os dias que o banco ainda não tem entram nele, para a exportação
+    a partir do banco não perder dias. Fora da transação do dia.
+    Retorna quantos dias foram copiados.
+    """
+    no_banco = banco.dias(cidade["tag"], mes)
+    if not no_banco:
+        migrar_excel(cidade, mes)
+    faltam = []
+    for arq in sorted(glob.glob(os.path.join(pasta_mes(cidade, mes), "dia=*", ARQUIVO_PARTICAO))):
+        data = os.path.basename(os.path.dirname(arq))[len("dia="):]
+        if data not in no_banco:
+            faltam.append((data, arq))
+    if not faltam:
+        return 0
+    with banco.transacao():
+        for data, arq in faltam:
+            df = pd.read_parquet(arq)
+            banco.gravar(df.astype(object).where(df.notna(), None).to_dict("records"), data)
+    print(f"🗄️ [{cidade['tag']}] {len(faltam)} dias de {mes} do armazém Parquet/Excel copiados para o banco")
+    return len(faltam)
+
+
+def gravar_no_banco(cidade: dict, registros: list, banco) -> int:
+    """Upsert do dia da cidade no banco (dentro da transação de quem chama)."""
+    return banco.gravar(registros, today.strftime("%Y-%m-%d"))
+
+
+def salvar_resultados(cidade: dict, registros: list, excel: bool = True, banco=None,
+                      novos: list = None):
+    """
+    Grava o dia da cidade na partição Parquet e o log longo; com `excel`,
+    reexporta os Excel do mês a partir do backend usado. Com `banco` (um
+    carrefour_banco.BancoPrecos), o dia já foi gravado nele (gravar_no_banco,
+    na transação da execução) e o Excel sai do banco.
+    novos: só o que esta execução coletou (sem o retomado do diário), para o
+    log longo não repetir linhas de um rerun; None = todos os registros.
+    """
+    df = pd.DataFrame(registros, columns=["Cidade", "Nome do Produto", "Preço", "URL", "Falha"])
+    data = today.strftime("%Y-%m-%d")
+    if banco is None:
+        migrar_excel(cidade)
+        arq = gravar_dia(cidade, df, data)
+    else:
+        arq = banco.caminho
+    anexar_historico(cidade, registros if novos is None else novos, data)
+
+    validos = int((df["Preço"] > 0).sum())
+    if validos:
+        print(f"💾 [{cidade['tag']}] {validos} preços gravados: {arq} ({COLUNA_DIA})")
+    else:
+        print(f"⚠️ [{cidade['tag']}] Nenhum preço válido hoje.")
+    if (df["Preço"] <= 0).any():
+        print(f"⚠️ [{cidade['tag']}] {int((df['Preço'] <= 0).sum())} erros/zeros no dia")
+    else:
+        print(f"✅ [{cidade['tag']}] Sem erros hoje.")
+
+    if excel and not anexar_dia_excel(cidade, registros, data):
+        exportar_excel(cidade, df=None if banco is None else banco.ler_mes(cidade["tag"], STAMP_MONTH))
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Motor de coleta assíncrono (asyncio + aiohttp)
+Substitui o laço serial por URL do catálogo: mantém N requisições em voo por host,
+reaproveita conexões keep-alive e descomprime gzip/brotli automaticamente.
+Quantas ficam em voo é decidido pelo controle AIMD do host (carrefour_ritmo);
+a concorrência configurada é só o teto de conexões.
+Página de bloqueio/erro volta como registro com a Falha; depois de LIMITE
+seguidas numa cidade, o passe assíncrono para de pedir as URLs dela (o resto
+fica para o pool de Chrome, cujo disjuntor recebe essas falhas).
+"""
+
+import time
+import asyncio
+
+import aiohttp
+
+from carrefour_comum import CIDADES, registro
+from carrefour_http import HEADERS, TIMEOUT, produto_do_html, falha_do_html, avisar_status
+from carrefour_ritmo import controle, sinal_http, retry_after
+from carrefour_listagem import eh_listagem, registros_do_html
+from carrefour_retentativas import falha_de
+from carrefour_disjuntor import Disjuntor
+
+
+CONCORRENCIA = 16  # teto de conexões por host (a janela AIMD decide abaixo disso)
+
+
+async def _buscar(session: aiohttp.ClientSession, chave: str, url: str, cookies: str = None):
+    tag = CIDADES[chave]["tag"]
+    # a vaga do controle de ritmo é o que limita as requisições em voo
+    async with controle(url).vaga_async() as vaga:
+        try:
+            async with session.get(url, headers={"Cookie": cookies} if cookies else None) as resp:
+                html = await resp.text() if resp.status in (200, 403) else None
+                vaga.marcar(sinal_http(resp.status, html), retry_after(resp.headers.get("Retry-After")))
+                if resp.status != 200:
+                    # 403/429 e 5xx contam no disjuntor como a página de desafio
+                    falha = avisar_status(resp.status, tag, url)
+                    if falha is None:
+                        return None
+                    rec = registro(tag, url, falha=falha)
+                    return [rec] if eh_listagem(url) else rec
+        except asyncio.TimeoutError:
+            vaga.marcar("timeout")
+            print(f"↪️ [{tag}] HTTP falhou (Timeout) → Chrome: {url}")
+            return None
+        except aiohttp.ClientError as e:
+            vaga.marcar("servidor")
+            print(f"↪️ [{tag}] HTTP falhou ({type(e).__name__}) → Chrome: {url}")
+            return None
+
+    if eh_listagem(url):
+        return registros_do_html(html, tag, url)
+
+    achado = produto_do_html(html)
+    if achado is None:
+        falha = falha_do_html(html, tag, url)
+        return registro(tag, url, falha=falha) if falha else None
+
+    name, price = achado
+    print(f"⚡ [{tag}] {name} | R$ {price}")
+    return registro(tag, url, name, price)
+
+
+async def _coletar(tarefas: list, concorrencia: int, cookies: dict) -> dict:
+    # limit_per_host é o teto duro por host; limit=0 tira o teto global
+    connector = aiohttp.TCPConnector(limit=0, limit_per_host=concorrencia, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=TIMEOUT)
+    # DummyCookieJar: a sessão é compartilhada entre cidades, então nenhum
+    # Set-Cookie pode vazar de uma região para outra; cada cidade manda o seu
+    async with aiohttp.ClientSession(headers=HEADERS, connector=connector, timeout=timeout,
+                                     cookie_jar=aiohttp.DummyCookieJar()) as session:
+        # `concorrencia` tarefas consumindo a mesma fila; cada uma espera a sua
+        # vaga no controle AIMD antes de cada requisição
+        recs = [None] * len(tarefas)
+        fila = iter(enumerate(tarefas))
+        disjuntores = {chave: Disjuntor(aberturas_max=1) for chave, _, _ in tarefas}
+
+        async def trabalhador():
+            for i, (chave, _, url) in fila:
+                d = disjuntores[chave]
+                if d.estado != "fechado":
+                    continue  # cidade bloqueada: o resto vai para o Chrome
+                recs[i] = await _buscar(session, chave, url, cookies.get(chave))
+                if recs[i] is not None and d.registrar(falha_de(recs[i])):
+                    print(f"⛔ [{CIDADES[chave]['tag']}] {d.seguidas} páginas de bloqueio/erro seguidas: "
+                          f"HTTP assíncrono parado para a cidade")
+
+        await asyncio.gather(*(trabalhador() for _ in range(min(concorrencia, len(tarefas)))))
+    return {(chave, idx): rec for (chave, idx, _), rec in zip(tarefas, recs)}
+
+
+def coletar_http(tarefas: list, concorrencia: int = CONCORRENCIA, cookies: dict = None) -> dict:
+    """
+    tarefas: lista de (chave_cidade, índice, url).
+    cookies: {chave_cidade: header Cookie da sessão regional}.
+    Devolve {(chave_cidade, índice): registro}; registro None = mandar para o Chrome.
+    Páginas de busca devolvem a lista de registros dos produtos listados.
+    Registro com Falha (bloqueio/pagina_vazia): também vai para o Chrome, e a
+    falha conta no disjuntor da cidade.
+    """
+    if not tarefas:
+        return {}
+    inicio = time.time()
+    resultado = asyncio.run(_coletar(tarefas, concorrencia, cookies or {}))
+    ok = sum(rec is not None and not falha_de(rec) for rec in resultado.values())
+    print(f"\n⚡ HTTP assíncrono: {ok}/{len(tarefas)} em {time.time() - inicio:.1f}s (teto {concorrencia}/host)")
+    return resultado
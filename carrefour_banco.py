@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+Backend SQLite (stdlib sqlite3), alternativa ao armazém Parquet
+Uma tabela de observações com chave (cidade, produto_id, data) e índices
+para consultas por produto e por período. A execução grava todas as cidades
+com upserts em lote numa única transação; o banco fica em modo WAL, então
+quem lê (análise, exportação) não bloqueia a escrita nem é bloqueado por ela.
+"""
+
+import os
+import sqlite3
+from contextlib import contextmanager
+
+import pandas as pd
+
+from carrefour_comum import BASE_DIR, EXECUCAO
+from carrefour_catalogo import id_produto
+from carrefour_armazem import chave_linha
+
+
+ARQ_BANCO = os.path.join(BASE_DIR, "precos_carrefour.sqlite")
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS observacoes (
+    cidade     TEXT NOT NULL,
+    produto_id TEXT NOT NULL,
+    data       TEXT NOT NULL,   -- YYYY-MM-DD
+    nome       TEXT,
+    preco      REAL NOT NULL,
+    url        TEXT,
+    falha      TEXT,
+    execucao   TEXT,
+    PRIMARY KEY (cidade, produto_id, data)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_obs_cidade_data ON observacoes (cidade, data);
+CREATE INDEX IF NOT EXISTS idx_obs_produto_data ON observacoes (produto_id, data);
+"""
+
+# rerun do mesmo dia: o registro novo substitui o antigo, exceto uma falha
+# por cima de um preço válido já gravado
+UPSERT = """
+INSERT INTO observacoes (cidade, produto_id, data, nome, preco, url, falha, execucao)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (cidade, produto_id, data) DO UPDATE SET
+    nome = excluded.nome, preco = excluded.preco, url = excluded.url,
+    falha = excluded.falha, execucao = excluded.execucao
+WHERE excluded.preco > 0 OR observacoes.preco <= 0
+"""
+
+
+def chave_produto(rec: dict) -> str:
+    """
+    A mesma chave das linhas do Excel (chave_linha): id numérico do slug, ou
+    "nome:<nome>" (produto listado sem URL própria, dia migrado sem URL).
+    Falha sem id (busca que não listou nada) fica com a URL da busca.
+    """
+    url = rec.get("URL")
+    if rec["Preço"] <= 0 and isinstance(url, str) and not id_produto(url):
+        return url
+    return chave_linha(url, rec["Nome do Produto"])
+
+
+class BancoPrecos:
+    """
+    Uso: banco = BancoPrecos(); with banco.transacao(): banco.gravar(...) por
+    cidade; ...; banco.fechar(). Fora de transacao(), cada gravar() é a sua.
+    """
+
+    def __init__(self, caminho: str = ARQ_BANCO):
+        self.caminho = caminho
+        # isolation_level=None: as transações são explícitas (BEGIN/COMMIT)
+        self._con = sqlite3.connect(caminho, isolation_level=None)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("PRAGMA synchronous=NORMAL")
+        self._con.executescript(ESQUEMA)
+        self._em_transacao = False
+
+    @contextmanager
+    def transacao(self):
+        self._con.execute("BEGIN IMMEDIATE")
+        self._em_transacao = True
+        try:
+            yield self
+        except BaseException:
+            self._con.execute("ROLLBACK")
+            raise
+        else:
+            self._con.execute("COMMIT")
+        finally:
+            self._em_transacao = False
+
+    def gravar(self, registros: list, data: str) -> int:
+        """Upsert em lote dos registros de uma cidade no dia; retorna quantos foram enviados."""
+        linhas = [
+            (r["Cidade"], chave_produto(r), data, r["Nome do Produto"], float(r["Preço"]),
+             r.get("URL"), r.get("Falha"), EXECUCAO)
+            for r in registros
+        ]
+        if self._em_transacao:
+            self._con.executemany(UPSERT, linhas)
+        else:
+            with self.transacao():
+                self._con.executemany(UPSERT, linhas)
+        return len(linhas)
+
+    # ---- consultas (todas pelos índices) ----
+    def preco(self, cidade_tag: str, produto_id: str, data: str):
+        """Preço de um produto numa cidade e dia, ou None."""
+        linha = self._con.execute(
+            "SELECT preco FROM observacoes WHERE cidade = ? AND produto_id = ? AND data = ?",
+            (cidade_tag, produto_id, data),
+        ).fetchone()
+        return linha[0] if linha else None
+
+    def periodo(self, cidade_tag: str, inicio: str, fim: str, produto_id: str = None) -> pd.DataFrame:
+        """Observações da cidade com data entre inicio e fim (inclusive); opcionalmente de um produto."""
+        sql = "SELECT * FROM observacoes WHERE cidade = ? AND data BETWEEN ? AND ?"
+        params = [cidade_tag, inicio, fim]
+        if produto_id is not None:
+            sql = ("SELECT * FROM observacoes WHERE cidade = ? AND produto_id = ? "
+                   "AND data BETWEEN ? AND ?")
+            params = [cidade_tag, produto_id, inicio, fim]
+        return pd.read_sql_query(sql + " ORDER BY data", self._con, params=params)
+
+    def dias(self, cidade_tag: str, mes: str) -> set:
+        """Datas (YYYY-MM-DD) do mês que a cidade já tem no banco."""
+        linhas = self._con.execute(
+            "SELECT DISTINCT data FROM observacoes WHERE cidade = ? AND data BETWEEN ? AND ?",
+            (cidade_tag, f"{mes}-01", f"{mes}-31"),
+        ).fetchall()
+        return {linha[0] for linha in linhas}
+
+    def ler_mes(self, cidade_tag: str, mes: str) -> pd.DataFrame:
+        """O mês da cidade nas colunas do armazém Parquet (para a exportação do Excel)."""
+        df = self.periodo(cidade_tag, f"{mes}-01", f"{mes}-31")
+        return df.rename(columns={
+            "cidade": "Cidade", "nome": "Nome do Produto", "preco": "Preço",
+            "url": "URL", "falha": "Falha", "data": "Data",
+        })[["Cidade", "Nome do Produto", "Preço", "URL", "Falha", "Data"]]
+
+    def fechar(self):
+        self._con.close()
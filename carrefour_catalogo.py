@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+"""
+Catálogo de produtos (índice único para todas as cidades)
+A lista de URLs é carregada uma vez, normalizada e deduplicada pelo id do
+produto (o número no fim do slug), e cada entrada ganha tipo de página
+(produto / busca), categoria e prioridade. Os motores de todas as cidades consomem
+CATALOGO, então nenhuma requisição é gasta duas vezes no mesmo produto.
+Com CARREFOUR_BASE_URL (ex.: http://127.0.0.1:8765/, o stub_carrefour.py), as
+URLs do site passam a apontar para esse host.
+"""
+
+import os
+import re
+import unicodedata
+from urllib.parse import urlsplit, urlunsplit, unquote
+
+
+# =========================
+# 1) URLs (lista base)
+# =========================
+SITE = "https://mercado.carrefour.com.br/"
+BASE_URL = os.environ.get("CARREFOUR_BASE_URL") or SITE
+
+URLS = [
+    # ------------------ Lista original ------------------
+    'https://mercado.carrefour.com.br/arroz-branco-longofino-tipo-1-tio-joao-2kg-115657/p',
+    'https://mercado.carrefour.com.br/feijao-carioca-tipo-1-kicaldo-1kg-466506/p',
+    'https://mercado.carrefour.com.br/macarrao-de-semola-com-ovos-espaguete-8-adria-500g-4180372/p',
+    'https://mercado.carrefour.com.br/farofa-de-mandioca-tradicional-yoki-400g-6582613/p',
+    'https://mercado.carrefour.com.br/massa-para-pastel-discao-massa-leve-500g-841757/p',
+    'https://mercado.carrefour.com.br/macarrao-instantaneo-nissin-sabor-galinha-caipira-85g-4814177/p',
+    'https://mercado.carrefour.com.br/batata-monalisa-carrefour-aprox-600g-46922/p',
+    'https://mercado.carrefour.com.br/pimentao-block-vermelho-trebeshi-150-g-5738458/p',
+    'https://mercado.carrefour.com.br/tomate-carmem-carrefour-aprox-500g-262676/p',
+    'https://mercado.carrefour.com.br/cebola-carrefour-aprox-500g-20621/p',
+    'https://mercado.carrefour.com.br/cenoura-unico-1kg-5154669/p',
+    'https://mercado.carrefour.com.br/acucar-refinado-uniao-1kg-197564/p',
+    'https://mercado.carrefour.com.br/chocolate-ao-leite-com-amendoim-shot-165g-5790859/p',
+    'https://mercado.carrefour.com.br/sorvete-napolitano-nestle-1-5-litros-8616043/p',
+    'https://mercado.carrefour.com.br/achocolatado-em-po-nescau-550g-6409717/p',
+    'https://mercado.carrefour.com.br/alface-lisa-carrefour-7745044/p',
+    'https://mercado.carrefour.com.br/couve-flor-cledson-300-g-9560297/p',
+    'https://mercado.carrefour.com.br/banana-nanica-fresca-organica-600g-210978/p',
+    'https://mercado.carrefour.com.br/banana-prata-fischer-turma-da-monica-750g-9773711/p',
+    'https://mercado.carrefour.com.br/limao-siciliano-carrefour-aprox-500g-63592/p',
+    'https://mercado.carrefour.com.br/maca-gala-carrefour-aprox-600-g-10120/p',
+    'https://mercado.carrefour.com.br/mamao-formosa-sabor-qualidade-aprox-16-kg-20524/p',
+    'https://mercado.carrefour.com.br/manga-palmer-carrefour-aprox-600g-88919/p',
+    'https://mercado.carrefour.com.br/melancia-premium-carrefour-aprox---8kg-194743/p',
+    'https://mercado.carrefour.com.br/pera-willians-aprox-500g-39675/p',
+    'https://mercado.carrefour.com.br/uva-escura-sem-semente-carrefour-500g-5141982/p',
+    'https://mercado.carrefour.com.br/laranja-pera-carrefour-mercado-5-kg-6282032/p',
+    'https://mercado.carrefour.com.br/bisteca-suina-congelada-sadia-1-kg-209864/p',
+    'https://mercado.carrefour.com.br/contra-file-swift-mais-aprox-1-5kg-295906/p',
+    'https://mercado.carrefour.com.br/coxao-mole-fracionado-a-vacuo-aprox--1-3-kg-18295/p',
+    'https://mercado.carrefour.com.br/alcatra-bovina-carrefour-aproximadamente-400-g-21962/p',
+    'https://mercado.carrefour.com.br/patinho-fracionado-a-vacuo-500g-18325/p',
+    'https://mercado.carrefour.com.br/lagarto-swift-mais-aprox-15kg-295914/p',
+    'https://mercado.carrefour.com.br/paleta-bovina-a-vacuo-500gnao-reativarcodigo-de-compra-20745/p',
+    'https://mercado.carrefour.com.br/acem-em-pedacos-carrefour-aproximadamente-500-g-158828/p',
+    'https://mercado.carrefour.com.br/costela-minga-bovina-cong-aprox-2kg-224006/p',
+    'https://mercado.carrefour.com.br/camarao-descascado-cozido-36-40-celm-400-g-5939747/p',
+    'https://mercado.carrefour.com.br/posta-cacao-congelado-buona-pesca-500-g-6311059/p',
+    'https://mercado.carrefour.com.br/file-de-merluza-congelado-planalto-500-g-6323774/p',
+    'https://mercado.carrefour.com.br/file-de-pescada-sem-espinha-swift-500-g-5457297/p',
+    'https://mercado.carrefour.com.br/file-de-tilapia-fresco-carrefour-500-g-98930/p',
+    'https://mercado.carrefour.com.br/presunto-cozido-sem-capa-fatiado-aurora-aproximadamente-200-g-49450/p',
+    'https://mercado.carrefour.com.br/salsicha-hot-dog-resfriada-aurora-aproximadamente-500-g-49352/p',
+    'https://mercado.carrefour.com.br/linguica-toscana-swift-700-g-5600812/p',
+    'https://mercado.carrefour.com.br/mortadela-defumada-sadia-280g-5447045/p',
+    'https://mercado.carrefour.com.br/queijo-minas-frescal-aurora-450-g-6264693/p',
+    'https://mercado.carrefour.com.br/queijo-coalho-bom-leite-500-g-4305054/p',
+    'https://mercado.carrefour.com.br/leite-uht-integral-piratininga-1-l-665017/p',
+    'https://mercado.carrefour.com.br/iogurte-natural-tradicional-batavo-170g-5150439/p',
+    'https://mercado.carrefour.com.br/manteiga-com-sal-aviacao-200-g-10010/p',
+    'https://mercado.carrefour.com.br/creme-de-leite-ultrapasteurizado-itambe-200-g-5988921/p',
+    'https://mercado.carrefour.com.br/requeijao-cremoso-aviacao-tradicional-220-g-10000/p',
+    'https://mercado.carrefour.com.br/acucar-cristal-carrefour-1kg-5147300/p',
+    'https://mercado.carrefour.com.br/mel-com-cacau-e-avela-400-g-4510146/p',
+    'https://mercado.carrefour.com.br/geleia-de-goiaba-selecoes-c-pedacos-260-g-1280815/p',
+    'https://mercado.carrefour.com.br/suco-de-uva-integral-maric-1-l-3538256/p',
+    'https://mercado.carrefour.com.br/vinho-tinto-fino-seco-cabernet-sauvignon-pergola-750ml-1521709/p',
+    'https://mercado.carrefour.com.br/whisky-red-label-johnnie-walker-1-litro-2719/p',
+    'https://mercado.carrefour.com.br/refrigerante-coca-cola-sabor-cola-1-5-l-11087/p',
+    'https://mercado.carrefour.com.br/cafe-torrado-e-moido-extraforte-melitta-500g-271203/p',
+    'https://mercado.carrefour.com.br/farinha-de-trigo-dona-benta-tradicional-1kg-196416/p',
+    'https://mercado.carrefour.com.br/azeite-extravirgem-portugues-oliveira-da-serra-500-ml-4526108/p',
+    'https://mercado.carrefour.com.br/oleo-de-soja-soya-900ml-482616/p',
+    'https://mercado.carrefour.com.br/margarina-qualy-com-sal-250g-4815618/p',
+    'https://mercado.carrefour.com.br/arroz-branco-longofino-tipo-1-tio-joao-1kg-115658/p',
+    'https://mercado.carrefour.com.br/feijao-preto-tipo-1-kicaldo-1kg-466510/p',
+
+    # ------------------ Itens adicionais ------------------
+    # Arroz
+    'https://mercado.carrefour.com.br/arroz-branco-longo-fino-tipo-1-meu-biju-1kg-4956435/p',
+    'https://mercado.carrefour.com.br/arroz-branco-carrefour-classic-olimpiadas-1kg-3433455/p',
+    'https://mercado.carrefour.com.br/arroz-branco-longofino-tipo-1-prato-fino-1-kg-3142248/p',
+    'https://mercado.carrefour.com.br/arroz-branco-longofino-tipo-1-camil-todo-dia-1kg-1336118/p',
+    'https://mercado.carrefour.com.br/arroz-branco-longofino-tipo-1-tio-joao-1-kg-387606/p',
+    'https://mercado.carrefour.com.br/arroz-parboilizado-longo-fino-tipo-1-carrefour-1kg-6677711/p',
+    'https://mercado.carrefour.com.br/arroz-parboilizado-longo-fino-tipo-1-tio-joao-1-kg-3136400/p',
+    'https://mercado.carrefour.com.br/arroz-parboilizado-longo-fino-tipo-1-prato-fino-1-kg-7043236/p',
+
+    # Pão francês
+    'https://mercado.carrefour.com.br/pao-frances-carrefour-aprox-110g-168076/p',
+    'https://mercado.carrefour.com.br/busca/pao%20frances',
+
+    # Leite longa vida
+    'https://mercado.carrefour.com.br/leite-desnatado-piracanjuba-1-litro-3371697/p',
+    'https://mercado.carrefour.com.br/leite-desnatado-uht-molico-1-l-6083900/p',
+    'https://mercado.carrefour.com.br/leite-desnatado-uht-tipo-a-leitissimo-1-litro-9682953/p',
+    'https://mercado.carrefour.com.br/leite-semidesnatado-liquido-parmalat-1-litro-5254337/p',
+    'https://mercado.carrefour.com.br/leite-semidesnatado-piracanjuba-1-litro-7863756/p',
+    'https://mercado.carrefour.com.br/leite-semidesnatado-uht-goiasminas-italac-1-litro-8819530/p',
+    'https://mercado.carrefour.com.br/leite-uht-integral-carrefour-classic-1l-3218023/p',
+    'https://mercado.carrefour.com.br/leite-sem-lactose-integral-uht-italac-1-litro-5823048/p',
+
+    # Biscoito
+    'https://mercado.carrefour.com.br/biscoito-com-chocolate-chocobiscuit-nestle-ao-leite-78g-3485935/p',
+    'https://mercado.carrefour.com.br/biscoito-amanteigado-chocolate-e-doce-de-leite-carrefour-100-g-6226213/p',
+    'https://mercado.carrefour.com.br/busca/biscoito%20doce',
+    'https://mercado.carrefour.com.br/biscoito-de-polvilho-doce-carrefour-200g-7738714/p',
+    'https://mercado.carrefour.com.br/biscoito-salgado-club-social-original-multipack-144g-9923357/p',
+    'https://mercado.carrefour.com.br/biscoito-de-polvilho-salgado-carrefour-200g-5570417/p',
+    'https://mercado.carrefour.com.br/biscoito-salgado-cream-cracker-integral-piraque-215g-3179591/p',
+
+    # Refrigerante e água mineral
+    'https://mercado.carrefour.com.br/refrigerante-guarana-antarctica-garrafa-2l-156396/p',
+    'https://mercado.carrefour.com.br/refrigerante-cocacola-garrafa-2-l-5761719/p',
+    'https://mercado.carrefour.com.br/refrigerante-fanta-laranja-2l-157201/p',
+    'https://mercado.carrefour.com.br/agua-mineral-sem-gas-nestle-pureza-vital-15-litros-7026099/p',
+    'https://mercado.carrefour.com.br/agua-mineral-crystal-sem-gas-15l-8812128/p',
+    'https://mercado.carrefour.com.br/agua-mineral-sem-gas-minalba-15-litros-708941/p',
+    'https://mercado.carrefour.com.br/agua-mineral-sem-gas-frescca-15-litros-4928784/p',
+
+    # Frango inteiro
+    'https://mercado.carrefour.com.br/frango-inteiro-temperado-seara-assa-facil-aprox-19kg-170739/p',
+    'https://mercado.carrefour.com.br/frango-inteiro-swift-aprox-25-kg-213519/p',
+
+    # Café moído
+    'https://mercado.carrefour.com.br/cafe-torrado-e-moido-a-vacuo-tradicional-pilao-500g-7515758/p',
+    'https://mercado.carrefour.com.br/busca/cafe%20moido',
+    'https://mercado.carrefour.com.br/cafe-torrado-e-moido-do-ponto-exportacao-vacuo-500-g-4416090/p',
+    'https://mercado.carrefour.com.br/cafe-torrado-e-moido-a-vacuo-bom-jesus-500g-8343527/p',
+    'https://mercado.carrefour.com.br/cafe-torrado-e-moido-3-coracoes-cerrado-mineiro-250-g-6127002/p',
+    'https://mercado.carrefour.com.br/cafe-starbucks-house-blend-torrado-e-moido-torra-media-250g-5688396/p',
+
+    # Cerveja
+    'https://mercado.carrefour.com.br/cerveja-heineken-garrafa-600ml-7941234/p',
+    'https://mercado.carrefour.com.br/cerveja-baden-baden-golden-ale-garrafa-600ml-7948190/p',
+    'https://mercado.carrefour.com.br/cerveja-brahma-duplo-malte-puro-malte-350ml-lata-6643426/p',
+    'https://mercado.carrefour.com.br/cerveja-budweiser-american-lager-lata-269-ml-9704698/p',
+    'https://mercado.carrefour.com.br/cerveja-pilsen-original-lata-269ml-6418724/p',
+    'https://mercado.carrefour.com.br/cerveja-original-pilsen-350ml-lata-5699193/p',
+    'https://mercado.carrefour.com.br/cerveja-amstel-lager-lata-sleek-350ml-3180107/p',
+    'https://mercado.carrefour.com.br/cerveja-heineken-lata-269ml-6688802/p',
+
+    # Costela
+    'https://mercado.carrefour.com.br/costela-bovina-janela-congelada-aprox-1-8kg-224014/p',
+    'https://mercado.carrefour.com.br/busca/costela?page=1',
+    'https://mercado.carrefour.com.br/costela-de-cordeiro-a-vacuo-28738/p',
+
+    # Queijo
+    'https://mercado.carrefour.com.br/queijo-mussarela-fatiado-president-150g-8613966/p',
+    'https://mercado.carrefour.com.br/queijo-fatiado-sabor-mussarela-polenghi-144g-7413394/p',
+    'https://mercado.carrefour.com.br/queijo-mussarela-fatiado-carrefour-aproximadamente-200-g-25585/p',
+    'https://mercado.carrefour.com.br/queijo-mussarela-importado-fatiado-aprox-200g-149225/p',
+    'https://mercado.carrefour.com.br/queijo-mussarela-fatiado-mandaka-com-150-g-6709206/p',
+    'https://mercado.carrefour.com.br/queijo-prato-fatiado-president-150g-8614008/p',
+    'https://mercado.carrefour.com.br/queijo-prato-fatiado-tirolez-150g-5033799/p',
+
+    # Linguiça
+    'https://mercado.carrefour.com.br/busca/lingui%C3%A7a',
+    'https://mercado.carrefour.com.br/linguica-toscana-grossa-auora-aprox--700g-21113/p',
+    'https://mercado.carrefour.com.br/linguica-toscana-sadia-700g-3213242/p',
+    'https://mercado.carrefour.com.br/linguica-toscana-swift-700-g-5600812/p',
+    'https://mercado.carrefour.com.br/busca/lingui%C3%A7a?page=3',
+
+    # Leite em pó
+    'https://mercado.carrefour.com.br/leite-em-po-molico-desnatado-lata-280g-9442405/p',
+    'https://mercado.carrefour.com.br/leite-em-po-integral-italac-200g-7680198/p',
+    'https://mercado.carrefour.com.br/leite-em-po-ninho-adulto-lata-350g-3428877/p',
+    'https://mercado.carrefour.com.br/leite-desnatado-em-po-instantaneo-italac-280g-8669937/p',
+
+    # Ovo de galinha
+    'https://mercado.carrefour.com.br/ovos-brancos-carrefour-20-unidades-5286387/p',
+    'https://mercado.carrefour.com.br/ovo-branco-grande-ac-planalto-ovos-bandeja-com-20-6206310/p',
+    'https://mercado.carrefour.com.br/ovos-vermelhos-carrefour-20-unidades-8453624/p',
+    'https://mercado.carrefour.com.br/ovo-vermelho-grande-mantiqueira-happy-eggs-com-20-unidades-6403603/p',
+    'https://mercado.carrefour.com.br/ovo-branco-grande-mantiqueira-happy-eggs-com-20-unidades-6403565/p',
+    'https://mercado.carrefour.com.br/ovo-caipira-grande-organicos-raiar-com-20-unidades-3050050/p',
+
+    # Óleo de soja
+    'https://mercado.carrefour.com.br/oleo-de-soja-confiare-900ml-3731243/p',
+    'https://mercado.carrefour.com.br/oleo-de-soja-soya-900ml-141836/p',
+    'https://mercado.carrefour.com.br/oleo-de-soja-vitaliv-garrafa-900-ml-6473563/p'
+]
+
+
+# =========================
+# 2) Categorias
+# =========================
+# Primeira palavra do slug (ou do termo de busca) -> categoria; "Leite em pó"
+# é o "Leite" com "-em-po" no slug.
+CATEGORIAS = [
+    ("Arroz", ["arroz"]),
+    ("Feijão", ["feijao"]),
+    ("Massas", ["macarrao", "massa"]),
+    ("Mercearia", ["farofa", "farinha", "acucar", "mel", "geleia", "achocolatado"]),
+    ("Óleos e azeites", ["oleo", "azeite"]),
+    ("Hortifruti", [
+        "batata", "pimentao", "tomate", "cebola", "cenoura", "alface", "couve",
+        "banana", "limao", "maca", "mamao", "manga", "melancia", "pera", "uva", "laranja",
+    ]),
+    ("Carnes", ["bisteca", "contra", "coxao", "alcatra", "patinho", "lagarto", "paleta", "acem", "costela"]),
+    ("Frango", ["frango"]),
+    ("Peixes e frutos do mar", ["camarao", "posta", "file"]),
+    ("Frios e embutidos", ["presunto", "salsicha", "linguica", "mortadela"]),
+    ("Queijos", ["queijo"]),
+    ("Leite", ["leite"]),
+    ("Laticínios", ["iogurte", "manteiga", "creme", "requeijao", "margarina"]),
+    ("Ovos", ["ovo", "ovos"]),
+    ("Pão francês", ["pao"]),
+    ("Biscoito", ["biscoito"]),
+    ("Doces", ["chocolate", "sorvete"]),
+    ("Café", ["cafe"]),
+    ("Cerveja", ["cerveja"]),
+    ("Bebidas", ["refrigerante", "agua", "suco", "vinho", "whisky"]),
+]
+_CATEGORIA_POR_PALAVRA = {p: cat for cat, palavras in CATEGORIAS for p in palavras}
+
+# Prioridade na coleta (0 = primeiro): itens da cesta básica vêm antes e são
+# os últimos a serem pulados quando o prazo da execução aperta.
+CESTA_BASICA = {
+    "Arroz", "Feijão", "Leite", "Carnes", "Pão francês", "Café", "Óleos e azeites",
+    "Mercearia", "Hortifruti", "Laticínios",
+}
+
+
+def prioridade_da_categoria(categoria: str) -> int:
+    return 0 if categoria in CESTA_BASICA else 1
+
+
+def _sem_acento(texto: str) -> str:
+    return unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+
+
+def categoria_do_slug(slug: str) -> str:
+    slug = _sem_acento(unquote(slug)).lower().replace(" ", "-")
+    categoria = _CATEGORIA_POR_PALAVRA.get(slug.split("-", 1)[0], "Outros")
+    if categoria == "Leite" and "-em-po" in slug:
+        return "Leite em pó"
+    return categoria
+
+
+# =========================
+# 3) Normalização e índice
+# =========================
+_RE_PRODUTO = re.compile(r"^/(?P<slug>.+)-(?P<id>\d+)/p$")
+
+
+def normalizar_url(url: str, base: str = None) -> str:
+    """
+    https, host minúsculo, sem fragmento e sem barra final (a query fica: é a
+    paginação). O host do site vira o de `base` (padrão BASE_URL), que mantém
+    o próprio esquema (o stub é http).
+    """
+    base = urlsplit(base or BASE_URL)
+    partes = urlsplit(url.strip())
+    host = partes.netloc.lower()
+    if host == urlsplit(SITE).netloc:
+        host = base.netloc
+    esquema = base.scheme if host == base.netloc else "https"
+    path = partes.path.rstrip("/") or "/"
+    return urlunsplit((esquema, host, path, partes.query, ""))
+
+
+def entrada_catalogo(url: str) -> dict:
+    """Entrada do índice: chave de dedupe, id, tipo de página, categoria e prioridade."""
+    url = normalizar_url(url)
+    partes = urlsplit(url)
+    m = _RE_PRODUTO.match(partes.path)
+    if m:
+        categoria = categoria_do_slug(m.group("slug"))
+        return {
+            "chave": f"produto:{m.group('id')}",
+            "id": m.group("id"),
+            "tipo": "produto",
+            "categoria": categoria,
+            "prioridade": prioridade_da_categoria(categoria),
+            "url": url,
+        }
+    categoria = categoria_do_slug(partes.path.rsplit("/", 1)[-1])
+    return {
+        "chave": f"busca:{partes.path.lower()}?{partes.query}",
+        "id": None,
+        "tipo": "busca" if partes.path.startswith("/busca/") else "outra",
+        "categoria": categoria,
+        "prioridade": prioridade_da_categoria(categoria),
+        "url": url,
+    }
+
+
+def id_produto(url: str):
+    """Id numérico do produto no slug da URL (…-<id>/p); None para busca/outras."""
+    return entrada_catalogo(url)["id"] if url else None
+
+
+def carregar_catalogo(urls: list = URLS):
+    """(entradas únicas na ordem da lista, URLs descartadas como duplicadas)."""
+    vistos = set()
+    catalogo, duplicadas = [], []
+    for url in urls:
+        entrada = entrada_catalogo(url)
+        if entrada["chave"] in vistos:
+            duplicadas.append(entrada["url"])
+            continue
+        vistos.add(entrada["chave"])
+        catalogo.append(entrada)
+    return catalogo, duplicadas
+
+
+CATALOGO, DUPLICADAS = carregar_catalogo()
@@ -0,0 +1,663 @@
+# -*- coding: utf-8 -*-
+"""
+Núcleo compartilhado dos scrapers Carrefour (todas as cidades)
+Driver, fixação de CEP e leitura do JSON-LD. A gravação (armazém Parquet e
+Excel mensal) fica em carrefour_armazem.py; a execução (serial ou
+multi-cidades) em scraper_multicidades.py.
+"""
+
+import os
+import re
+import json
+import time
+import threading
+from urllib.parse import urlsplit
+from datetime import datetime
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+
+from carrefour_ritmo import controle, MARCAS_BLOQUEIO
+from carrefour_catalogo import BASE_URL
+
+
+# =========================
+# 1) Paths e nomes mensais
+# =========================
+try:
+    BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+except NameError:
+    BASE_DIR = os.getcwd()
+
+today = datetime.now()
+STAMP_DAY = today.strftime("%Y%m%d")       # -> coluna diária (Preço_YYYYMMDD)
+STAMP_MONTH = today.strftime("%Y-%m")      # -> arquivo do mês
+COLUNA_DIA = f"Preço_{STAMP_DAY}"
+# identifica a execução no log longo (reruns do mesmo dia ficam distinguíveis)
+EXECUCAO = os.environ.get("GITHUB_RUN_ID") or today.strftime("%Y%m%dT%H%M%S")
+
+HOME = BASE_URL  # CARREFOUR_BASE_URL troca o host (ex.: stub local)
+
+ESPERA_PRODUTO = 8  # teto (s) para o JSON-LD com preço aparecer após driver.get
+ORCAMENTO_URL = 20  # teto (s) por URL no Chrome: navegação + espera + extração
+
+# Tabela de cidades: tag gravada na coluna "Cidade", CEP usado para fixar a
+# região (None = região padrão do site), pasta de dados e prefixo dos arquivos
+# (precos_<prefixo><YYYY-MM>.xlsx / erros_<prefixo><YYYY-MM>.xlsx).
+CIDADES = {
+    "sp": {
+        "tag": "São Paulo",
+        "cep": None,
+        "data_dir": "data",
+        "prefixo": "carrefour_",
+    },
+    "bh": {
+        "tag": "Belo Horizonte",
+        "cep": "30130-000",
+        "data_dir": "data_bh",
+        "prefixo": "carrefour_bh-",
+    },
+    "rj": {
+        "tag": "Rio de Janeiro",
+        "cep": "20010-000",
+        "data_dir": "data_rj",
+        "prefixo": "carrefour_rj-",
+    },
+    "salvador": {
+        "tag": "Salvador",
+        "cep": "40020-000",
+        "data_dir": "data_salvador",
+        "prefixo": "carrefour_salvador-",
+    },
+    "curitiba": {
+        "tag": "Curitiba",
+        "cep": "80010-000",
+        "data_dir": "data_curitiba",
+        "prefixo": "carrefour_curitiba-",
+    },
+    "porto_alegre": {
+        "tag": "Porto Alegre",
+        "cep": "90010-000",
+        "data_dir": "data_porto_alegre",
+        "prefixo": "carrefour_porto_alegre-",
+    },
+}
+
+
+def caminhos_cidade(cidade: dict, mes: str = STAMP_MONTH) -> dict:
+    """Resolve (e cria) a pasta da cidade, os Excel e o log longo do mês `mes`, o armazém Parquet e o diário do dia."""
+    data_dir = os.path.join(BASE_DIR, cidade["data_dir"])
+    os.makedirs(data_dir, exist_ok=True)
+    return {
+        "data_dir": data_dir,
+        "mensal": os.path.join(data_dir, f"precos_{cidade['prefixo']}{mes}.xlsx"),
+        "erros": os.path.join(data_dir, f"erros_{cidade['prefixo']}{mes}.xlsx"),
+        "indice": os.path.join(data_dir, f"indice_{cidade['prefixo']}{mes}.json"),
+        "diario": os.path.join(data_dir, f"diario_{cidade['prefixo']}{STAMP_DAY}.jsonl"),
+        "armazem": os.path.join(data_dir, "precos"),
+        "historico": os.path.join(data_dir, f"historico_{cidade['prefixo']}{mes}.csv"),
+    }
+
+
+# =========================================
+# 2) Driver (headless — ideal para Actions)
+# =========================================
+# Bloqueio de recursos via DevTools (Network.setBlockedURLs). Cada perfil diz
+# quais tipos de recurso e quais domínios cortar; "permitir" tira domínios da
+# lista de bloqueio (ex.: manter um CDN que o site passe a exigir).
+EXTENSOES_TIPO = {
+    "imagem": ["png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico"],
+    "css": ["css"],
+    "fonte": ["woff", "woff2", "ttf", "otf", "eot"],
+    "midia": ["mp4", "webm", "m3u8", "mp3", "ogg"],
+}
+DOMINIOS_RASTREIO = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googleadservices.com",
+    "facebook.net",
+    "connect.facebook.com",
+    "hotjar.com",
+    "clarity.ms",
+    "criteo.com",
+    "criteo.net",
+    "taboola.com",
+    "nr-data.net",
+    "tiktok.com",
+    "analytics.tiktok.com",
+    "bing.com",
+    "pinterest.com",
+    "rtbhouse.com",
+]
+PERFIS_BLOQUEIO = {
+    # páginas de produto: só o HTML e os scripts importam (o ld+json vem no HTML)
+    "produto": {
+        "tipos": ["imagem", "css", "fonte", "midia"],
+        "dominios": DOMINIOS_RASTREIO,
+        "permitir": [],
+    },
+    # fluxo do CEP: precisa de layout (CSS) para os botões ficarem clicáveis
+    "localizacao": {
+        "tipos": ["imagem", "fonte", "midia"],
+        "dominios": DOMINIOS_RASTREIO,
+        "permitir": [],
+    },
+}
+
+
+def padroes_bloqueio(perfil: dict) -> list:
+    """Lista de padrões de URL (sintaxe do setBlockedURLs) de um perfil."""
+    permitidos = set(perfil.get("permitir", []))
+    padroes = []
+    for tipo in perfil.get("tipos", []):
+        for ext in EXTENSOES_TIPO[tipo]:
+            padroes.append(f"*.{ext}")
+            padroes.append(f"*.{ext}?*")
+    for dominio in perfil.get("dominios", []):
+        if dominio not in permitidos:
+            padroes.append(f"*://*.{dominio}/*")
+            padroes.append(f"*://{dominio}/*")
+    return padroes
+
+
+def aplicar_bloqueio(driver, perfil: str = "produto"):
+    """Ativa o perfil de bloqueio no driver (vale para as próximas navegações)."""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": padroes_bloqueio(PERFIS_BLOQUEIO[perfil])})
+    except Exception as e:
+        # sem CDP (outro navegador/driver remoto): segue sem bloqueio
+        print("⚠️ Bloqueio de recursos indisponível:", e)
+
+
+def build_driver(headless: bool = True, bloqueio: str = "produto", carregamento: str = "eager"):
+    opts = webdriver.ChromeOptions()
+    if headless:
+        opts.add_argument("--headless=new")
+    opts.add_argument("--disable-gpu")
+    opts.add_argument("--no-sandbox")
+    opts.add_argument("--disable-dev-shm-usage")
+    opts.add_argument("--window-size=1920,1080")
+    # "eager" não espera tudo para acelerar; "none" (modo abas) nem espera o
+    # DOMContentLoaded, para o chromedriver não bloquear numa aba carregando
+    opts.page_load_strategy = carregamento
+    # desliga imagens para ganhar velocidade
+    opts.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2
+    })
+    # Selenium Manager resolve o driver compatível automaticamente
+    driver = webdriver.Chrome(options=opts)
+    # uma página travada custa no máximo o orçamento da URL, não um minuto
+    driver.set_page_load_timeout(ORCAMENTO_URL)
+    # sem implicit wait: todo find_elements vazio pagaria 2 s escondidos;
+    # as esperas são explícitas (WebDriverWait) onde precisam existir
+    driver.implicitly_wait(0)
+    if bloqueio:
+        aplicar_bloqueio(driver, bloqueio)
+    return driver
+
+
+def sessao_viva(driver) -> bool:
+    """O chromedriver ainda responde? (Chrome/chromedriver morto = "invalid session id")"""
+    try:
+        driver.window_handles
+        return True
+    except Exception:
+        return False
+
+
+# ==========================================================
+# 3) Fixar a localização no site (CEP da cidade) — com fallbacks
+# ==========================================================
+def fix_location(driver, cep: str):
+    """
+    Abre a home, aciona o seletor de endereço e seta o CEP da cidade.
+    Implementa múltiplos fallbacks de seletores porque o site muda com frequência.
+    Retorna True se conseguiu digitar o CEP.
+    """
+    driver.get(HOME)
+    time.sleep(2)
+    wait = WebDriverWait(driver, 12)
+
+    # cookies / consent
+    for xpath in [
+        '//button[contains(@id,"onetrust-accept-btn-handler")]',
+        '//button[contains(., "Aceitar") or contains(., "Continuar") or contains(., "Concordo")]',
+        '//button[contains(., "OK")]',
+    ]:
+        try:
+            wait.until(EC.element_to_be_clickable((By.XPATH, xpath))).click()
+            time.sleep(0.8)
+            break
+        except Exception:
+            pass
+
+    # abrir seletor de endereço
+    for xpath in [
+        '//button[contains(., "Informe seu endereço")]',
+        '//button[contains(., "Alterar endereço")]',
+        '//button[contains(., "Mudar endereço")]',
+        '//button[contains(., "Endereço")]',
+        '//button[contains(@aria-label,"Endereço")]',
+        '//div[contains(@class,"address")]//button',
+        '//button[contains(@data-testid,"address") or contains(@data-testid,"location")]',
+    ]:
+        try:
+            wait.until(EC.element_to_be_clickable((By.XPATH, xpath))).click()
+            time.sleep(1.0)
+            break
+        except Exception:
+            pass
+
+    # input CEP (às vezes já está na home, mesmo sem abrir o seletor)
+    input_el = None
+    for xpath in [
+        '//input[@name="zipcode" or @id="zipcode" or contains(@placeholder,"CEP")]',
+        '//input[contains(@aria-label,"CEP")]',
+        '//input[@type="text" and (contains(@placeholder,"CEP") or contains(@data-testid,"cep"))]',
+    ]:
+        try:
+            input_el = wait.until(EC.presence_of_element_located((By.XPATH, xpath)))
+            break
+        except Exception:
+            pass
+
+    if not input_el:
+        return False
+
+    try:
+        input_el.clear()
+        input_el.send_keys(cep)
+        time.sleep(0.8)
+    except Exception:
+        return False
+
+    for xpath in [
+        '//button[contains(., "Confirmar") or contains(., "Continuar") or contains(., "Buscar") or contains(., "OK")]',
+        '//button[@type="submit"]',
+    ]:
+        try:
+            btn = WebDriverWait(driver, 2).until(EC.element_to_be_clickable((By.XPATH, xpath)))
+            btn.click()
+            time.sleep(1.2)
+            break
+        except Exception:
+            pass
+
+    driver.get(HOME)  # reforça o contexto regional
+    time.sleep(1.2)
+    return True
+
+
+# ==========================================================
+# 3b) Sessão regional persistida (cookies + localStorage por CEP)
+# ==========================================================
+# O fluxo de UI do CEP custa dezenas de segundos; o resultado (cookies e
+# localStorage do site) fica salvo em disco e é injetado direto nos drivers
+# novos. A UI só roda quando não há sessão salva ou ela venceu.
+SESSOES_DIR = os.path.join(BASE_DIR, ".sessoes")
+SESSAO_VALIDADE_H = 72
+
+JS_LER_STORAGE = "return Object.assign({}, window.localStorage);"
+JS_GRAVAR_STORAGE = """
+for (const [k, v] of Object.entries(arguments[0])) window.localStorage.setItem(k, v);
+"""
+
+
+# Várias sessões da mesma cidade subindo juntas: só uma passa pela UI do CEP
+_LOCKS_CEP = {}
+_LOCK_CEPS = threading.Lock()
+
+
+def _lock_cep(cep: str) -> threading.Lock:
+    with _LOCK_CEPS:
+        return _LOCKS_CEP.setdefault(cep, threading.Lock())
+
+
+def _arq_sessao(cep: str) -> str:
+    return os.path.join(SESSOES_DIR, f"{cep.replace('-', '')}.json")
+
+
+def salvar_sessao(driver, cep: str):
+    """Grava cookies e localStorage do driver (que deve estar no domínio do site)."""
+    try:
+        sessao = {
+            "cep": cep,
+            "salvo_em": time.time(),
+            "cookies": driver.get_cookies(),
+            "local_storage": driver.execute_script(JS_LER_STORAGE) or {},
+        }
+    except Exception as e:
+        print("⚠️ Não consegui ler a sessão do navegador:", e)
+        return
+    os.makedirs(SESSOES_DIR, exist_ok=True)
+    tmp = _arq_sessao(cep) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(sessao, f, ensure_ascii=False)
+    os.replace(tmp, _arq_sessao(cep))
+
+
+def ler_sessao(cep: str):
+    """Sessão salva e ainda válida para o CEP (cookies vencidos já removidos), ou None."""
+    try:
+        with open(_arq_sessao(cep), encoding="utf-8") as f:
+            sessao = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    agora = time.time()
+    if agora - sessao.get("salvo_em", 0) > SESSAO_VALIDADE_H * 3600:
+        return None
+    cookies = [c for c in sessao.get("cookies", []) if c.get("expiry", agora + 1) > agora]
+    if not cookies:
+        return None
+    sessao["cookies"] = cookies
+    return sessao
+
+
+def _na_loja(driver) -> bool:
+    """A aba já saiu do "loading" numa página do host da loja?"""
+    try:
+        return (urlsplit(driver.current_url).netloc == urlsplit(HOME).netloc
+                and driver.execute_script("return document.readyState") != "loading")
+    except Exception:
+        return False
+
+
+def cookie_da_loja(cookie: dict) -> bool:
+    """O cookie vale para o host da loja (HOME, que segue CARREFOUR_BASE_URL)?"""
+    host = urlsplit(HOME).hostname
+    dominio = (cookie.get("domain") or host).lstrip(".")
+    return host == dominio or host.endswith("." + dominio)
+
+
+def limpar_storage(driver):
+    """Apaga o localStorage da loja (a sessão regional também mora nele), esteja onde estiver a aba."""
+    origem = "{0.scheme}://{0.netloc}".format(urlsplit(HOME))
+    try:
+        driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origem, "storageTypes": "local_storage"})
+    except Exception:
+        try:
+            driver.execute_script("window.localStorage.clear();")
+        except Exception:
+            pass
+
+
+def carregar_sessao(driver, cep: str) -> bool:
+    """
+    Injeta a sessão salva do CEP no driver. False = não há sessão válida ou ela
+    não entrou (cookie da loja recusado, localStorage com erro): aí quem chamou
+    segue pela UI do CEP, em vez de coletar na região padrão sem avisar.
+    """
+    sessao = ler_sessao(cep)
+    if sessao is None:
+        return False
+
+    # add_cookie só vale para o domínio da página atual; com page_load_strategy
+    # "none" (modo abas) o get() volta antes de sair da página em branco
+    driver.get(HOME)
+    try:
+        WebDriverWait(driver, ORCAMENTO_URL, poll_frequency=0.25).until(_na_loja)
+    except TimeoutException:
+        print(f"⚠️ Sessão regional (CEP {cep}): a home não carregou, seguindo pela UI")
+        return False
+
+    recusados = 0
+    for cookie in sessao["cookies"]:
+        cookie = {k: v for k, v in cookie.items() if k in (
+            "name", "value", "path", "domain", "secure", "httpOnly", "expiry", "sameSite")}
+        if "expiry" in cookie:
+            cookie["expiry"] = int(cookie["expiry"])
+        try:
+            driver.add_cookie(cookie)
+        except Exception:
+            # cookie de terceiros não faz falta; da loja, sim (é nele que vai a região)
+            recusados += cookie_da_loja(cookie)
+    if recusados:
+        print(f"⚠️ Sessão regional (CEP {cep}): {recusados} cookies da loja recusados, seguindo pela UI")
+        return False
+    if sessao.get("local_storage"):
+        try:
+            driver.execute_script(JS_GRAVAR_STORAGE, sessao["local_storage"])
+        except Exception as e:
+            print(f"⚠️ Sessão regional (CEP {cep}): localStorage não gravado ({e}), seguindo pela UI")
+            return False
+    print(f"🍪 Sessão regional reaproveitada (CEP {cep})")
+    return True
+
+
+def aplicar_cidade(driver, cidade: dict):
+    """Coloca o driver no contexto regional da cidade (CEP None = região padrão)."""
+    # troca de cidade: nada da anterior pode sobrar (nem cookies, nem localStorage)
+    driver.delete_all_cookies()
+    limpar_storage(driver)
+    cep = cidade.get("cep")
+    if not cep:
+        return
+    if carregar_sessao(driver, cep):
+        return
+
+    # as outras sessões da cidade esperam e reaproveitam a sessão salva aqui
+    with _lock_cep(cep):
+        if carregar_sessao(driver, cep):
+            return
+        aplicar_bloqueio(driver, "localizacao")
+        try:
+            if fix_location(driver, cep):
+                salvar_sessao(driver, cep)
+        finally:
+            aplicar_bloqueio(driver, "produto")
+
+
+# =====================================
+# 4) Scraper: lê JSON-LD do tipo Product
+# =====================================
+def coerce_price(value):
+    if value is None:
+        return 0.0
+    # JSON-LD normalmente traz número (ou "12.99"); só strings no formato BR
+    # ("R$ 1.234,56") precisam remover o separador de milhar.
+    if isinstance(value, (int, float)):
+        return float(value)
+    s = str(value).strip().replace("R$", "").replace("\u00a0", "").replace(" ", "")
+    if "," in s:
+        s = s.replace(".", "").replace(",", ".")
+    try:
+        return float(s)
+    except Exception:
+        return 0.0
+
+
+def parse_jsonld(raw: str):
+    """
+    Retorna uma lista de objetos (dicts) de JSON-LD a partir do raw.
+    Suporta único objeto, lista, e @graph.
+    """
+    try:
+        data = json.loads(raw)
+    except Exception:
+        return []
+
+    objs = []
+    if isinstance(data, dict):
+        if "@graph" in data and isinstance(data["@graph"], list):
+            objs.extend([o for o in data["@graph"] if isinstance(o, dict)])
+        else:
+            objs.append(data)
+    elif isinstance(data, list):
+        objs.extend([o for o in data if isinstance(o, dict)])
+    return objs
+
+
+def extrair_produto(obj: dict):
+    """(nome, preço) de um objeto JSON-LD do tipo Product."""
+    name = obj.get("name", "Não encontrado")
+    offers = obj.get("offers", {})
+    price = None
+    # offers pode ser dict ou lista; AggregateOffer (comum em listagens) traz lowPrice
+    if isinstance(offers, list) and offers:
+        offers = offers[0]
+    if isinstance(offers, dict):
+        price = (
+            offers.get("price")
+            or (offers.get("priceSpecification") or {}).get("price")
+            or offers.get("lowPrice")
+        )
+    return name, coerce_price(price)
+
+
+# Classes de falha (coluna "Falha" no log de erros; cada uma tem sua política
+# de nova tentativa em carrefour_retentativas.py)
+FALHA_TIMEOUT = "timeout"          # a página não carregou no tempo
+FALHA_SEM_JSONLD = "sem_jsonld"    # carregou, mas sem Product/listagem
+FALHA_SEM_PRECO = "sem_preco"      # Product sem preço (> 0)
+FALHA_NAVEGACAO = "navegacao"      # erro do navegador/driver na navegação
+FALHA_PRAZO = "prazo"              # pulada: não coube no prazo da execução
+FALHA_BLOQUEIO = "bloqueio"        # página de desafio/captcha/acesso negado
+FALHA_VAZIA = "pagina_vazia"       # casca de erro do site (404/500, "ops")
+FALHA_DISJUNTOR = "disjuntor"      # pulada: disjuntor da cidade aberto/abortado
+
+
+def registro(cidade_tag: str, url: str, name: str = "Não encontrado", price: float = 0.0,
+             falha: str = None) -> dict:
+    rec = {"Cidade": cidade_tag, "Nome do Produto": name, "Preço": price, "URL": url}
+    if falha:
+        rec["Falha"] = falha
+    return rec
+
+
+# Seleciona o Product dentro do navegador: 1 round trip ao chromedriver por
+# verificação, em vez de find_elements + 1 get_attribute por <script>.
+# Mesma regra de parse_jsonld (objeto, lista ou @graph).
+JS_PRODUTO = """
+for (const s of document.querySelectorAll('script[type="application/ld+json"]')) {
+    let data;
+    try { data = JSON.parse(s.textContent); } catch (e) { continue; }
+    if (!data) continue;
+    const objs = Array.isArray(data) ? data
+        : (Array.isArray(data['@graph']) ? data['@graph'] : [data]);
+    for (const o of objs) {
+        if (o && typeof o === 'object' && o['@type'] === 'Product') return o;
+    }
+}
+return null;
+"""
+
+
+# Classificador rápido de página sem produto: desafio/captcha ou casca de erro
+# não vão mudar esperando, então a URL sai na hora (e alimenta o disjuntor).
+MARCAS_PAGINA_VAZIA = (
+    "página não encontrada", "pagina nao encontrada", "ops!", "algo deu errado",
+    "service unavailable", "bad gateway", "internal server error", "erro 500", "erro 404",
+)
+
+# Título, começo do texto visível e nº de <script ld+json> (só é lido sem produto)
+JS_PAGINA = """
+return {
+    titulo: document.title || '',
+    texto: document.body ? document.body.innerText.slice(0, 3000) : '',
+    ld: document.querySelectorAll('script[type="application/ld+json"]').length
+};
+"""
+
+JS_SONDA = """
+const produto = (function () {%s})();
+return {produto: produto, pagina: produto ? null : (function () {%s})()};
+""" % (JS_PRODUTO, JS_PAGINA)
+
+_RE_TITULO = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+_RE_SEM_TAGS = re.compile(r"<(script|style)\b.*?</\1>|<[^>]+>", re.IGNORECASE | re.DOTALL)
+
+
+def classificar_pagina(pagina: dict):
+    """FALHA_BLOQUEIO, FALHA_VAZIA ou None (página normal, ou ainda carregando)."""
+    if not pagina or pagina.get("ld"):
+        return None
+    texto = f"{pagina.get('titulo') or ''}\n{pagina.get('texto') or ''}".lower()
+    if any(m in texto for m in MARCAS_BLOQUEIO):
+        return FALHA_BLOQUEIO
+    if any(m in texto for m in MARCAS_PAGINA_VAZIA):
+        return FALHA_VAZIA
+    return None
+
+
+def classificar_html(html: str):
+    """Mesmo classificador para o HTML cru do cliente HTTP."""
+    html = html or ""
+    m = _RE_TITULO.search(html)
+    return classificar_pagina({
+        "titulo": m.group(1) if m else "",
+        "texto": _RE_SEM_TAGS.sub(" ", html[:50000])[:3000],
+        "ld": html.count("application/ld+json"),
+    })
+
+
+def espera_restante(inicio: float, espera_max: float) -> float:
+    """Espera pós-navegação que ainda cabe no orçamento da URL (inicio = time.monotonic())."""
+    return max(0.0, min(espera_max, ORCAMENTO_URL - (time.monotonic() - inicio)))
+
+
+def scrape_product_via_json(url: str, driver: webdriver.Chrome, cidade_tag: str,
+                            espera_max: float = ESPERA_PRODUTO) -> dict:
+    print(f"\n🔗 [{cidade_tag}] {url}")
+
+    # espera por condição: retorna assim que houver Product com preço > 0
+    # (o preço às vezes aparece após pequeno atraso); espera_max é só o teto
+    visto = {}
+
+    def _com_preco(d):
+        sonda = d.execute_script(JS_SONDA) or {}
+        if isinstance(sonda.get("produto"), dict):
+            achado = extrair_produto(sonda["produto"])
+            visto["produto"] = achado
+            return achado if achado[1] > 0 else False
+        # bloqueio/página de erro: não adianta esperar o teto
+        visto["classe"] = classificar_pagina(sonda.get("pagina"))
+        return bool(visto["classe"])
+
+    # a navegação ocupa uma vaga do controle de ritmo do Chrome
+    falha = FALHA_SEM_JSONLD
+    with controle(url, "chrome").vaga() as vaga:
+        carregou = False
+        try:
+            driver.get(url)
+            carregou = True
+            achado = WebDriverWait(
+                driver, espera_restante(vaga.inicio, espera_max), poll_frequency=0.25,
+                ignored_exceptions=(StaleElementReferenceException,),
+            ).until(_com_preco)
+            if achado is True:
+                falha = visto["classe"]
+                vaga.marcar("bloqueio" if falha == FALHA_BLOQUEIO else "neutro")
+            else:
+                name, price_float = achado
+                print("✅", name, "| R$", price_float)
+                return registro(cidade_tag, url, name, price_float)
+        except TimeoutException:
+            # timeout no driver.get = página não carregou; depois dele, só faltou o produto
+            vaga.marcar("neutro" if carregou else "timeout")
+            if not carregou:
+                falha = FALHA_TIMEOUT
+        except Exception as e:
+            print("❌ Erro no parsing JSON-LD:", e)
+            # erro do driver (sessão morta etc.) não é resposta rápida e saudável
+            vaga.marcar("neutro" if carregou else "servidor")
+            if not carregou:
+                falha = FALHA_NAVEGACAO
+
+    if "produto" in visto:
+        # Product sem preço: mantém o nome na linha de erro
+        name, price_float = visto["produto"]
+        print("⚠️ Produto sem preço:", name)
+        return registro(cidade_tag, url, name, price_float, FALHA_SEM_PRECO)
+
+    if falha in (FALHA_BLOQUEIO, FALHA_VAZIA):
+        print(f"🚫 Página de {'bloqueio' if falha == FALHA_BLOQUEIO else 'erro'} do site.")
+    else:
+        print("⚠️ Nada encontrado nessa URL.")
+    return registro(cidade_tag, url, falha=falha)
+
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Diário de coleta (checkpoint por cidade e por dia)
+Cada resultado é anexado, assim que sai, a um .jsonl na pasta da cidade
+(diario_<prefixo><YYYYMMDD>.jsonl). Se o Chrome cair ou o job estourar o tempo,
+o que já foi coletado não se perde; uma nova execução no mesmo dia pula as
+URLs que já têm preço e refaz só as falhas.
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+
+from carrefour_comum import CIDADES, caminhos_cidade
+
+
+def _ok(rec) -> bool:
+    """Registro com preço (página de busca: algum produto listado com preço)."""
+    if isinstance(rec, list):
+        return any(r.get("Preço", 0) > 0 for r in rec)
+    return bool(rec) and rec.get("Preço", 0) > 0
+
+
+def ler_diario(caminho: str) -> dict:
+    """{chave do catálogo: último registro}; linha truncada (job morto no meio) é ignorada."""
+    entradas = {}
+    if not os.path.exists(caminho):
+        return entradas
+    with open(caminho, encoding="utf-8") as f:
+        for linha in f:
+            try:
+                e = json.loads(linha)
+            except ValueError:
+                continue
+            if "chave" in e:  # linhas de evento não são resultado
+                entradas[e["chave"]] = e["registro"]
+    return entradas
+
+
+class Diario:
+    """
+    Um arquivo append-only por cidade para o dia. `catalogo` é a lista de
+    entradas do índice (carrefour_catalogo.CATALOGO): o diário guarda a chave
+    estável da entrada, não a posição, para sobreviver a mudanças na lista.
+    """
+
+    def __init__(self, chaves, catalogo: list):
+        self._lock = threading.Lock()
+        self._catalogo = catalogo
+        self._caminhos = {chave: caminhos_cidade(CIDADES[chave])["diario"] for chave in chaves}
+        self._arquivos = {}
+
+    def concluidos(self, chave: str) -> dict:
+        """{chave do catálogo: registro} do que já saiu com preço hoje nesta cidade."""
+        return {k: rec for k, rec in ler_diario(self._caminhos[chave]).items() if _ok(rec)}
+
+    def registrar(self, chave: str, idx: int, rec):
+        self._anexar(chave, {"chave": self._catalogo[idx]["chave"], "ok": _ok(rec), "registro": rec})
+
+    def evento(self, chave: str, tipo: str, estado: str, hora: datetime = None):
+        """Linha de evento (ex.: {"evento": "disjuntor", "estado": "abortado"})."""
+        hora = (hora or datetime.now()).isoformat(timespec="seconds")
+        self._anexar(chave, {"evento": tipo, "estado": estado, "hora": hora})
+
+    def _anexar(self, chave: str, entrada: dict):
+        linha = json.dumps(entrada, ensure_ascii=False)
+        with self._lock:
+            f = self._arquivos.get(chave)
+            if f is None:
+                f = self._arquivos[chave] = open(self._caminhos[chave], "a", encoding="utf-8")
+            f.write(linha + "\n")
+            f.flush()  # o processo pode ser morto a qualquer momento
+
+    def fechar(self):
+        with self._lock:
+            for f in self._arquivos.values():
+                f.close()
+            self._arquivos.clear()
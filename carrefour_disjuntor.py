@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Disjuntor por cidade (circuit breaker)
+Quando o site passa a servir desafio/captcha ou casca de erro, insistir nas
+~150 URLs restantes só queima tempo (e piora o bloqueio). Depois de LIMITE
+páginas bloqueadas/vazias seguidas, a cidade fica em pausa; vencida a pausa,
+uma única URL de teste decide: deu certo, volta ao normal; falhou, pausa de
+novo (mais longa). Depois de ABERTURAS_MAX pausas, a cidade é abortada e o
+resto da fila sai como "disjuntor".
+"""
+
+import time
+
+from carrefour_comum import FALHA_BLOQUEIO, FALHA_VAZIA
+
+
+LIMITE = 5           # falhas de bloqueio/vazia seguidas para abrir
+PAUSA = 90.0         # pausa (s) da 1ª abertura; dobra a cada nova abertura
+ABERTURAS_MAX = 3    # aberturas antes de desistir da cidade
+
+FALHAS_DISJUNTOR = {FALHA_BLOQUEIO, FALHA_VAZIA}
+
+
+class Disjuntor:
+    """Estado: "fechado" (normal), "aberto" (em pausa), "teste" ou "abortado". Sem lock próprio."""
+
+    def __init__(self, limite: int = LIMITE, pausa: float = PAUSA, aberturas_max: int = ABERTURAS_MAX):
+        self.limite, self.pausa, self.aberturas_max = limite, pausa, aberturas_max
+        self.estado = "fechado"
+        self.seguidas = 0
+        self.aberturas = 0
+        self.reabre_em = 0.0
+        self.sondando = False
+
+    def liberado(self, agora: float = None) -> bool:
+        """Pode servir uma URL desta cidade agora?"""
+        agora = time.monotonic() if agora is None else agora
+        if self.estado == "aberto" and agora >= self.reabre_em:
+            self.estado, self.sondando = "teste", False
+        if self.estado == "teste":
+            return not self.sondando
+        return self.estado == "fechado"
+
+    def servida(self):
+        if self.estado == "teste":
+            self.sondando = True  # só uma URL de teste por vez
+
+    def devolvida(self):
+        """A URL servida voltou para a fila sem desfecho (ex.: o Chrome caiu com ela em voo)."""
+        self.sondando = False
+
+    def registrar(self, falha: str = None):
+        """
+        Desfecho de uma URL da cidade. Devolve o evento ("aberto"/"abortado"/
+        "fechado") quando o estado muda, senão None.
+        """
+        if falha not in FALHAS_DISJUNTOR:
+            if self.estado == "teste":
+                if falha is not None:
+                    self.sondando = False  # teste inconclusivo (timeout etc.): outra URL
+                    return None
+                self.estado, self.seguidas = "fechado", 0
+                return "fechado"
+            if falha is None:
+                self.seguidas = 0
+            return None
+
+        if self.estado in ("aberto", "abortado"):
+            return None  # resposta de URL que já estava em voo quando abriu
+        self.seguidas += 1
+        if self.estado != "teste" and self.seguidas < self.limite:
+            return None
+
+        self.aberturas += 1
+        if self.aberturas >= self.aberturas_max:
+            self.estado = "abortado"
+            return "abortado"
+        self.estado = "aberto"
+        self.reabre_em = time.monotonic() + self.pausa * 2 ** (self.aberturas - 1)
+        return "aberto"
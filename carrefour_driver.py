@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+Ciclo de vida do Chrome
+O headless cresce em memória e fica lento em sessões longas, então o driver é
+reciclado depois de N páginas ou acima de um teto de RSS. Um driver reserva
+(já com o CEP da cidade aplicado) é preparado em segundo plano perto do limite,
+e a troca não trava o laço de coleta.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import psutil
+
+from carrefour_comum import CIDADES, build_driver, aplicar_cidade, ler_sessao, sessao_viva
+from carrefour_http import cabecalho_cookies
+
+
+MAX_PAGINAS = 60       # recicla depois de tantas páginas no mesmo Chrome
+MAX_RSS_MB = 1500      # ... ou quando chromedriver + Chrome passarem disso
+MARGEM_RESERVA = 10    # começa a aquecer a reserva tantas páginas antes
+CHECAR_RSS_A_CADA = 10  # medir RSS custa uma varredura de processos
+
+
+def rss_driver_mb(driver) -> float:
+    """RSS (MB) do chromedriver e de todos os processos do Chrome abaixo dele."""
+    try:
+        raiz = psutil.Process(driver.service.process.pid)
+        procs = [raiz] + raiz.children(recursive=True)
+    except (AttributeError, psutil.Error):
+        return 0.0
+    total = 0
+    for p in procs:
+        try:
+            total += p.memory_info().rss
+        except psutil.Error:
+            pass
+    return total / (1024 * 1024)
+
+
+def _novo_driver(chave: str, headless: bool, carregamento: str = "eager"):
+    driver = build_driver(headless=headless, carregamento=carregamento)
+    if chave is not None:
+        aplicar_cidade(driver, CIDADES[chave])
+    return driver
+
+
+def preparar_sessoes_regionais(chaves: list, headless: bool = True) -> dict:
+    """
+    Garante uma sessão regional salva para cada cidade com CEP (o Chrome só
+    sobe, em paralelo, para as que não têm sessão válida em disco) e devolve
+    {chave: header Cookie} para o cliente HTTP. Cidade sem sessão fica de fora.
+    """
+    faltando = [c for c in chaves if CIDADES[c].get("cep") and ler_sessao(CIDADES[c]["cep"]) is None]
+
+    def _montar(chave):
+        driver = build_driver(headless=headless)
+        try:
+            aplicar_cidade(driver, CIDADES[chave])
+        finally:
+            driver.quit()
+
+    if faltando:
+        with ThreadPoolExecutor(max_workers=len(faltando)) as pool:
+            for chave, futuro in [(c, pool.submit(_montar, c)) for c in faltando]:
+                try:
+                    futuro.result()
+                except Exception as e:
+                    print(f"⚠️ [{CIDADES[chave]['tag']}] Sem sessão regional:", e)
+
+    cookies = {}
+    for chave in chaves:
+        cep = CIDADES[chave].get("cep")
+        sessao = ler_sessao(cep) if cep else None
+        if sessao:
+            cookies[chave] = cabecalho_cookies(sessao["cookies"])
+    return cookies
+
+
+class GerenciadorDriver:
+    """
+    Entrega um Chrome pronto para a cidade pedida e cuida da reciclagem.
+    Uso: driver = ger.obter(chave); ...; ger.pagina_servida(); ...; ger.fechar()
+    Se a sessão morrer no meio (vivo() falso), recuperar() a descarta e o
+    próximo obter() devolve um Chrome novo já na cidade.
+    """
+
+    def __init__(self, headless: bool = True, max_paginas: int = MAX_PAGINAS,
+                 max_rss_mb: float = MAX_RSS_MB, reserva: bool = True,
+                 carregamento: str = "eager"):
+        self.headless = headless
+        self.carregamento = carregamento
+        self.max_paginas = max_paginas
+        self.max_rss_mb = max_rss_mb
+        self.reserva = reserva
+        self.paginas = 0
+        self.reciclagens = 0
+        self.recuperacoes = 0
+        self._driver = None
+        self._cidade = None      # chave da cidade aplicada em self._driver
+        self._rss_alto = False
+        self._reserva = None     # Future -> (driver, chave)
+        self._pool = ThreadPoolExecutor(max_workers=1) if reserva else None
+
+    # ---- uso no laço ----
+    def obter(self, chave: str):
+        if self._driver is not None and self.precisa_reciclar():
+            self._reciclar(chave)
+        if self._driver is None:
+            self._driver, self._cidade = self._pegar_reserva(chave)
+        if self._cidade != chave:
+            aplicar_cidade(self._driver, CIDADES[chave])
+            self._cidade = chave
+        return self._driver
+
+    def pagina_servida(self):
+        self.paginas += 1
+        if self.paginas % CHECAR_RSS_A_CADA == 0:
+            rss = rss_driver_mb(self._driver)
+            self._rss_alto = rss >= self.max_rss_mb
+            if rss >= 0.8 * self.max_rss_mb:
+                self._aquecer_reserva()
+        if self.paginas >= self.max_paginas - MARGEM_RESERVA:
+            self._aquecer_reserva()
+
+    def vivo(self) -> bool:
+        """A sessão atual ainda responde? (sem driver aberto não há o que checar)"""
+        return self._driver is None or sessao_viva(self._driver)
+
+    def recuperar(self):
+        """Sessão morta (Chrome/chromedriver caiu): o próximo obter() sobe outro e reaplica a cidade."""
+        self.recuperacoes += 1
+        tag = CIDADES[self._cidade]["tag"] if self._cidade else "-"
+        print(f"💥 [{tag}] Sessão do Chrome morreu: recriando o navegador e retomando")
+        self.descartar()
+
+    def descartar(self):
+        """Joga fora o driver atual (ex.: sessão morta); o próximo obter() cria outro."""
+        self._encerrar(self._driver)
+        self._driver, self._cidade = None, None
+        self.paginas, self._rss_alto = 0, False
+
+    def fechar(self):
+        self._encerrar(self._driver)
+        self._driver = None
+        if self._reserva is not None:
+            try:
+                self._encerrar(self._reserva.result()[0])
+            except Exception:
+                pass
+            self._reserva = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+
+    def precisa_reciclar(self) -> bool:
+        return self.paginas >= self.max_paginas or self._rss_alto
+
+    # ---- internos ----
+    def _reciclar(self, chave: str):
+        motivo = "RSS" if self._rss_alto else f"{self.paginas} páginas"
+        print(f"♻️ Reciclando Chrome ({motivo})")
+        self.reciclagens += 1
+        self.descartar()
+        self._driver, self._cidade = self._pegar_reserva(chave)
+
+    def _aquecer_reserva(self):
+        if self._pool is None or self._reserva is not None:
+            return
+        chave = self._cidade
+        self._reserva = self._pool.submit(
+            lambda: (_novo_driver(chave, self.headless, self.carregamento), chave)
+        )
+
+    def _pegar_reserva(self, chave: str):
+        futuro, self._reserva = self._reserva, None
+        if futuro is not None:
+            try:
+                return futuro.result()
+            except Exception as e:
+                print("⚠️ Reserva do Chrome falhou, criando outro:", e)
+        return _novo_driver(chave, self.headless, self.carregamento), chave
+
+    @staticmethod
+    def _encerrar(driver):
+        if driver is None:
+            return
+        try:
+            driver.quit()
+        except Exception:
+            pass
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Coleta via HTTP (sem navegador)
+O JSON-LD de Product vem no HTML renderizado no servidor, então basta baixar a
+página com um cliente HTTP com pool de conexões e ler o <script ld+json>.
+O Chrome fica só como fallback para as URLs em que isso falha; página de
+bloqueio ou de erro do site volta como falha (alimenta o disjuntor da cidade).
+"""
+
+import re
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from carrefour_comum import (
+    parse_jsonld, extrair_produto, registro, classificar_html, cookie_da_loja, FALHA_BLOQUEIO, FALHA_VAZIA,
+)
+from carrefour_ritmo import controle, sinal_http, retry_after
+
+
+# =========================
+# 1) Cliente HTTP (pool)
+# =========================
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/126.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "pt-BR,pt;q=0.9,en;q=0.8",
+}
+TIMEOUT = 15
+
+
+def build_session(pool: int = 10) -> requests.Session:
+    """
+    Session com keep-alive; pool >= nº de workers para não recriar conexões.
+    O jar não aceita cookies: a mesma Session atende várias cidades, e a região
+    de cada uma vai explícita no header Cookie de cada requisição.
+    """
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = HTTPAdapter(pool_connections=pool, pool_maxsize=pool, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# =====================================
+# 2) JSON-LD direto do HTML
+# =====================================
+RE_JSONLD = re.compile(
+    r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def jsonld_do_html(html: str) -> list:
+    """Todos os objetos JSON-LD (já achatados por parse_jsonld) de um HTML."""
+    objs = []
+    for raw in RE_JSONLD.findall(html or ""):
+        objs.extend(parse_jsonld(raw.strip()))
+    return objs
+
+
+def produto_do_html(html: str):
+    """(nome, preço) do primeiro Product com preço > 0, ou None."""
+    for obj in jsonld_do_html(html):
+        if obj.get("@type") == "Product":
+            name, price = extrair_produto(obj)
+            if price > 0:
+                return name, price
+    return None
+
+
+def falha_do_html(html: str, cidade_tag: str, url: str):
+    """FALHA_BLOQUEIO/FALHA_VAZIA para HTML sem o que se procurava, ou None (→ Chrome)."""
+    falha = classificar_html(html)
+    if falha:
+        print(f"🚫 [{cidade_tag}] Página de {'bloqueio' if falha == FALHA_BLOQUEIO else 'erro'} do site: {url}")
+    else:
+        print(f"↪️ [{cidade_tag}] Sem JSON-LD no HTML → Chrome: {url}")
+    return falha
+
+
+def falha_do_status(status: int):
+    """403/429 = bloqueio, 5xx = página de erro do site; outros (404...) = None (→ Chrome)."""
+    if status in (403, 429):
+        return FALHA_BLOQUEIO
+    if status >= 500:
+        return FALHA_VAZIA
+    return None
+
+
+def avisar_status(status: int, cidade_tag: str, url: str):
+    """Classe de falha do status HTTP != 200, com o aviso de sempre."""
+    falha = falha_do_status(status)
+    if falha:
+        print(f"🚫 [{cidade_tag}] HTTP {status} ({falha}): {url}")
+    else:
+        print(f"↪️ [{cidade_tag}] HTTP {status} → Chrome: {url}")
+    return falha
+
+
+def cabecalho_cookies(cookies: list) -> str:
+    """Header Cookie a partir dos cookies exportados do Chrome (só os do host do site)."""
+    return "; ".join(f"{c['name']}={c['value']}" for c in cookies if cookie_da_loja(c))
+
+
+def baixar_html(url: str, session: requests.Session, cidade_tag: str, cookies: str = None):
+    """
+    GET dentro de uma vaga do controle de ritmo do host; (html, falha): HTML
+    com status 200; falha = bloqueio (403/429) ou pagina_vazia (5xx); os dois
+    None = cair para o Chrome (timeout, erro de rede, 404...).
+    O desfecho (429/5xx/timeout/bloqueio) ajusta a janela compartilhada.
+    """
+    with controle(url).vaga() as vaga:
+        try:
+            resp = session.get(url, timeout=TIMEOUT, headers={"Cookie": cookies} if cookies else None)
+        except requests.Timeout:
+            vaga.marcar("timeout")
+            print(f"↪️ [{cidade_tag}] HTTP falhou (Timeout) → Chrome: {url}")
+            return None, None
+        except requests.RequestException as e:
+            vaga.marcar("servidor")
+            print(f"↪️ [{cidade_tag}] HTTP falhou ({type(e).__name__}) → Chrome: {url}")
+            return None, None
+        vaga.marcar(sinal_http(resp.status_code, resp.text), retry_after(resp.headers.get("Retry-After")))
+
+    if resp.status_code != 200:
+        return None, avisar_status(resp.status_code, cidade_tag, url)
+    return resp.text, None
+
+
+def scrape_product_via_http(url: str, session: requests.Session, cidade_tag: str,
+                            cookies: str = None):
+    """
+    Registro no mesmo formato de scrape_product_via_json, ou None quando a
+    página não trouxe um Product com preço (o chamador cai para o Chrome).
+    Página de bloqueio/erro do site: registro com a Falha (o Chrome não ajuda).
+    cookies: header Cookie com a sessão regional da cidade (None = região padrão).
+    """
+    html, falha = baixar_html(url, session, cidade_tag, cookies)
+    if falha:
+        return registro(cidade_tag, url, falha=falha)
+    if html is None:
+        return None
+
+    achado = produto_do_html(html)
+    if achado is None:
+        falha = falha_do_html(html, cidade_tag, url)
+        return registro(cidade_tag, url, falha=falha) if falha else None
+
+    name, price = achado
+    print(f"⚡ [{cidade_tag}] {name} | R$ {price}")
+    return registro(cidade_tag, url, name, price)
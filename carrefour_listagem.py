@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+Páginas de busca/listagem (/busca/...)
+Não têm um Product no JSON-LD, então pelo caminho de produto viravam
+"Não encontrado". Aqui elas são lidas como listagem: ItemList do JSON-LD e o
+estado embutido da página (__NEXT_DATA__), gerando um registro por produto
+listado. Uma página de busca rende dezenas de preços.
+"""
+
+import re
+import json
+from urllib.parse import urljoin
+
+import requests
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from carrefour_comum import (
+    ESPERA_PRODUTO,
+    FALHA_BLOQUEIO,
+    FALHA_NAVEGACAO,
+    FALHA_SEM_JSONLD,
+    FALHA_TIMEOUT,
+    JS_PAGINA,
+    classificar_pagina,
+    espera_restante,
+    parse_jsonld,
+    extrair_produto,
+    registro,
+)
+from carrefour_catalogo import entrada_catalogo
+from carrefour_http import RE_JSONLD, baixar_html, falha_do_html
+from carrefour_api import preco_produto
+from carrefour_ritmo import controle
+
+
+LIMITE_PRODUTOS = 200  # teto de produtos por página de listagem
+
+_RE_ESTADO = re.compile(
+    r'<script[^>]*id=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL,
+)
+
+JS_LISTAGEM = """
+const ld = Array.from(document.querySelectorAll('script[type="application/ld+json"]'))
+    .map(s => s.textContent);
+const estado = document.getElementById('__NEXT_DATA__');
+const pagina = (ld.length || estado) ? null : (function () {%s})();
+return {ld: ld, estado: estado ? estado.textContent : null, pagina: pagina};
+""" % JS_PAGINA
+
+
+# =====================================
+# 1) Reconhecer produtos na listagem
+# =====================================
+def eh_listagem(url: str) -> bool:
+    return entrada_catalogo(url)["tipo"] == "busca"
+
+
+def _produto_de_no(no: dict, url_base: str):
+    """(nome, preço, url) se o nó parece um produto com preço, senão None."""
+    if no.get("@type") == "Product" or ("name" in no and "offers" in no):
+        name, price = extrair_produto(no)
+    elif "productName" in no and "items" in no:
+        name, price = no["productName"], preco_produto(no)
+    else:
+        return None
+    if price <= 0:
+        return None
+
+    link = no.get("url") or no.get("link")
+    if not link and no.get("slug"):
+        link = f"/{no['slug']}/p"
+    if not link and no.get("linkText"):
+        link = f"/{no['linkText']}/p"
+    return name, price, urljoin(url_base, link) if link else None
+
+
+def produtos_de_jsonld(objs: list, url_base: str) -> list:
+    """Produtos de um ItemList (itemListElement -> ListItem.item ou Product direto)."""
+    achados = []
+    for obj in objs:
+        if obj.get("@type") != "ItemList":
+            continue
+        for el in obj.get("itemListElement") or []:
+            if not isinstance(el, dict):
+                continue
+            alvo = el.get("item") if isinstance(el.get("item"), dict) else el
+            p = _produto_de_no(alvo, url_base)
+            if p:
+                achados.append(p)
+    return achados
+
+
+def produtos_do_estado(estado, url_base: str) -> list:
+    """Varre o estado embutido (JSON) atrás de nós com cara de produto."""
+    achados = []
+    pilha = [estado]
+    while pilha and len(achados) < LIMITE_PRODUTOS:
+        no = pilha.pop()
+        if isinstance(no, dict):
+            p = _produto_de_no(no, url_base)
+            if p:
+                achados.append(p)
+                continue
+            pilha.extend(reversed(list(no.values())))
+        elif isinstance(no, list):
+            pilha.extend(reversed(no))
+    return achados
+
+
+def produtos_da_listagem(ld_textos: list, estado_texto, url_base: str) -> list:
+    """(nome, preço, url) únicos da página: ItemList primeiro, depois o estado."""
+    objs = []
+    for raw in ld_textos or []:
+        objs.extend(parse_jsonld(raw))
+    achados = produtos_de_jsonld(objs, url_base)
+    if estado_texto:
+        try:
+            achados += produtos_do_estado(json.loads(estado_texto), url_base)
+        except ValueError:
+            pass
+
+    unicos, vistos = [], set()
+    for name, price, url in achados:
+        chave = url or name
+        if chave not in vistos:
+            vistos.add(chave)
+            unicos.append((name, price, url))
+    return unicos[:LIMITE_PRODUTOS]
+
+
+def produtos_da_listagem_html(html: str, url_base: str) -> list:
+    m = _RE_ESTADO.search(html or "")
+    return produtos_da_listagem(RE_JSONLD.findall(html or ""), m.group(1) if m else None, url_base)
+
+
+def registros_da_listagem(produtos: list, cidade_tag: str, url_busca: str) -> list:
+    """Um registro por produto listado (URL do produto quando a listagem traz)."""
+    return [registro(cidade_tag, url or url_busca, name, price) for name, price, url in produtos]
+
+
+# =====================================
+# 2) Listagem via HTTP
+# =====================================
+def scrape_listagem_via_http(url: str, session: requests.Session, cidade_tag: str,
+                             cookies: str = None):
+    """Como scrape_product_via_http, mas devolve a lista de registros da busca (ou None)."""
+    html, falha = baixar_html(url, session, cidade_tag, cookies)
+    if falha:
+        return [registro(cidade_tag, url, falha=falha)]
+    if html is None:
+        return None
+    return registros_do_html(html, cidade_tag, url)
+
+
+def registros_do_html(html: str, cidade_tag: str, url: str):
+    """Registros da busca; [erro] se a página é de bloqueio/erro; None (→ Chrome) se veio vazia."""
+    produtos = produtos_da_listagem_html(html, url)
+    if not produtos:
+        falha = falha_do_html(html, cidade_tag, url)
+        return [registro(cidade_tag, url, falha=falha)] if falha else None
+    print(f"⚡ [{cidade_tag}] {len(produtos)} produtos na busca {url}")
+    return registros_da_listagem(produtos, cidade_tag, url)
+
+
+# =====================================
+# 3) Listagem pelo Chrome
+# =====================================
+def scrape_listagem_via_json(url: str, driver, cidade_tag: str,
+                             espera_max: float = ESPERA_PRODUTO) -> list:
+    """Lista de registros da página de busca; [erro] se nada foi listado."""
+    print(f"\n🔎 [{cidade_tag}] {url}")
+
+    classe = {}
+
+    def _listados(d):
+        dados = d.execute_script(JS_LISTAGEM) or {}
+        produtos = produtos_da_listagem(dados.get("ld"), dados.get("estado"), url)
+        if produtos:
+            return produtos
+        classe["falha"] = classificar_pagina(dados.get("pagina"))
+        return bool(classe["falha"])  # bloqueio/página de erro: sai na hora
+
+    produtos = []
+    falha = FALHA_SEM_JSONLD
+    with controle(url, "chrome").vaga() as vaga:
+        carregou = False
+        try:
+            driver.get(url)
+            carregou = True
+            produtos = WebDriverWait(driver, espera_restante(vaga.inicio, espera_max),
+                                     poll_frequency=0.25).until(_listados)
+            if produtos is True:
+                produtos, falha = [], classe["falha"]
+                vaga.marcar("bloqueio" if falha == FALHA_BLOQUEIO else "neutro")
+        except TimeoutException:
+            vaga.marcar("neutro" if carregou else "timeout")
+            if not carregou:
+                falha = FALHA_TIMEOUT
+        except Exception as e:
+            print("❌ Erro lendo a listagem:", e)
+            vaga.marcar("neutro" if carregou else "servidor")
+            if not carregou:
+                falha = FALHA_NAVEGACAO
+
+    if not produtos:
+        print("🚫 Página de bloqueio/erro do site." if classe.get("falha") else "⚠️ Nada listado nessa busca.")
+        return [registro(cidade_tag, url, falha=falha)]
+    print(f"✅ {len(produtos)} produtos na listagem")
+    return registros_da_listagem(produtos, cidade_tag, url)
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+Edição no lugar de um .xlsx (zip de XML), sem carregar a planilha
+O openpyxl (e o pandas por cima dele) monta um objeto por célula para ler e
+serializa todas de novo para salvar. Para pôr a coluna do dia e o bloco do
+histórico, basta mexer no XML das abas: as células novas vão como texto
+"inline" (sem tocar em sharedStrings.xml) e o resto do arquivo é copiado.
+"""
+
+import os
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+
+_RE_NUMERO_LINHA = re.compile(r'\br="(\d+)"')
+_RE_CELULA = re.compile(r'<c\b[^>]*?\br="([A-Z]+)\d+"[^>]*?(?:/>|>.*?</c>)', re.S)
+_RE_ATRIBUTOS = re.compile(r'([\w:]+)="([^"]*)"')
+
+
+def letra_coluna(n: int) -> str:
+    """1 -> A, 27 -> AA."""
+    letras = ""
+    while n:
+        n, resto = divmod(n - 1, 26)
+        letras = chr(65 + resto) + letras
+    return letras
+
+
+def numero_coluna(letras: str) -> int:
+    n = 0
+    for ch in letras:
+        n = n * 26 + ord(ch) - 64
+    return n
+
+
+def _posicoes_linhas(xml: str, ini: int, fim: int):
+    """(número, início, fim) de cada <row> entre ini e fim, só com find (sem abrir as células)."""
+    pos = xml.find("<row", ini, fim)
+    while pos >= 0:
+        fecha = xml.find(">", pos)
+        abre = xml[pos:fecha + 1]
+        final = fecha + 1 if abre.endswith("/>") else xml.find("</row>", fecha) + len("</row>")
+        yield int(_RE_NUMERO_LINHA.search(abre).group(1)), pos, final
+        pos = xml.find("<row", final, fim)
+
+
+def _celula(ref: str, valor, estilo: str = None) -> str:
+    s = f' s="{estilo}"' if estilo else ""
+    if isinstance(valor, (int, float)):
+        return f'<c r="{ref}"{s} t="n"><v>{valor!r}</v></c>'
+    return f'<c r="{ref}"{s} t="inlineStr"><is><t>{escape(str(valor))}</t></is></c>'
+
+
+class PlanilhaXlsx:
+    """Uso: p = PlanilhaXlsx(arq); p.gravar_celulas(...); p.anexar_linhas(...); p.salvar()."""
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        with zipfile.ZipFile(caminho) as z:
+            self._nomes = z.namelist()
+            self._partes = {n: z.read(n) for n in self._nomes}
+        self._abas = self._mapear_abas()
+
+    def _mapear_abas(self) -> dict:
+        """{nome da aba: caminho do XML dentro do zip}."""
+        rels = {}
+        for tag in re.findall(r"<Relationship\b[^>]*>", self._partes["xl/_rels/workbook.xml.rels"].decode("utf-8")):
+            a = dict(_RE_ATRIBUTOS.findall(tag))
+            alvo = a["Target"].lstrip("/")
+            rels[a["Id"]] = alvo if alvo.startswith("xl/") else "xl/" + alvo
+        abas = {}
+        for tag in re.findall(r"<sheet\b[^>]*>", self._partes["xl/workbook.xml"].decode("utf-8")):
+            a = dict(_RE_ATRIBUTOS.findall(tag))
+            abas[a["name"]] = rels[a["r:id"]]
+        return abas
+
+    def _xml(self, aba: str) -> str:
+        return self._partes[self._abas[aba]].decode("utf-8")
+
+    def _gravar_xml(self, aba: str, xml: str, ultima_linha: int, ultima_coluna: int):
+        ref = f"A1:{letra_coluna(ultima_coluna)}{ultima_linha}"
+        xml = re.sub(r'<dimension ref="[^"]*"\s*/>', f'<dimension ref="{ref}"/>', xml, count=1)
+        self._partes[self._abas[aba]] = xml.encode("utf-8")
+
+    @staticmethod
+    def _dimensao(xml: str):
+        m = re.search(r'<dimension ref="[A-Z]+\d+:([A-Z]+)(\d+)"', xml)
+        return (int(m.group(2)), numero_coluna(m.group(1))) if m else (0, 0)
+
+    def gravar_celulas(self, aba: str, celulas: dict, limpar_coluna: int = None, estilo_linha1: bool = True):
+        """
+        celulas: {(linha, coluna): valor} (linha/coluna a partir de 1; None
+        apaga a célula). Só os <row> das linhas tocadas são abertos, e só a
+        célula de cada coluna; as demais linhas são copiadas como estão. Linha
+        nova entra na ordem (no fim, antes de </sheetData>, no caso comum).
+        limpar_coluna: apaga antes as células dessa coluna (rerun do dia).
+        Célula nova na linha 1 herda o estilo de A1 (cabeçalho em negrito).
+        """
+        xml = self._xml(aba).replace("<sheetData/>", "<sheetData></sheetData>", 1)
+        ultima, ultima_coluna = self._dimensao(xml)
+        if limpar_coluna is not None:
+            letra = letra_coluna(limpar_coluna)
+            xml = re.sub(rf'<c\b[^>]*?\br="{letra}\d+"[^>]*?(?:/>|>.*?</c>)', "", xml, flags=re.S)
+        estilo = None
+        if estilo_linha1:
+            a1 = xml.find(' r="A1"')
+            tag = xml[xml.rfind("<c ", 0, a1 + 1):xml.find(">", a1)] if a1 >= 0 else ""
+            achado = re.search(r'\bs="(\d+)"', tag)
+            estilo = achado.group(1) if achado else None
+
+        por_linha = {}
+        for (linha, col), valor in celulas.items():
+            por_linha.setdefault(linha, {})[col] = valor
+        tocadas = sorted(por_linha)
+        k = 0  # as <row> vêm em ordem: linha tocada que ficou para trás não existe na aba
+        ini = xml.find("<sheetData>") + len("<sheetData>")
+        fim = xml.find("</sheetData>")
+        partes, pos = [], ini
+        for r, inicio, final in _posicoes_linhas(xml, ini, fim):
+            if k == len(tocadas):
+                break  # o resto das linhas é copiado de uma vez
+            while k < len(tocadas) and tocadas[k] < r:
+                partes.append(xml[pos:inicio] + self._linha(tocadas[k], "", por_linha[tocadas[k]], estilo))
+                pos = inicio
+                k += 1
+            if k < len(tocadas) and tocadas[k] == r:
+                partes.append(xml[pos:inicio] + self._linha(r, xml[inicio:final], por_linha[r], estilo))
+                pos = final
+                k += 1
+        partes.append(xml[pos:fim] + "".join(self._linha(r, "", por_linha[r], estilo) for r in tocadas[k:]))
+        xml = xml[:ini] + "".join(partes) + xml[fim:]
+
+        ultima_coluna = max([ultima_coluna] + [c for cels in por_linha.values() for c in cels])
+        self._gravar_xml(aba, xml, max([ultima] + list(por_linha)), ultima_coluna)
+
+    @staticmethod
+    def _linha(r: int, atual: str, cels: dict, estilo: str = None) -> str:
+        """
+        O <row> `atual` (ou um novo, se vazio) com as células de `cels`
+        trocadas: célula existente é substituída no lugar, coluna depois da
+        última vai para o fim; só fora de ordem a linha é remontada.
+        """
+        if atual:
+            abre = atual[:atual.index(">") + 1]
+            corpo = "" if abre.endswith("/>") else atual[len(abre):-len("</row>")]
+            # spans é só uma dica de leitura e deixaria de bater com as colunas novas
+            abre = re.sub(r'\sspans="[^"]*"', "", abre).replace("/>", ">")
+        else:
+            abre, corpo = f'<row r="{r}">', ""
+        for col in sorted(cels):
+            ref = f"{letra_coluna(col)}{r}"
+            nova = "" if cels[col] is None else _celula(ref, cels[col], estilo if r == 1 else None)
+            achado = corpo.find(f' r="{ref}"')
+            existente = _RE_CELULA.match(corpo, corpo.rfind("<c ", 0, achado + 1)) if achado >= 0 else None
+            if existente:
+                corpo = corpo[:existente.start()] + nova + corpo[existente.end():]
+                continue
+            ultima = _RE_CELULA.match(corpo, corpo.rfind("<c ")) if "<c " in corpo else None
+            if ultima is None or numero_coluna(ultima.group(1)) < col:
+                corpo += nova
+            elif nova:
+                todas = {numero_coluna(c.group(1)): c.group(0) for c in _RE_CELULA.finditer(corpo)}
+                todas[col] = nova
+                corpo = "".join(todas[c] for c in sorted(todas))
+        return abre + corpo + "</row>"
+
+    def anexar_linhas(self, aba: str, valores: list, desde: int = None) -> tuple:
+        """
+        Acrescenta linhas no fim da aba sem reescrever as anteriores; com
+        `desde`, as linhas a partir dela são descartadas antes (rerun do dia).
+        Retorna (primeira, última) linha gravada.
+        """
+        xml = self._xml(aba)
+        ultima, ultima_coluna = self._dimensao(xml)
+        fim = xml.find("</sheetData>")
+        if fim < 0:  # <sheetData/>
+            xml = xml.replace("<sheetData/>", "<sheetData></sheetData>", 1)
+            fim = xml.find("</sheetData>")
+        if desde is not None:
+            m = re.search(rf'<row\b[^>]*?\br="{desde}"', xml)
+            if m:
+                xml = xml[:m.start()] + xml[fim:]
+                fim = m.start()
+            ultima = desde - 1
+        inicio = ultima + 1
+        novas = "".join(
+            f'<row r="{r}">' + "".join(
+                _celula(f"{letra_coluna(c)}{r}", v) for c, v in enumerate(linha, 1) if v is not None
+            ) + "</row>"
+            for r, linha in enumerate(valores, inicio)
+        )
+        xml = xml[:fim] + novas + xml[fim:]
+        largura = max([ultima_coluna] + [len(v) for v in valores])
+        self._gravar_xml(aba, xml, ultima + len(valores), largura)
+        return inicio, ultima + len(valores)
+
+    def salvar(self):
+        """Regrava o zip (mesma ordem de partes) e troca o arquivo de uma vez."""
+        tmp = self.caminho + ".tmp"
+        with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as z:
+            for nome in self._nomes:
+                z.writestr(nome, self._partes[nome])
+        os.replace(tmp, self.caminho)
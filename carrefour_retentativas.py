@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Política de novas tentativas por classe de falha
+Uma URL que falha no Chrome não é repetida na hora: volta para a fila com um
+atraso exponencial com jitter e é pega depois da passada principal (ou por um
+worker ocioso). Cada classe de falha tem seu limite de tentativas e seu atraso
+base: timeout e erro de navegação costumam ser passageiros; página sem JSON-LD
+ou sem preço raramente muda em segundos, então espera mais e tenta menos.
+"""
+
+import random
+
+from carrefour_comum import (
+    FALHA_TIMEOUT,
+    FALHA_SEM_JSONLD,
+    FALHA_SEM_PRECO,
+    FALHA_NAVEGACAO,
+    FALHA_BLOQUEIO,
+    FALHA_VAZIA,
+)
+
+
+# tentativas = total por URL (incluindo a primeira); base = atraso (s) da 1ª repetição
+POLITICAS = {
+    FALHA_TIMEOUT:    {"tentativas": 3, "base": 5.0},
+    FALHA_NAVEGACAO:  {"tentativas": 3, "base": 2.0},
+    FALHA_SEM_JSONLD: {"tentativas": 2, "base": 15.0},
+    FALHA_SEM_PRECO:  {"tentativas": 2, "base": 30.0},
+    # bloqueio/erro do site: o disjuntor da cidade decide pausar; aqui só uma
+    # repetição tardia, depois que o site teve tempo de voltar
+    FALHA_BLOQUEIO:   {"tentativas": 2, "base": 60.0},
+    FALHA_VAZIA:      {"tentativas": 2, "base": 20.0},
+}
+ATRASO_MAX = 120.0
+
+
+def falha_de(rec):
+    """Classe de falha do registro (página de busca: a linha de erro única), ou None."""
+    if isinstance(rec, list):
+        return rec[0].get("Falha") if len(rec) == 1 else None
+    return (rec or {}).get("Falha")
+
+
+def tentativas_max(falha: str) -> int:
+    return POLITICAS.get(falha, {"tentativas": 1})["tentativas"]
+
+
+def atraso(falha: str, tentativa: int) -> float:
+    """Atraso antes da tentativa seguinte à `tentativa` (1 = a primeira que falhou)."""
+    base = POLITICAS[falha]["base"] * 2 ** (tentativa - 1)
+    return min(ATRASO_MAX, base * random.uniform(0.5, 1.5))
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""
+Controle de ritmo adaptativo (AIMD) compartilhado por todos os caminhos de coleta
+Em vez de sleeps fixos entre URLs, cada host tem uma janela de requisições em
+voo: cresce aditivamente (~+1 por rodada) enquanto as respostas chegam rápidas
+e sem erro, e cai pela metade em 429/5xx, timeout ou página de bloqueio, com
+uma pausa crescente antes de voltar a liberar vagas. HTTP (requests/aiohttp/API)
+e Chrome têm janelas separadas: as latências de cada um não são comparáveis.
+"""
+
+import time
+import asyncio
+import threading
+from contextlib import contextmanager, asynccontextmanager
+from urllib.parse import urlsplit
+
+
+# sinais que indicam site sobrecarregado / limitando -> corte multiplicativo
+SINAIS_CORTE = {"limite", "servidor", "timeout", "bloqueio"}
+
+# Página de bloqueio costuma vir com 200/403 e sem o JSON-LD de produto
+MARCAS_BLOQUEIO = (
+    "captcha", "access denied", "acesso negado", "request blocked",
+    "cf-chl", "perimeterx", "are you a robot", "too many requests",
+)
+
+# janelas iniciais/teto por canal (inicial = o ritmo fixo de antes)
+JANELAS = {
+    "http": {"inicial": 8, "maximo": 32},
+    "chrome": {"inicial": 6, "maximo": 24},
+}
+
+
+def parece_bloqueio(html: str) -> bool:
+    """Heurística de soft-block: sem ld+json e com texto típico de desafio/bloqueio."""
+    if not html or "application/ld+json" in html:
+        return False
+    baixo = html[:20000].lower()
+    return any(m in baixo for m in MARCAS_BLOQUEIO)
+
+
+def sinal_http(status: int, html: str = None) -> str:
+    """Classifica uma resposta HTTP para o controle: "ok" ou um dos SINAIS_CORTE."""
+    if status == 429:
+        return "limite"
+    if status >= 500:
+        return "servidor"
+    if status == 403 or parece_bloqueio(html):
+        return "bloqueio"
+    return "ok"
+
+
+class Vaga:
+    """Uma requisição em voo; quem usa marca o desfecho antes de sair do `with`."""
+
+    def __init__(self):
+        self.sinal = "ok"
+        self.pausa = 0.0  # Retry-After, quando o servidor informa
+        self.inicio = time.monotonic()
+
+    def marcar(self, sinal: str, pausa: float = 0.0):
+        self.sinal = sinal
+        self.pausa = pausa
+
+
+class ControleAIMD:
+    """
+    Janela de concorrência AIMD (thread-safe; tem versão asyncio).
+    Saudável = sinal "ok" com latência até `tolerancia` x a latência de base
+    (média móvel das respostas boas); aí a janela ganha 1/janela por resposta.
+    Um corte por rodada: rajadas de erro da mesma janela contam como um só.
+    """
+
+    def __init__(self, nome: str, inicial: int = 4, minimo: int = 1, maximo: int = 32,
+                 fator: float = 0.5, tolerancia: float = 2.5, pausa_corte: float = 1.0,
+                 pausa_max: float = 30.0):
+        self.nome = nome
+        self.janela = float(inicial)
+        self.minimo, self.maximo = minimo, maximo
+        self.fator, self.tolerancia = fator, tolerancia
+        self.pausa_corte, self.pausa_max = pausa_corte, pausa_max
+        self.em_voo = 0
+        self.base = None          # latência de referência (EWMA das respostas ok)
+        self.cortes_seguidos = 0
+        self._ultimo_corte = 0.0
+        self._pausa_ate = 0.0
+        self._cond = threading.Condition()
+
+    # ---- vagas ----
+    def _livre(self, agora: float) -> bool:
+        return agora >= self._pausa_ate and self.em_voo < int(self.janela)
+
+    def tentar(self) -> bool:
+        """Pega uma vaga se houver; não bloqueia."""
+        with self._cond:
+            if self._livre(time.monotonic()):
+                self.em_voo += 1
+                return True
+            return False
+
+    def adquirir(self):
+        with self._cond:
+            while True:
+                agora = time.monotonic()
+                if self._livre(agora):
+                    self.em_voo += 1
+                    return
+                espera = self._pausa_ate - agora if agora < self._pausa_ate else None
+                self._cond.wait(espera)
+
+    async def adquirir_async(self):
+        while not self.tentar():
+            await asyncio.sleep(0.05)
+
+    def liberar(self, sinal: str = "ok", latencia: float = None, pausa: float = 0.0):
+        with self._cond:
+            self.em_voo = max(0, self.em_voo - 1)
+            agora = time.monotonic()
+            if sinal in SINAIS_CORTE:
+                self._cortar(agora, sinal, pausa)
+            elif sinal == "ok" and latencia is not None:
+                self._crescer(latencia)
+            self._cond.notify_all()
+
+    # ---- AIMD ----
+    def _crescer(self, latencia: float):
+        self.cortes_seguidos = 0
+        if self.base is None:
+            self.base = latencia
+        saudavel = latencia <= self.tolerancia * self.base
+        self.base = 0.8 * self.base + 0.2 * latencia
+        if saudavel and self.em_voo + 1 >= int(self.janela):
+            # só cresce quando a janela está sendo usada de fato
+            self.janela = min(self.maximo, self.janela + 1.0 / self.janela)
+
+    def _cortar(self, agora: float, sinal: str, pausa: float):
+        rodada = max(1.0, 2 * (self.base or 1.0))
+        if agora - self._ultimo_corte < rodada:
+            return
+        self._ultimo_corte = agora
+        self.cortes_seguidos += 1
+        self.janela = max(self.minimo, self.janela * self.fator)
+        pausa = max(pausa, min(self.pausa_max, self.pausa_corte * 2 ** (self.cortes_seguidos - 1)))
+        self._pausa_ate = agora + pausa
+        print(f"🐢 [{self.nome}] {sinal}: janela → {int(self.janela)}, pausa {pausa:.1f}s")
+
+    # ---- uso com `with` ----
+    @contextmanager
+    def vaga(self):
+        self.adquirir()
+        v = Vaga()
+        try:
+            yield v
+        finally:
+            self.liberar(v.sinal, time.monotonic() - v.inicio, v.pausa)
+
+    @asynccontextmanager
+    async def vaga_async(self):
+        await self.adquirir_async()
+        v = Vaga()
+        try:
+            yield v
+        finally:
+            self.liberar(v.sinal, time.monotonic() - v.inicio, v.pausa)
+
+
+_CONTROLES = {}
+_LOCK = threading.Lock()
+
+
+def controle(url: str, canal: str = "http") -> ControleAIMD:
+    """Controle compartilhado do host da URL no canal ("http" ou "chrome")."""
+    host = urlsplit(url).netloc
+    with _LOCK:
+        ctl = _CONTROLES.get((host, canal))
+        if ctl is None:
+            ctl = _CONTROLES[(host, canal)] = ControleAIMD(f"{canal} {host}", **JANELAS[canal])
+        return ctl
+
+
+def retry_after(valor) -> float:
+    """Segundos do header Retry-After (só a forma numérica; data HTTP vira 0)."""
+    try:
+        return max(0.0, float(valor))
+    except (TypeError, ValueError):
+        return 0.0
@@ -0,0 +1,633 @@
+# -*- coding: utf-8 -*-
+"""
+Scraper Carrefour — todas as cidades em um único processo
+Modo: GitHub Actions + commit no repo
+Um pool de workers (1 Chrome cada) compartilhado entre as cidades da tabela
+CIDADES, com roubo de trabalho: quem esvazia a fila da própria cidade passa a
+consumir a fila mais longa. O tempo total fica próximo ao da cidade mais lenta.
+"""
+
+import time
+import argparse
+import itertools
+import threading
+from collections import deque
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from carrefour_comum import (
+    CIDADES,
+    FALHA_NAVEGACAO,
+    FALHA_PRAZO,
+    FALHA_DISJUNTOR,
+    ORCAMENTO_URL,
+    scrape_product_via_json,
+    registro,
+)
+from carrefour_catalogo import CATALOGO, entrada_catalogo
+from carrefour_http import build_session, scrape_product_via_http
+from carrefour_async import CONCORRENCIA, coletar_http
+from carrefour_api import coletar_por_sku
+from carrefour_driver import GerenciadorDriver, preparar_sessoes_regionais
+from carrefour_abas import ABAS, coletar_abas
+from carrefour_diario import Diario
+from carrefour_armazem import salvar_resultados, migrar_para_banco, gravar_no_banco
+from carrefour_banco import BancoPrecos
+from carrefour_retentativas import falha_de, tentativas_max, atraso
+from carrefour_disjuntor import Disjuntor
+from carrefour_listagem import eh_listagem, scrape_listagem_via_http, scrape_listagem_via_json
+
+
+# =========================================
+# 1) Filas por cidade com roubo de trabalho
+# =========================================
+PRAZO_MIN = 50  # prazo padrão da execução inteira (min); o job do Actions tem 70
+RECUPERACOES_MAX = 2  # vezes que a mesma URL é refeita porque o Chrome morreu nela
+
+
+class Prazo:
+    """Prazo global da execução (None = sem prazo)."""
+
+    def __init__(self, minutos: float = None):
+        self.fim = time.monotonic() + minutos * 60 if minutos else None
+
+    def restante(self) -> float:
+        return float("inf") if self.fim is None else self.fim - time.monotonic()
+
+
+class FilaCidades:
+    """
+    Uma deque de (índice, url) por cidade, em ordem de prioridade (cesta
+    básica primeiro). O dono consome pela frente; quem rouba leva do final da
+    fila mais longa, para não disputar o mesmo item.
+    As falhas voltam por reagendar() para a lista de novas tentativas, que só é
+    servido quando as filas normais acabam e o atraso de cada item venceu.
+    Item interrompido pela queda do Chrome volta por devolver(), na frente da fila.
+    Com `prazo`: se o ritmo atual não dá conta do que falta, os itens de
+    prioridade > 0 são pulados; sem tempo nem para uma URL, tudo é pulado.
+    Cada cidade tem um disjuntor (carrefour_disjuntor) alimentado por
+    resultado(): aberto, a cidade não é servida; abortado, o resto dela é pulado.
+    Os pulados ficam em `puladas` (com o motivo) e as trocas de estado dos
+    disjuntores em `eventos`, para serem registrados.
+    """
+
+    def __init__(self, tarefas: dict, prazo: Prazo = None, prioridades: dict = None, workers: int = 1):
+        self._cond = threading.Condition()
+        self._prioridades = prioridades or {}
+        self._filas = {
+            chave: deque(sorted(itens, key=lambda it: self._prioridades.get(it[0], 0)))
+            for chave, itens in tarefas.items()
+        }
+        self._retentativas = []  # (pronto_em, seq, chave, idx, url)
+        self._tentativas = {}    # (chave, idx) -> tentativas já feitas
+        self._devolucoes = {}    # (chave, idx) -> vezes que voltou por queda do Chrome
+        self._seq = itertools.count()
+        self._prazo = prazo or Prazo()
+        self._workers = workers
+        self._inicio = time.monotonic()
+        self._servidas = 0
+        self._disjuntores = {chave: Disjuntor() for chave in tarefas}
+        self.puladas = []        # (chave, idx, url, falha) que ficaram de fora
+        self.eventos = []        # (chave, evento, hora) dos disjuntores
+
+    def _cabe(self, idx: int) -> bool:
+        """O item ainda cabe no prazo? (com o lock já tomado)"""
+        restante = self._prazo.restante()
+        if restante < ORCAMENTO_URL:
+            return False
+        if self._servidas < self._workers:
+            return True  # ainda sem ritmo medido
+        por_url = (time.monotonic() - self._inicio) / self._servidas
+        falta = sum(len(f) for f in self._filas.values()) + len(self._retentativas) + 1
+        return falta * por_url <= restante or self._prioridades.get(idx, 0) == 0
+
+    def _pegar(self, preferida: str):
+        """Próximo item das filas normais que cabe no prazo; os que não cabem são pulados."""
+        while True:
+            agora = time.monotonic()
+            abertas = {k: f for k, f in self._filas.items() if f and self._disjuntores[k].liberado(agora)}
+            if preferida in abertas:
+                chave, (idx, url) = preferida, abertas[preferida].popleft()
+            elif abertas:
+                chave = max(abertas, key=lambda k: len(abertas[k]))
+                idx, url = abertas[chave].pop()
+            else:
+                return None
+            if self._cabe(idx):
+                return chave, idx, url
+            self.puladas.append((chave, idx, url, FALHA_PRAZO))
+
+    def _proxima_retentativa(self):
+        """(espera, item): repetição vencida de cidade liberada, ou quanto falta para a próxima."""
+        agora = time.monotonic()
+        limite = agora + self._prazo.restante() - ORCAMENTO_URL
+        for r in sorted(self._retentativas):
+            pronto_em, _, chave, idx, url = r
+            if pronto_em > limite:
+                # a repetição venceria depois do prazo: fica a falha já registrada
+                self._retentativas.remove(r)
+            elif not self._disjuntores[chave].liberado(agora):
+                continue
+            elif pronto_em > agora:
+                return pronto_em - agora, None
+            else:
+                self._retentativas.remove(r)
+                return 0, (chave, idx, url)
+        return None, None
+
+    def _espera_disjuntor(self):
+        """Segundos até reabrir a primeira cidade pausada que ainda tem trabalho, ou None."""
+        agora = time.monotonic()
+        pendentes = {k for k, f in self._filas.items() if f} | {r[2] for r in self._retentativas}
+        reabre = [self._disjuntores[k].reabre_em - agora for k in pendentes
+                  if self._disjuntores[k].estado == "aberto"]
+        return max(0.05, min(reabre)) if reabre else None
+
+    def proxima(self, preferida: str, esperar: bool = True):
+        """
+        Próximo (chave, idx, url), ou None quando não há mais nada. Com só
+        repetições ainda no atraso (ou cidades em pausa): espera por elas, ou
+        devolve None se esperar=False (quem tem abas em voo não pode ficar parado).
+        """
+        with self._cond:
+            while True:
+                item = self._pegar(preferida)
+                espera = None
+                if item is None:
+                    espera, item = self._proxima_retentativa()
+                if item is not None:
+                    if not self._cabe(item[1]):
+                        continue
+                    self._servidas += 1
+                    self._disjuntores[item[0]].servida()
+                    return item
+
+                pausa = self._espera_disjuntor()
+                esperas = [e for e in (espera, pausa) if e is not None]
+                if not esperas or not esperar:
+                    return None
+                self._cond.wait(min(esperas))
+
+    def resultado(self, chave: str, falha: str = None):
+        """Desfecho de uma URL servida (None = deu certo); alimenta o disjuntor da cidade."""
+        with self._cond:
+            d = self._disjuntores[chave]
+            evento = d.registrar(falha)
+            if evento is None:
+                return
+            self.eventos.append((chave, evento, datetime.now()))
+            tag = CIDADES[chave]["tag"]
+            if evento == "aberto":
+                print(f"⛔ [{tag}] Disjuntor aberto ({d.seguidas} páginas de bloqueio/erro seguidas): "
+                      f"pausa de {d.reabre_em - time.monotonic():.0f}s")
+            elif evento == "fechado":
+                print(f"🟢 [{tag}] Disjuntor fechado: o site voltou a responder")
+            else:
+                # abortado: o resto da cidade sai como pulado
+                restantes = list(self._filas[chave])
+                self._filas[chave].clear()
+                repetir = [r for r in self._retentativas if r[2] == chave]
+                self._retentativas = [r for r in self._retentativas if r[2] != chave]
+                self.puladas += [(chave, idx, url, FALHA_DISJUNTOR) for idx, url in restantes]
+                print(f"🛑 [{tag}] Disjuntor abortou a cidade depois de {d.aberturas} aberturas: "
+                      f"{len(restantes)} URLs puladas, {len(repetir)} repetições canceladas")
+            self._cond.notify_all()
+
+    def devolver(self, chave: str, idx: int, url: str) -> bool:
+        """
+        Item servido que ficou sem desfecho (o Chrome caiu com ele em voo): volta
+        para a frente da fila da cidade, sem contar como tentativa. Até
+        RECUPERACOES_MAX vezes por item; False = quem chamou registra a falha.
+        """
+        with self._cond:
+            if self._disjuntores[chave].estado == "abortado":
+                return False
+            feitas = self._devolucoes.get((chave, idx), 0)
+            if feitas >= RECUPERACOES_MAX:
+                return False
+            self._devolucoes[(chave, idx)] = feitas + 1
+            self._servidas -= 1
+            self._disjuntores[chave].devolvida()
+            self._filas[chave].appendleft((idx, url))
+            self._cond.notify_all()
+        return True
+
+    def reagendar(self, chave: str, idx: int, url: str, falha: str) -> bool:
+        """Devolve a URL com backoff se a classe de falha ainda permite; False = desistiu."""
+        with self._cond:
+            if self._disjuntores[chave].estado == "abortado":
+                return False
+            feitas = self._tentativas.get((chave, idx), 1)
+            if feitas >= tentativas_max(falha):
+                return False
+            self._tentativas[(chave, idx)] = feitas + 1
+            espera = atraso(falha, feitas)
+            self._retentativas.append((time.monotonic() + espera, next(self._seq), chave, idx, url))
+            self._cond.notify_all()
+        print(f"🔁 [{CIDADES[chave]['tag']}] {falha}: nova tentativa ({feitas + 1}) em {espera:.0f}s → {url}")
+        return True
+
+
+class Resultados:
+    """
+    Coletor thread-safe: guarda os registros por cidade na ordem original das URLs.
+    Uma página de busca entrega uma lista de registros no seu índice.
+    Com `diario`, cada registro novo também vai para o checkpoint do dia.
+    Os índices que vieram do diário (retomar) ficam marcados, para o log longo
+    receber só o que esta execução coletou.
+    """
+
+    def __init__(self, chaves, diario: Diario = None):
+        self._lock = threading.Lock()
+        self._por_cidade = {chave: {} for chave in chaves}
+        self._retomados = {chave: set() for chave in chaves}
+        self._diario = diario
+
+    def adicionar(self, chave: str, idx: int, rec: dict):
+        with self._lock:
+            self._por_cidade[chave][idx] = rec
+            self._retomados[chave].discard(idx)
+        if self._diario is not None:
+            self._diario.registrar(chave, idx, rec)
+
+    def evento(self, chave: str, tipo: str, estado: str, hora=None):
+        """Ocorrência da execução (ex.: disjuntor abriu) registrada no diário da cidade."""
+        if self._diario is not None:
+            self._diario.evento(chave, tipo, estado, hora)
+
+    def retomar(self, chave: str, idx: int, rec: dict):
+        """Registro já coletado hoje (vindo do diário): entra sem ser gravado de novo."""
+        with self._lock:
+            self._por_cidade[chave][idx] = rec
+            self._retomados[chave].add(idx)
+
+    def tem(self, chave: str, idx: int) -> bool:
+        with self._lock:
+            return idx in self._por_cidade[chave]
+
+    def da_cidade(self, chave: str, so_novos: bool = False) -> list:
+        """
+        Registros na ordem do catálogo, com as listagens expandidas. Produto que
+        aparece numa busca e também tem URL própria fica uma vez só, com o
+        registro da página do produto.
+        so_novos: deixa de fora os registros retomados do diário (a deduplicação
+        continua considerando todos).
+        """
+        with self._lock:
+            recs = self._por_cidade[chave]
+            ordenados = [(i, recs[i]) for i in sorted(recs)]
+            retomados = set(self._retomados[chave]) if so_novos else set()
+        diretos = {
+            entrada_catalogo(rec["URL"])["chave"]
+            for _, rec in ordenados if isinstance(rec, dict) and rec["Preço"] > 0
+        }
+        saida, vistos = [], set()
+        for i, rec in ordenados:
+            if isinstance(rec, dict):
+                if i not in retomados:
+                    saida.append(rec)
+                continue
+            for r in rec:
+                k = entrada_catalogo(r["URL"])["chave"]
+                if r["Preço"] > 0 and (k in diretos or (k, r["Nome do Produto"]) in vistos):
+                    continue
+                vistos.add((k, r["Nome do Produto"]))
+                if i not in retomados:
+                    saida.append(r)
+        return saida
+
+
+# =========================
+# 2) Worker (1 Chrome cada)
+# =========================
+def _http_ok(chave: str, cookies: dict) -> bool:
+    """HTTP puro é correto na região padrão ou quando há sessão regional exportada."""
+    return not CIDADES[chave].get("cep") or chave in (cookies or {})
+
+
+def _via_chrome(ger: GerenciadorDriver, chave: str, url: str, via_chrome, tag: str):
+    """
+    Coleta a URL no Chrome do worker. Se a sessão morreu no meio (chromedriver
+    ou Chrome caíram), recria o navegador com a cidade e refaz a mesma URL, até
+    RECUPERACOES_MAX vezes; a queda não conta como tentativa da URL.
+    """
+    for recuperacao in range(RECUPERACOES_MAX + 1):
+        ultima = recuperacao == RECUPERACOES_MAX
+        try:
+            rec = via_chrome(url, ger.obter(chave), tag)
+        except Exception:
+            if ultima or ger.vivo():
+                raise
+            ger.recuperar()
+            continue
+        # a queda no meio da página vira um registro de falha: só aí vale sondar a sessão
+        if ultima or not falha_de(rec) or ger.vivo():
+            ger.pagina_servida()
+            return rec
+        ger.recuperar()
+
+
+def _worker(casa: str, fila: FilaCidades, resultados: Resultados,
+            modo: str = "http", session=None, headless: bool = True, cookies: dict = None):
+    # Chrome só sobe quando alguma URL precisar dele; o gerenciador aplica o
+    # CEP da cidade e recicla o navegador por nº de páginas / memória
+    ger = GerenciadorDriver(headless=headless)
+    try:
+        while True:
+            item = fila.proxima(casa)
+            if item is None:
+                break
+            chave, idx, url = item
+            cidade = CIDADES[chave]
+            # depois de roubar, o worker passa a preferir a nova cidade para
+            # não alternar de CEP a cada URL
+            casa = chave
+
+            busca = eh_listagem(url)
+            via_http, via_chrome = (
+                (scrape_listagem_via_http, scrape_listagem_via_json) if busca
+                else (scrape_product_via_http, scrape_product_via_json)
+            )
+            rec = None
+            try:
+                if modo == "http" and _http_ok(chave, cookies):
+                    rec = via_http(url, session, cidade["tag"], (cookies or {}).get(chave))
+                if rec is None:
+                    rec = _via_chrome(ger, chave, url, via_chrome, cidade["tag"])
+            except Exception as e:
+                print(f"❌ [{cidade['tag']}] Falha em {url}:", e)
+                rec = registro(cidade["tag"], url, falha=FALHA_NAVEGACAO)
+                rec = [rec] if busca else rec
+
+            # a falha fica registrada (diário) até uma nova tentativa dar certo
+            resultados.adicionar(chave, idx, rec)
+            falha = falha_de(rec)
+            fila.resultado(chave, falha)
+            if falha:
+                fila.reagendar(chave, idx, url, falha)
+    finally:
+        ger.fechar()
+
+
+def _worker_abas(casa: str, fila: FilaCidades, resultados: Resultados,
+                 abas: int = ABAS, headless: bool = True):
+    """
+    Como _worker, mas o Chrome navega em `abas` abas ao mesmo tempo. Cada lote
+    de abas é de uma cidade: quando a fila devolve outra cidade, o item fica
+    adiado até as abas esvaziarem e o CEP ser trocado.
+    """
+    ger = GerenciadorDriver(headless=headless, carregamento="none")
+    adiado = None
+    try:
+        while True:
+            item, adiado = adiado or fila.proxima(casa), None
+            if item is None:
+                break
+            chave = casa = item[0]
+            cidade = CIDADES[chave]
+            inicial = [item[1:]]
+            urls = {}  # idx -> url das URLs entregues às abas (para reagendar)
+
+            def proxima():
+                nonlocal adiado
+                if inicial:
+                    prox = inicial.pop()
+                elif ger.precisa_reciclar():
+                    return None  # esvazia as abas; o próximo obter() recicla
+                else:
+                    prox = fila.proxima(chave, esperar=False)
+                    if prox is None:
+                        return None
+                    if prox[0] != chave:
+                        adiado = prox
+                        return None
+                    prox = prox[1:]
+                urls[prox[0]] = prox[1]
+                return prox
+
+            def entregar(idx, rec):
+                resultados.adicionar(chave, idx, rec)
+                ger.pagina_servida()
+                falha = falha_de(rec)
+                fila.resultado(chave, falha)
+                if falha:
+                    fila.reagendar(chave, idx, urls[idx], falha)
+
+            def devolver(idx, url):
+                # só a queda do Chrome devolve; erro com a sessão viva é falha da URL
+                return not ger.vivo() and fila.devolver(chave, idx, url)
+
+            try:
+                coletar_abas(ger.obter(chave), proxima, entregar, cidade["tag"], abas, devolver=devolver)
+            except Exception as e:
+                print(f"❌ [{cidade['tag']}] Falha no lote de abas:", e)
+                if inicial:
+                    idx, url = inicial.pop()
+                    if not devolver(idx, url):
+                        rec = registro(cidade["tag"], url, falha=FALHA_NAVEGACAO)
+                        resultados.adicionar(chave, idx, [rec] if eh_listagem(url) else rec)
+                        fila.resultado(chave, FALHA_NAVEGACAO)
+                        fila.reagendar(chave, idx, url, FALHA_NAVEGACAO)
+                if ger.vivo():
+                    ger.descartar()
+                else:
+                    ger.recuperar()
+    finally:
+        ger.fechar()
+
+
+# =========================
+# 3) Execução principal
+# =========================
+def _tarefas_pendentes(chaves, resultados: Resultados, diario: Diario, retomar: bool) -> dict:
+    """Tarefas por cidade; com `retomar`, o que já tem preço no diário de hoje é reaproveitado."""
+    tarefas = {}
+    for chave in chaves:
+        feitos = diario.concluidos(chave) if retomar else {}
+        tarefas[chave] = []
+        for idx, e in enumerate(CATALOGO):
+            if e["chave"] in feitos:
+                resultados.retomar(chave, idx, feitos[e["chave"]])
+            else:
+                tarefas[chave].append((idx, e["url"]))
+        reaproveitadas = len(CATALOGO) - len(tarefas[chave])
+        if reaproveitadas:
+            print(f"♻️ [{CIDADES[chave]['tag']}] {reaproveitadas} URLs já coletadas hoje (diário); "
+                  f"{len(tarefas[chave])} pendentes")
+    return tarefas
+
+
+def executar(chaves=None, workers: int = None, modo: str = "api", headless: bool = True,
+             concorrencia: int = CONCORRENCIA, abas: int = 1, retomar: bool = True,
+             prazo_min: float = PRAZO_MIN, sessoes: int = 1, excel: bool = True,
+             armazem: str = "parquet"):
+    """
+    modo="api": preços em lote pela API de catálogo (dezenas de SKUs por
+    requisição); o que não vier por ela segue o caminho do modo async;
+    modo="async": primeiro passa todas as URLs elegíveis pelo motor asyncio
+    (concorrência por host), depois só as que falharem vão para o pool de Chrome;
+    modo="http": HTML + JSON-LD por worker, com Chrome como fallback por URL;
+    modo="browser": tudo pelo Chrome (comportamento antigo).
+    abas > 1: cada Chrome do pool navega em várias abas ao mesmo tempo.
+    retomar: pula as URLs que já saíram com preço hoje (diário da cidade) e
+    refaz só as falhas; False coleta tudo de novo.
+    prazo_min: prazo da execução; o que não couber (menor prioridade primeiro)
+    sai com Falha "prazo" e o Excel é gravado a tempo (None = sem prazo).
+    sessoes: Chromes por cidade no pool (sem `workers`, o pool tem sessoes x
+    cidades). Os workers da mesma cidade dividem a fila dela, cada um com o CEP
+    já aplicado no seu navegador; o resultado é o mesmo do caminho serial.
+    excel: além da partição do dia no armazém Parquet, reexporta os Excel do mês.
+    armazem="sqlite": grava no banco SQLite (carrefour_banco) em vez das
+    partições Parquet, todas as cidades numa transação só; os dias do mês que
+    só estavam no Parquet/Excel são copiados para o banco antes.
+    """
+    prazo = Prazo(prazo_min)
+    chaves = list(chaves or CIDADES)
+    workers = workers or len(chaves) * max(1, sessoes)
+
+    diario = Diario(chaves, CATALOGO)
+    resultados = Resultados(chaves, diario)
+    # índice deduplicado: cada produto entra uma vez por cidade
+    tarefas = _tarefas_pendentes(chaves, resultados, diario, retomar)
+    try:
+        _coletar(chaves, tarefas, resultados, workers, modo, headless, concorrencia, abas, prazo)
+    finally:
+        diario.fechar()
+
+    if armazem == "sqlite":
+        banco = BancoPrecos()
+        try:
+            for chave in chaves:
+                migrar_para_banco(CIDADES[chave], banco)
+            # só os upserts ficam na transação; log longo e Excel depois do COMMIT
+            with banco.transacao():
+                for chave in chaves:
+                    gravar_no_banco(CIDADES[chave], resultados.da_cidade(chave), banco)
+            for chave in chaves:
+                salvar_resultados(CIDADES[chave], resultados.da_cidade(chave), excel, banco,
+                                  novos=resultados.da_cidade(chave, so_novos=True))
+        finally:
+            banco.fechar()
+    else:
+        for chave in chaves:
+            salvar_resultados(CIDADES[chave], resultados.da_cidade(chave), excel,
+                              novos=resultados.da_cidade(chave, so_novos=True))
+
+
+def _coletar(chaves, tarefas: dict, resultados: Resultados, workers: int, modo: str,
+             headless: bool, concorrencia: int, abas: int, prazo: Prazo):
+    """Estágios de coleta (API, HTTP assíncrono, pool de Chrome) sobre as tarefas pendentes."""
+    if not any(tarefas.values()):
+        return
+    inicio = time.time()
+    cookies = {}
+    bloqueios = []  # (chave, falha) das páginas de bloqueio/erro no HTTP assíncrono
+    if modo in ("api", "async", "http"):
+        # Selenium só para montar a região; a sessão vai para o cliente HTTP
+        cookies = preparar_sessoes_regionais(chaves, headless)
+
+    if modo in ("api", "async"):
+        elegiveis = [
+            (chave, idx, url)
+            for chave in chaves if _http_ok(chave, cookies)
+            for idx, url in tarefas[chave]
+        ]
+        if modo == "api":
+            session = build_session()
+            try:
+                for (chave, idx), rec in coletar_por_sku(elegiveis, session, cookies).items():
+                    if rec is not None:
+                        resultados.adicionar(chave, idx, rec)
+            finally:
+                session.close()
+            elegiveis = [t for t in elegiveis if not resultados.tem(t[0], t[1])]
+
+        for (chave, idx), rec in coletar_http(elegiveis, concorrencia, cookies).items():
+            if falha_de(rec):
+                bloqueios.append((chave, falha_de(rec)))
+            elif rec is not None:
+                resultados.adicionar(chave, idx, rec)
+        tarefas = {
+            chave: [(idx, url) for idx, url in itens if not resultados.tem(chave, idx)]
+            for chave, itens in tarefas.items()
+        }
+
+    pendentes = [chave for chave in chaves if tarefas[chave]]
+    if pendentes:
+        prioridades = {idx: e["prioridade"] for idx, e in enumerate(CATALOGO)}
+        fila = FilaCidades(tarefas, prazo, prioridades, workers)
+        # o disjuntor de cada cidade já começa com o que o passe assíncrono viu
+        for chave, falha in bloqueios:
+            fila.resultado(chave, falha)
+        session = build_session(pool=workers) if modo == "http" else None
+        modo_worker = "http" if modo == "http" else "browser"
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                if abas > 1 and modo_worker == "browser":
+                    futuros = [
+                        pool.submit(_worker_abas, pendentes[i % len(pendentes)], fila, resultados,
+                                    abas, headless)
+                        for i in range(workers)
+                    ]
+                else:
+                    futuros = [
+                        pool.submit(_worker, pendentes[i % len(pendentes)], fila, resultados,
+                                    modo_worker, session, headless, cookies)
+                        for i in range(workers)
+                    ]
+                for f in futuros:
+                    f.result()
+        finally:
+            if session is not None:
+                session.close()
+
+        # o que ficou de fora (prazo/disjuntor) entra como falha; um rerun no
+        # mesmo dia refaz pelo diário
+        for chave, idx, url, falha in fila.puladas:
+            rec = registro(CIDADES[chave]["tag"], url, falha=falha)
+            resultados.adicionar(chave, idx, [rec] if eh_listagem(url) else rec)
+        por_prazo = sum(p[3] == FALHA_PRAZO for p in fila.puladas)
+        if por_prazo:
+            print(f"\n⏰ Prazo: {por_prazo} URLs puladas (menor prioridade primeiro)")
+        for chave, evento, hora in fila.eventos:
+            resultados.evento(chave, "disjuntor", evento, hora)
+    print(f"\n⏱️ Coleta concluída em {time.time() - inicio:.0f}s ({workers} workers, {len(chaves)} cidades)")
+
+
+def executar_cidade(chave: str, modo: str = "api", sessoes: int = 1):
+    """
+    Uma cidade só (usado pelos scripts scraper_carrefour_<cidade>.py); serial
+    por padrão, ou `sessoes` Chromes dividindo a fila da cidade.
+    """
+    executar([chave], workers=max(1, sessoes), modo=modo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scraper Carrefour multi-cidades")
+    parser.add_argument("--cidades", nargs="+", choices=list(CIDADES), help="default: todas")
+    parser.add_argument("--workers", type=int, default=None, help="default: --sessoes por cidade")
+    parser.add_argument("--sessoes", type=int, default=1,
+                        help="Chromes em paralelo por cidade, cada um com o CEP aplicado")
+    parser.add_argument("--modo", choices=["api", "async", "http", "browser"], default="api",
+                        help="api: lote por SKU na API de catálogo; async/http: HTML + JSON-LD "
+                             "sem navegador; Chrome só como fallback")
+    parser.add_argument("--concorrencia", type=int, default=CONCORRENCIA,
+                        help="requisições simultâneas por host no modo async")
+    parser.add_argument("--abas", type=int, default=1,
+                        help="abas navegando ao mesmo tempo em cada Chrome (fallback)")
+    parser.add_argument("--prazo", type=float, default=PRAZO_MIN,
+                        help="prazo da execução em minutos (0 = sem prazo)")
+    parser.add_argument("--do-zero", action="store_true",
+                        help="ignora o diário de hoje e coleta todas as URLs de novo")
+    parser.add_argument("--sem-excel", action="store_true",
+                        help="grava só a partição do dia no armazém Parquet, sem exportar o Excel")
+    parser.add_argument("--armazem", choices=["parquet", "sqlite"], default="parquet",
+                        help="onde gravar o dia: partições Parquet por cidade ou o banco SQLite")
+    args = parser.parse_args()
+    executar(args.cidades, args.workers, args.modo, concorrencia=args.concorrencia, abas=args.abas,
+             retomar=not args.do_zero, prazo_min=args.prazo or None, sessoes=args.sessoes,
+             excel=not args.sem_excel, armazem=args.armazem)
+
+
+if __name__ == "__main__":
+    main()
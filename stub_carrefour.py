@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Servidor local que imita as páginas do mercado.carrefour.com.br
+Uso: testar os modos de coleta sem rede, trocando o host das URLs.
+    python stub_carrefour.py --porta 8765
+    -> http://127.0.0.1:8765/arroz-branco-longofino-tipo-1-tio-joao-2kg-115657/p
+    CARREFOUR_BASE_URL=http://127.0.0.1:8765/ python scraper_multicidades.py --modo async
+Produto (/p): HTML com <script ld+json> do tipo Product (preço derivado do id).
+Busca (/busca/...): página sem Product, como no site; os produtos listados vêm
+num ItemList do JSON-LD e no estado embutido (__NEXT_DATA__).
+API (/api/catalog_system/pub/products/search?fq=productId:N...): JSON no
+formato da busca do catálogo VTEX, com o mesmo preço das páginas. Ids a partir
+de SKU_DESLOCADO só existem como skuId (productId diferente), como acontece
+com produtos de várias variações. O linkText é o slug da URL do catálogo (ou
+"produto-<id>"); ID_COLIDENTE responde como outro produto (o número da URL é
+RefId de um e productId de outro), com outro linkText e outro preço.
+Bloqueio: /desafio/... responde 200 com página de captcha; /status-NNN/...
+responde com o status NNN (403 com a página de acesso negado).
+"""
+
+import re
+import json
+import zlib
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from functools import lru_cache
+from urllib.parse import urlsplit, parse_qs, unquote
+
+
+_RE_PRODUTO = re.compile(r"^/(?P<slug>.+)-(?P<id>\d+)/p$")
+_RE_STATUS = re.compile(r"^/status-(\d{3})/")
+PAGINA_DESAFIO = "<html><head><title>Verificação</title></head><body>Complete o captcha</body></html>"
+PAGINA_NEGADO = "<html><head><title>Access Denied</title></head><body>Request blocked</body></html>"
+SKU_DESLOCADO = 90_000_000  # skuId N pertence ao productId N - SKU_DESLOCADO
+ID_COLIDENTE = "777001"
+
+
+@lru_cache(maxsize=1)
+def slugs_do_catalogo() -> dict:
+    """id -> slug das URLs do catálogo (o linkText do produto na API)."""
+    # import tardio: quem sobe o stub ainda pode definir CARREFOUR_BASE_URL antes do catálogo
+    from carrefour_catalogo import URLS
+    achados = (_RE_PRODUTO.match(urlsplit(u).path) for u in URLS)
+    return {m.group("id"): f"{m.group('slug')}-{m.group('id')}" for m in achados if m}
+
+
+def preco_stub(product_id: str) -> float:
+    """Preço determinístico por id (para conferir o resultado da coleta)."""
+    return round(1 + int(product_id) % 5000 / 100, 2)
+
+
+def pagina_produto(slug: str, product_id: str) -> str:
+    ld = {
+        "@context": "https://schema.org",
+        "@type": "Product",
+        "name": slug.replace("-", " ").title(),
+        "sku": product_id,
+        "offers": {"@type": "Offer", "price": preco_stub(product_id), "priceCurrency": "BRL"},
+    }
+    return (
+        "<html><head><title>Carrefour</title>"
+        '<script type="application/ld+json">{"@type":"BreadcrumbList","itemListElement":[]}</script>'
+        f'<script type="application/ld+json">{json.dumps(ld, ensure_ascii=False)}</script>'
+        "</head><body><div id='root'></div></body></html>"
+    )
+
+
+def ids_da_busca(termo: str, pagina: str = "1", n: int = 6) -> list:
+    """Ids determinísticos por termo/página (para conferir a coleta da listagem)."""
+    base = zlib.crc32(f"{termo}|{pagina}".encode("utf-8")) % 9_000_000 + 100_000
+    return [str(base + i) for i in range(n)]
+
+
+def pagina_busca(termo: str, pagina: str = "1") -> str:
+    ids = ids_da_busca(termo, pagina)
+    slug = re.sub(r"\W+", "-", termo.lower()).strip("-")
+    # metade no ItemList, metade só no estado embutido (como acontece no site)
+    lista = {
+        "@context": "https://schema.org",
+        "@type": "ItemList",
+        "itemListElement": [
+            {"@type": "ListItem", "position": n + 1, "item": {
+                "@type": "Product",
+                "name": f"{termo.title()} {pid}",
+                "url": f"/{slug}-{pid}/p",
+                "offers": {"@type": "AggregateOffer", "lowPrice": preco_stub(pid), "priceCurrency": "BRL"},
+            }}
+            for n, pid in enumerate(ids[:3])
+        ],
+    }
+    estado = {"props": {"pageProps": {"search": {"products": [
+        dict(produto_api(pid), productName=f"{termo.title()} {pid}", linkText=f"{slug}-{pid}")
+        for pid in ids[3:]
+    ]}}}}
+    return (
+        "<html><head><title>Carrefour</title>"
+        f'<script type="application/ld+json">{json.dumps(lista, ensure_ascii=False)}</script>'
+        "</head><body><div id='root'></div>"
+        f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(estado, ensure_ascii=False)}</script>'
+        "</body></html>"
+    )
+
+
+def produto_api(product_id: str, sku_id: str = None) -> dict:
+    """Produto no formato da API; o linkText é o slug da URL que termina no skuId."""
+    sku_id = sku_id or product_id
+    outro = product_id == ID_COLIDENTE
+    return {
+        "productId": product_id,
+        "productName": "Outro produto" if outro else f"Produto {product_id}",
+        "linkText": f"outro-produto-{product_id}" if outro else slugs_do_catalogo().get(sku_id, f"produto-{sku_id}"),
+        "items": [{
+            "itemId": sku_id,
+            "sellers": [{
+                "sellerId": "1",
+                "commertialOffer": {"Price": preco_stub(sku_id) + (100 if outro else 0), "AvailableQuantity": 10},
+            }],
+        }],
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, como o site real
+
+    def _responder(self, status: int, body: str, content_type: str = "text/html; charset=utf-8"):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        partes = urlsplit(self.path)
+        path = partes.path
+        m = _RE_PRODUTO.match(path)
+        status = _RE_STATUS.match(path)
+        if path.startswith("/desafio/"):
+            self._responder(200, PAGINA_DESAFIO)
+        elif status:
+            codigo = int(status.group(1))
+            self._responder(codigo, PAGINA_NEGADO if codigo == 403 else "<html><body>Erro</body></html>")
+        elif path == "/api/catalog_system/pub/products/search":
+            fq = parse_qs(partes.query).get("fq", [])
+            produtos = []
+            for f in fq[:50]:
+                campo, _, i = f.partition(":")
+                if campo == "productId" and i.isdigit() and int(i) < SKU_DESLOCADO:
+                    produtos.append(produto_api(i))
+                elif campo == "skuId" and i.isdigit():
+                    pid = int(i) - SKU_DESLOCADO if int(i) >= SKU_DESLOCADO else int(i)
+                    produtos.append(produto_api(str(pid), i))
+            body = json.dumps(produtos, ensure_ascii=False)
+            self._responder(200, body, "application/json; charset=utf-8")
+        elif m:
+            self._responder(200, pagina_produto(m.group("slug"), m.group("id")))
+        elif path.startswith("/busca/"):
+            pagina = parse_qs(partes.query).get("page", ["1"])[0]
+            self._responder(200, pagina_busca(unquote(path[len("/busca/"):]), pagina))
+        elif path == "/":
+            self._responder(200, "<html><head><title>Carrefour</title></head><body></body></html>")
+        else:
+            self._responder(404, "<html><body>Not found</body></html>")
+
+    def log_message(self, *args):
+        pass
+
+
+def iniciar_stub(porta: int = 0):
+    """Sobe o stub numa thread; devolve (server, base_url). Encerrar com server.shutdown()."""
+    server = ThreadingHTTPServer(("127.0.0.1", porta), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub local do mercado.carrefour.com.br")
+    parser.add_argument("--porta", type=int, default=8765)
+    args = parser.parse_args()
+    server = ThreadingHTTPServer(("127.0.0.1", args.porta), StubHandler)
+    print(f"🧪 Stub em http://127.0.0.1:{args.porta}/")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""
+Fixtures comuns: o stub do site sobe antes de qualquer módulo do scraper ser
+importado, e CARREFOUR_BASE_URL aponta o catálogo (e o HOME) para ele.
+"""
+
+import os
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from stub_carrefour import iniciar_stub  # noqa: E402
+
+SERVIDOR, BASE = iniciar_stub()
+os.environ["CARREFOUR_BASE_URL"] = BASE
+
+
+def pytest_unconfigure(config):
+    SERVIDOR.shutdown()
+
+
+@pytest.fixture
+def base():
+    return BASE
+
+
+@pytest.fixture
+def pasta_dados(tmp_path, monkeypatch):
+    """Pastas das cidades (Excel, armazém, log longo) num diretório temporário."""
+    import carrefour_comum
+    monkeypatch.setattr(carrefour_comum, "BASE_DIR", str(tmp_path))
+    return tmp_path
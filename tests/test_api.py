@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""Preços em lote pela API de catálogo (stub local)."""
+
+import pytest
+
+from stub_carrefour import ID_COLIDENTE, SKU_DESLOCADO, preco_stub
+from carrefour_catalogo import CATALOGO
+from carrefour_http import build_session, scrape_product_via_http
+from carrefour_api import coletar_por_sku, slug_da_url
+
+PRODUTOS = [e for e in CATALOGO if e["tipo"] == "produto"][:12]
+BUSCA = next(e for e in CATALOGO if e["tipo"] == "busca")
+
+
+@pytest.fixture
+def session():
+    s = build_session()
+    yield s
+    s.close()
+
+
+def test_slug_da_url():
+    assert slug_da_url("https://mercado.carrefour.com.br/arroz-tio-joao-115657/p/") == "arroz-tio-joao-115657"
+
+
+def test_lote_por_product_id(session):
+    tarefas = [("sp", i, e["url"]) for i, e in enumerate(PRODUTOS)]
+    tarefas.append(("sp", 100, BUSCA["url"]))  # busca não tem id: fica para o HTML
+    resultado = coletar_por_sku(tarefas, session)
+    for i, e in enumerate(PRODUTOS):
+        assert resultado[("sp", i)]["Preço"] == preco_stub(e["id"])
+    assert resultado[("sp", 100)] is None
+
+
+def test_numero_que_e_sku_id(session, base):
+    sku = str(SKU_DESLOCADO + 4321)
+    resultado = coletar_por_sku([("sp", 0, f"{base}produto-{sku}/p")], session)
+    assert resultado[("sp", 0)]["Preço"] == preco_stub(sku)
+
+
+def test_id_de_outro_produto_e_rejeitado(session, base):
+    url = f"{base}produto-{ID_COLIDENTE}/p"
+    assert coletar_por_sku([("sp", 0, url)], session) == {("sp", 0): None}
+    # o HTML da própria página dá o preço certo
+    assert scrape_product_via_http(url, session, "SP")["Preço"] == preco_stub(ID_COLIDENTE)
+
+
+def test_slug_diferente_com_o_mesmo_id(session, base):
+    e = PRODUTOS[0]
+    resultado = coletar_por_sku([("sp", 0, f"{base}outro-slug-{e['id']}/p")], session)
+    assert resultado[("sp", 0)] is None
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""Armazém Parquet: migração do Excel antigo do mês."""
+
+import os
+import shutil
+
+import pandas as pd
+
+from carrefour_comum import CIDADES, caminhos_cidade
+from carrefour_armazem import ler_mes, migrar_excel, pasta_mes
+
+BH = CIDADES["bh"]
+MES_LEGADO = "2025-09"  # Excel antigo versionado no repositório (data_bh/)
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _copiar_legado(pasta_dados):
+    destino = pasta_dados / BH["data_dir"]
+    shutil.copytree(os.path.join(RAIZ, BH["data_dir"]), destino)
+    return destino
+
+
+def test_migra_historico_e_dias_so_de_erro(pasta_dados):
+    _copiar_legado(pasta_dados)
+    assert migrar_excel(BH, MES_LEGADO) == 1
+    df = ler_mes(BH, MES_LEGADO)
+    ok, err = df[df["Preço"] > 0], df[df["Preço"] <= 0]
+    assert len(ok) == 35 and ok["URL"].notna().all()  # aba "Historico", não as colunas _x/_y
+    assert len(err) == 62
+    assert set(df["Data"]) == {"2025-09-18"}
+    assert migrar_excel(BH, MES_LEGADO) == 0  # uma vez só
+
+
+def test_mes_escolhe_os_arquivos(pasta_dados):
+    _copiar_legado(pasta_dados)
+    assert migrar_excel(BH, "2025-10") == 0
+    assert not os.path.isdir(pasta_mes(BH, "2025-10"))
+    assert caminhos_cidade(BH, MES_LEGADO)["mensal"].endswith(f"precos_carrefour_bh-{MES_LEGADO}.xlsx")
+
+
+def test_sem_dia_migravel_guarda_copia(pasta_dados):
+    paths = caminhos_cidade(BH, MES_LEGADO)
+    pd.DataFrame({"Nome do Produto": ["Arroz"], "Preço_20250918_x": [27.9]}).to_excel(
+        paths["mensal"], index=False, sheet_name="Precos")
+    assert migrar_excel(BH, MES_LEGADO) == 0
+    assert os.path.exists(paths["mensal"].replace(".xlsx", ".legado.xlsx"))
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+"""Motor assíncrono contra o stub local do site."""
+
+from stub_carrefour import preco_stub
+from carrefour_catalogo import CATALOGO
+from carrefour_async import coletar_http
+
+
+def test_produtos_em_paralelo():
+    produtos = [e for e in CATALOGO if e["tipo"] == "produto"][:12]
+    tarefas = [("sp", i, e["url"]) for i, e in enumerate(produtos)]
+    resultado = coletar_http(tarefas, concorrencia=4)
+    assert len(resultado) == len(produtos)
+    for i, e in enumerate(produtos):
+        assert resultado[("sp", i)]["Preço"] == preco_stub(e["id"])
+
+
+def test_pagina_inexistente_volta_none(base):
+    assert coletar_http([("sp", 0, base + "nao-existe")]) == {("sp", 0): None}
+
+
+def test_sem_tarefas():
+    assert coletar_http([]) == {}
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Backend SQLite: chave (cidade, produto_id, data), upsert e migração do mês."""
+
+import os
+import shutil
+
+import pytest
+
+from carrefour_comum import CIDADES, registro
+from carrefour_armazem import migrar_para_banco
+from carrefour_banco import BancoPrecos, chave_produto
+
+SITE = "https://mercado.carrefour.com.br/"
+BUSCA = SITE + "busca/pao%20frances"
+ARROZ = registro("Teste", SITE + "arroz-tio-joao-2kg-115657/p", "Arroz Tio João 2kg", 27.9)
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def banco(tmp_path):
+    b = BancoPrecos(str(tmp_path / "precos.sqlite"))
+    yield b
+    b.fechar()
+
+
+def test_chave_igual_a_do_excel():
+    assert chave_produto(ARROZ) == "115657"
+    assert chave_produto(registro("Teste", BUSCA, "Pão Francês kg", 15.9)) == "nome:Pão Francês kg"
+    assert chave_produto(registro("Teste", None, "Arroz", 27.9)) == "nome:Arroz"
+    assert chave_produto(registro("Teste", BUSCA, falha="bloqueio")) == BUSCA
+
+
+def test_itens_da_busca_sem_url_nao_se_sobrescrevem(banco):
+    listados = [registro("Teste", BUSCA, "Pão Francês kg", 15.9), registro("Teste", BUSCA, "Pão de Forma", 8.5)]
+    assert banco.gravar(listados, "2025-10-01") == 2
+    assert len(banco.periodo("Teste", "2025-10-01", "2025-10-01")) == 2
+
+
+def test_upsert_falha_nao_apaga_preco(banco):
+    banco.gravar([ARROZ], "2025-10-01")
+    banco.gravar([registro("Teste", ARROZ["URL"], falha="timeout")], "2025-10-01")  # rerun que falhou
+    assert banco.preco("Teste", "115657", "2025-10-01") == 27.9
+    banco.gravar([dict(ARROZ, **{"Preço": 28.5})], "2025-10-01")
+    assert banco.preco("Teste", "115657", "2025-10-01") == 28.5
+    assert banco.dias("Teste", "2025-10") == {"2025-10-01"}
+
+
+def test_migra_o_mes_pedido_para_o_banco(pasta_dados, banco):
+    bh = CIDADES["bh"]
+    shutil.copytree(os.path.join(RAIZ, bh["data_dir"]), pasta_dados / bh["data_dir"])
+    assert migrar_para_banco(bh, banco, "2025-09") == 1
+    df = banco.ler_mes(bh["tag"], "2025-09")
+    assert (df["Preço"] > 0).sum() == 35 and (df["Preço"] <= 0).sum() > 0
+    assert migrar_para_banco(bh, banco, "2025-09") == 0
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""Normalização e deduplicação do catálogo."""
+
+from carrefour_catalogo import SITE, carregar_catalogo, entrada_catalogo, id_produto, normalizar_url
+
+
+def test_normalizar_url():
+    url = "HTTP://Mercado.Carrefour.com.br/arroz-tio-joao-2kg-115657/p/#avaliacoes"
+    assert normalizar_url(url, SITE) == "https://mercado.carrefour.com.br/arroz-tio-joao-2kg-115657/p"
+    # busca: a query é a paginação e fica
+    assert normalizar_url(SITE + "busca/arroz/?page=2", SITE) == SITE + "busca/arroz?page=2"
+
+
+def test_dedupe_pelo_id_do_produto():
+    urls = [
+        SITE + "arroz-branco-tio-joao-2kg-115657/p",
+        SITE + "arroz-tio-joao-tipo-1-2kg-115657/p/",  # slug renomeado, mesmo id
+        SITE + "feijao-carioca-kicaldo-1kg-466506/p",
+        SITE + "busca/pao%20frances",
+        SITE + "busca/pao%20frances#topo",
+        SITE + "busca/pao%20frances?page=2",  # outra página da busca: não é duplicada
+    ]
+    catalogo, duplicadas = carregar_catalogo(urls)
+    assert [e["chave"] for e in catalogo] == [
+        "produto:115657", "produto:466506", "busca:/busca/pao%20frances?", "busca:/busca/pao%20frances?page=2",
+    ]
+    assert len(duplicadas) == 2
+
+
+def test_entrada_tipo_categoria_prioridade():
+    e = entrada_catalogo(SITE + "leite-em-po-integral-ninho-380g-123/p")
+    assert (e["tipo"], e["id"], e["categoria"], e["prioridade"]) == ("produto", "123", "Leite em pó", 1)
+    e = entrada_catalogo(SITE + "busca/cafe%20moido")
+    assert (e["tipo"], e["id"], e["categoria"], e["prioridade"]) == ("busca", None, "Café", 0)
+
+
+def test_id_produto():
+    assert id_produto(SITE + "arroz-tio-joao-2kg-115657/p/") == "115657"
+    assert id_produto(SITE + "busca/arroz") is None
+    assert id_produto(None) is None
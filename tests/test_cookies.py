@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""Sessão regional do Chrome passada ao cliente HTTP (header Cookie)."""
+
+import carrefour_comum
+from carrefour_http import cabecalho_cookies
+
+COOKIES = [
+    {"name": "regiao", "value": "sp", "domain": ".carrefour.com.br"},
+    {"name": "sessao", "value": "1", "domain": "mercado.carrefour.com.br"},
+    {"name": "local", "value": "2", "domain": "127.0.0.1"},
+    {"name": "_ga", "value": "3", "domain": ".google.com"},
+]
+
+
+def test_so_os_cookies_do_site(monkeypatch):
+    monkeypatch.setattr(carrefour_comum, "HOME", "https://mercado.carrefour.com.br/")
+    assert cabecalho_cookies(COOKIES) == "regiao=sp; sessao=1"
+
+
+def test_host_trocado_por_carrefour_base_url(monkeypatch):
+    monkeypatch.setattr(carrefour_comum, "HOME", "http://127.0.0.1:8765/")
+    assert cabecalho_cookies(COOKIES) == "local=2"
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""Diário do dia: o que saiu com preço é reaproveitado num rerun; falhas são refeitas."""
+
+from carrefour_comum import CIDADES, caminhos_cidade, registro
+from carrefour_catalogo import CATALOGO
+from carrefour_diario import Diario, ler_diario
+from scraper_multicidades import Resultados, _tarefas_pendentes
+
+
+def _primeira_execucao():
+    diario = Diario(["sp"], CATALOGO)
+    diario.registrar("sp", 0, registro("SP", CATALOGO[0]["url"], "A", 10.0))
+    diario.registrar("sp", 1, registro("SP", CATALOGO[1]["url"], falha="timeout"))
+    diario.registrar("sp", 2, [registro("SP", CATALOGO[2]["url"], "B", 3.5)])
+    diario.evento("sp", "disjuntor", "aberto")
+    diario.fechar()
+
+
+def test_concluidos_so_com_preco(pasta_dados):
+    _primeira_execucao()
+    feitos = Diario(["sp"], CATALOGO).concluidos("sp")
+    assert set(feitos) == {CATALOGO[0]["chave"], CATALOGO[2]["chave"]}
+
+
+def test_linha_truncada_e_ignorada(pasta_dados):
+    _primeira_execucao()
+    arq = caminhos_cidade(CIDADES["sp"])["diario"]
+    with open(arq, "a", encoding="utf-8") as f:
+        f.write('{"chave": "produto:1", "regis')  # job morto no meio da linha
+    assert len(ler_diario(arq)) == 3
+
+
+def test_falha_refeita_com_sucesso_vale_o_ultimo(pasta_dados):
+    _primeira_execucao()
+    diario = Diario(["sp"], CATALOGO)
+    diario.registrar("sp", 1, registro("SP", CATALOGO[1]["url"], "C", 7.0))
+    diario.fechar()
+    assert CATALOGO[1]["chave"] in Diario(["sp"], CATALOGO).concluidos("sp")
+
+
+def test_rerun_pula_o_que_ja_tem_preco(pasta_dados):
+    _primeira_execucao()
+    diario = Diario(["sp"], CATALOGO)
+    resultados = Resultados(["sp"], diario)
+    tarefas = _tarefas_pendentes(["sp"], resultados, diario, retomar=True)
+    pendentes = [idx for idx, _ in tarefas["sp"]]
+    assert 0 not in pendentes and 2 not in pendentes and 1 in pendentes
+    assert len(pendentes) == len(CATALOGO) - 2
+    assert resultados.tem("sp", 0) and resultados.tem("sp", 2)
+
+    tudo = _tarefas_pendentes(["sp"], Resultados(["sp"]), diario, retomar=False)
+    assert len(tudo["sp"]) == len(CATALOGO)
+    diario.fechar()
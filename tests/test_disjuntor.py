@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""Páginas de bloqueio/erro (HTML e status HTTP) e o disjuntor por cidade."""
+
+import pytest
+
+import carrefour_ritmo
+from carrefour_comum import FALHA_BLOQUEIO, FALHA_DISJUNTOR, FALHA_TIMEOUT, FALHA_VAZIA, classificar_html
+from carrefour_disjuntor import Disjuntor
+from carrefour_http import build_session, scrape_product_via_http
+from carrefour_listagem import registros_do_html, scrape_listagem_via_http
+from carrefour_async import coletar_http
+from scraper_multicidades import FilaCidades
+
+
+@pytest.fixture(autouse=True)
+def ritmo_sem_pausa(monkeypatch):
+    """Controles novos e sem pausa de corte: os bloqueios daqui não atrasam os outros testes."""
+    monkeypatch.setattr(carrefour_ritmo, "_CONTROLES", {})
+    monkeypatch.setitem(carrefour_ritmo.JANELAS, "http", dict(carrefour_ritmo.JANELAS["http"], pausa_corte=0.0))
+
+
+@pytest.fixture
+def session():
+    s = build_session()
+    yield s
+    s.close()
+
+
+# ---- classificação ----
+def test_classificar_html():
+    assert classificar_html("<html><title>Access Denied</title></html>") == FALHA_BLOQUEIO
+    assert classificar_html("<html><body>Ops! Algo deu errado</body></html>") == FALHA_VAZIA
+    assert classificar_html('<script type="application/ld+json">{}</script> captcha') is None
+    assert classificar_html("<html><body><div id='root'></div></body></html>") is None
+
+
+def test_listagem_de_bloqueio_vira_falha():
+    html = "<html><head><title>Access Denied</title></head><body>captcha</body></html>"
+    url = "https://mercado.carrefour.com.br/busca/arroz"
+    assert registros_do_html(html, "SP", url) == [
+        {"Cidade": "SP", "Nome do Produto": "Não encontrado", "Preço": 0.0, "URL": url, "Falha": "bloqueio"},
+    ]
+
+
+@pytest.mark.parametrize("caminho, falha", [
+    ("desafio/arroz-1/p", FALHA_BLOQUEIO),
+    ("status-403/arroz-1/p", FALHA_BLOQUEIO),
+    ("status-429/arroz-1/p", FALHA_BLOQUEIO),
+    ("status-503/arroz-1/p", FALHA_VAZIA),
+    ("status-404/arroz-1/p", None),
+])
+def test_http_bloqueio_por_pagina_e_por_status(session, base, caminho, falha):
+    rec = scrape_product_via_http(base + caminho, session, "SP")
+    assert (rec or {}).get("Falha") == falha
+
+
+def test_http_busca_bloqueada(session, base):
+    recs = scrape_listagem_via_http(base + "status-403/busca/arroz", session, "SP")
+    assert [r["Falha"] for r in recs] == [FALHA_BLOQUEIO]
+
+
+def test_async_para_a_cidade_depois_de_bloqueios_seguidos(base):
+    tarefas = [("sp", i, f"{base}status-403/p-{i}/p") for i in range(20)]
+    tarefas.append(("bh", 99, f"{base}desafio/x-1/p"))
+    resultado = coletar_http(tarefas, concorrencia=1)
+    bloqueados = [rec for (chave, _), rec in resultado.items() if chave == "sp" and rec is not None]
+    assert 5 <= len(bloqueados) < 20  # o resto da cidade ficou para o Chrome
+    assert all(rec["Falha"] == FALHA_BLOQUEIO for rec in bloqueados)
+    assert resultado[("bh", 99)]["Falha"] == FALHA_BLOQUEIO  # outra cidade segue
+
+
+# ---- disjuntor ----
+def _abrir(d: Disjuntor):
+    eventos = [d.registrar(FALHA_BLOQUEIO) for _ in range(d.limite)]
+    assert eventos[-1] == "aberto" and not any(eventos[:-1])
+
+
+def test_disjuntor_abre_testa_e_fecha():
+    d = Disjuntor(limite=3, pausa=10)
+    _abrir(d)
+    assert not d.liberado(d.reabre_em - 1)
+    assert d.liberado(d.reabre_em + 1) and d.estado == "teste"
+    d.servida()
+    assert not d.liberado(d.reabre_em + 1)  # só uma URL de teste por vez
+    assert d.registrar(None) == "fechado"
+    assert d.liberado() and d.seguidas == 0
+
+
+def test_disjuntor_timeout_nao_conta_nem_zera():
+    d = Disjuntor(limite=3)
+    d.registrar(FALHA_BLOQUEIO)
+    d.registrar(FALHA_BLOQUEIO)
+    assert d.registrar(FALHA_TIMEOUT) is None
+    assert d.registrar(FALHA_BLOQUEIO) == "aberto"
+
+
+def test_disjuntor_aborta_depois_de_aberturas_max():
+    d = Disjuntor(limite=2, pausa=1, aberturas_max=2)
+    _abrir(d)
+    d.liberado(d.reabre_em + 1)
+    d.servida()
+    assert d.registrar(FALHA_BLOQUEIO) == "abortado"
+    assert not d.liberado(d.reabre_em + 100)
+
+
+def test_disjuntor_abortado_pula_o_resto_da_cidade():
+    fila = FilaCidades({"sp": [(i, f"u{i}") for i in range(12)], "bh": [(99, "x")]})
+    fila._disjuntores["sp"] = Disjuntor(limite=2, aberturas_max=1)
+    for _ in range(2):
+        chave, idx, url = fila.proxima("sp")
+        fila.resultado(chave, FALHA_BLOQUEIO)
+    assert fila.eventos[-1][:2] == ("sp", "abortado")
+    assert {p[3] for p in fila.puladas} == {FALHA_DISJUNTOR} and len(fila.puladas) == 10
+    assert not fila.reagendar("sp", 0, "u0", FALHA_BLOQUEIO)
+    assert fila.proxima("sp") == ("bh", 99, "x")
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""Fila única de URLs das cidades (ordem, roubo de trabalho, devolução)."""
+
+from carrefour_comum import FALHA_BLOQUEIO
+from carrefour_disjuntor import Disjuntor
+from scraper_multicidades import FilaCidades
+
+
+def test_fila_serve_por_prioridade_e_rouba_do_fim():
+    tarefas = {"sp": [(0, "a"), (1, "b"), (2, "c")], "bh": [(3, "d")]}
+    fila = FilaCidades(tarefas, prioridades={0: 1, 1: 0, 2: 1})
+    assert fila.proxima("sp") == ("sp", 1, "b")
+    assert fila.proxima("rj") == ("sp", 2, "c")  # sem fila própria: pega o final da mais longa
+    assert fila.proxima("bh") == ("bh", 3, "d")
+    assert fila.proxima("bh") == ("sp", 0, "a")
+    assert fila.proxima("sp") is None
+
+
+def test_fila_devolver_volta_na_frente():
+    fila = FilaCidades({"sp": [(0, "a"), (1, "b")]})
+    item = fila.proxima("sp")
+    assert fila.devolver(*item)
+    assert fila.proxima("sp") == item
+
+
+def test_teste_devolvido_libera_outra_url():
+    d = Disjuntor(limite=1, pausa=1)
+    d.registrar(FALHA_BLOQUEIO)
+    d.liberado(d.reabre_em + 1)
+    d.servida()
+    d.devolvida()  # o Chrome caiu com a URL de teste em voo
+    assert d.liberado(d.reabre_em + 1)
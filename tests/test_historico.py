@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""Log longo do mês (historico_*.csv): só anexa, e só o que a execução coletou."""
+
+from carrefour_comum import EXECUCAO, caminhos_cidade, registro
+from carrefour_armazem import anexar_historico, ler_historico
+from scraper_multicidades import Resultados
+
+CIDADE = {"tag": "Teste", "data_dir": "data_teste", "prefixo": "teste_"}
+SITE = "https://mercado.carrefour.com.br/"
+ARROZ = registro("Teste", SITE + "arroz-tio-joao-2kg-115657/p", "Arroz Tio João 2kg", 27.9)
+FEIJAO = registro("Teste", SITE + "feijao-kicaldo-1kg-466506/p", "Feijão Kicaldo 1kg", 8.49)
+CAFE = registro("Teste", SITE + "cafe-melitta-500g-271203/p", falha="timeout")
+
+
+def test_anexa_so_precos_validos_sem_reler(pasta_dados):
+    assert anexar_historico(CIDADE, [ARROZ, CAFE], "2025-10-01") == 1
+    assert anexar_historico(CIDADE, [FEIJAO], "2025-10-02") == 1
+    df = ler_historico(CIDADE)
+    assert df["ID"].tolist() == ["115657", "466506"]
+    assert df["Data"].tolist() == ["2025-10-01", "2025-10-02"]
+    assert set(df["Execução"]) == {EXECUCAO}
+
+
+def test_linha_truncada_e_ignorada(pasta_dados):
+    anexar_historico(CIDADE, [ARROZ], "2025-10-01")
+    with open(caminhos_cidade(CIDADE)["historico"], "a", encoding="utf-8") as f:
+        f.write('Teste,466506,"Feijão Kica')  # job morto no meio da linha
+    assert len(ler_historico(CIDADE)) == 1
+    anexar_historico(CIDADE, [FEIJAO], "2025-10-02")  # a próxima execução não cola na linha cortada
+    assert ler_historico(CIDADE)["ID"].tolist() == ["115657", "466506"]
+
+
+def test_retomados_do_diario_nao_voltam_ao_log():
+    res = Resultados(["t"])
+    res.retomar("t", 0, ARROZ)
+    res.adicionar("t", 1, FEIJAO)
+    assert res.da_cidade("t") == [ARROZ, FEIJAO]
+    assert res.da_cidade("t", so_novos=True) == [FEIJAO]
+    res.adicionar("t", 0, ARROZ)  # coletado de novo nesta execução
+    assert res.da_cidade("t", so_novos=True) == [ARROZ, FEIJAO]
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""Modo HTTP (HTML + JSON-LD, Chrome como fallback) contra o stub local do site."""
+
+import pytest
+
+from stub_carrefour import preco_stub
+from carrefour_catalogo import CATALOGO, SITE, normalizar_url
+from carrefour_http import build_session, scrape_product_via_http
+
+
+@pytest.fixture
+def session():
+    s = build_session()
+    yield s
+    s.close()
+
+
+def test_catalogo_aponta_para_o_stub(base):
+    assert all(e["url"].startswith(base) for e in CATALOGO)
+
+
+def test_normalizar_url_com_base_trocada():
+    base = "http://127.0.0.1:8765/"
+    assert normalizar_url(SITE + "cafe-melitta-500g-271203/p", base) == base + "cafe-melitta-500g-271203/p"
+    assert normalizar_url(base + "busca/cafe", base) == base + "busca/cafe"
+    assert normalizar_url("http://outro.com.br/x", base) == "https://outro.com.br/x"
+
+
+def test_produto_pelo_html(session):
+    e = next(e for e in CATALOGO if e["tipo"] == "produto")
+    rec = scrape_product_via_http(e["url"], session, "SP")
+    assert rec["Preço"] == preco_stub(e["id"])
+    assert rec["URL"] == e["url"]
+    assert "Falha" not in rec
+
+
+def test_pagina_inexistente_cai_para_o_chrome(session, base):
+    assert scrape_product_via_http(base + "nao-existe", session, "SP") is None
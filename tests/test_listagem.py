@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""Extração dos produtos de uma página de busca (JSON-LD e estado embutido), direto e no stub."""
+
+import json
+
+from urllib.parse import unquote, urlsplit
+
+from stub_carrefour import ids_da_busca, pagina_busca, preco_stub
+from carrefour_catalogo import CATALOGO, id_produto
+from carrefour_http import build_session
+from carrefour_async import coletar_http
+from carrefour_listagem import (
+    produtos_da_listagem, produtos_da_listagem_html, registros_do_html, scrape_listagem_via_http,
+)
+
+URL = "https://mercado.carrefour.com.br/busca/arroz"
+
+
+def test_itemlist_e_estado_embutido():
+    produtos = produtos_da_listagem_html(pagina_busca("arroz"), URL)
+    ids = ids_da_busca("arroz")
+    # metade vem do ItemList, metade só do __NEXT_DATA__
+    assert [id_produto(url) for _, _, url in produtos] == ids
+    assert all(preco == preco_stub(id_produto(url)) for _, preco, url in produtos)
+    assert all(url.startswith("https://mercado.carrefour.com.br/arroz-") for _, _, url in produtos)
+
+
+def test_produto_sem_preco_fica_de_fora():
+    ld = json.dumps({"@type": "ItemList", "itemListElement": [
+        {"item": {"@type": "Product", "name": "A", "url": "/a-1/p", "offers": {"price": 0}}},
+        {"item": {"@type": "Product", "name": "B", "url": "/b-2/p", "offers": {"price": "4,99"}}},
+    ]})
+    assert produtos_da_listagem([ld], None, URL) == [
+        ("B", 4.99, "https://mercado.carrefour.com.br/b-2/p"),
+    ]
+
+
+def test_listagem_vazia_vai_para_o_chrome():
+    assert registros_do_html("<html><body><div id='root'></div></body></html>", "SP", URL) is None
+
+
+BUSCA = next(e for e in CATALOGO if e["tipo"] == "busca")
+IDS_BUSCA = ids_da_busca(unquote(urlsplit(BUSCA["url"]).path[len("/busca/"):]))
+
+
+def test_busca_no_stub_pelo_http():
+    session = build_session()
+    try:
+        recs = scrape_listagem_via_http(BUSCA["url"], session, "SP")
+    finally:
+        session.close()
+    assert sorted(id_produto(r["URL"]) for r in recs) == sorted(IDS_BUSCA)
+    assert all(r["Preço"] == preco_stub(id_produto(r["URL"])) for r in recs)
+
+
+def test_busca_no_stub_pelo_async():
+    recs = coletar_http([("sp", 0, BUSCA["url"])])[("sp", 0)]
+    assert sorted(id_produto(r["URL"]) for r in recs) == sorted(IDS_BUSCA)
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""Dia anexado no lugar (índice + XML) x exportação completa do mês."""
+
+import re
+
+import pandas as pd
+
+from carrefour_comum import STAMP_MONTH, caminhos_cidade, registro
+from carrefour_armazem import ABA_ERROS, anexar_dia_excel, exportar_excel, gravar_dia
+from carrefour_planilha import PlanilhaXlsx
+
+CIDADE = {"tag": "Teste", "data_dir": "data_teste", "prefixo": "teste_"}
+SITE = "https://mercado.carrefour.com.br/"
+DIA1, DIA2 = f"{STAMP_MONTH}-01", f"{STAMP_MONTH}-02"
+
+REGISTROS = {
+    DIA1: [
+        registro("Teste", SITE + "arroz-tio-joao-2kg-115657/p", "Arroz Tio João 2kg", 27.9),
+        registro("Teste", SITE + "feijao-kicaldo-1kg-466506/p", "Feijão Kicaldo 1kg", 8.49),
+        registro("Teste", SITE + "busca/pao%20frances", "Pão Francês kg", 15.9),
+        registro("Teste", SITE + "cafe-melitta-500g-271203/p", falha="timeout"),
+    ],
+    DIA2: [
+        # renomeado: mesma linha; produto novo: linha nova
+        registro("Teste", SITE + "arroz-tio-joao-tipo-1-2kg-115657/p", "Arroz Tio João Tipo 1 2kg", 28.5),
+        registro("Teste", SITE + "cafe-melitta-500g-271203/p", "Café Melitta 500g", 19.9),
+        registro("Teste", SITE + "leite-piracanjuba-1l-665017/p", "Leite 1L", 5.39),
+        registro("Teste", SITE + "feijao-kicaldo-1kg-466506/p", falha="sem_preco"),
+    ],
+}
+
+
+def _gravar(data: str):
+    df = pd.DataFrame(REGISTROS[data], columns=["Cidade", "Nome do Produto", "Preço", "URL", "Falha"])
+    gravar_dia(CIDADE, df, data)
+
+
+def _planilhas():
+    paths = caminhos_cidade(CIDADE)
+    precos = pd.read_excel(paths["mensal"], sheet_name="Precos", dtype={"ID": "string"})
+    precos = precos.sort_values(["ID", "Nome do Produto"], ignore_index=True)
+    historico = pd.read_excel(paths["mensal"], sheet_name="Historico", dtype={"ID": "string"})
+    erros = pd.read_excel(paths["erros"], sheet_name=ABA_ERROS)
+    return precos, historico, erros
+
+
+def test_dia_no_lugar_igual_a_exportacao_completa(pasta_dados):
+    _gravar(DIA1)
+    exportar_excel(CIDADE)
+    _gravar(DIA2)
+    assert anexar_dia_excel(CIDADE, REGISTROS[DIA2], DIA2)
+    no_lugar = _planilhas()
+
+    exportar_excel(CIDADE)
+    completa = _planilhas()
+    for a, b in zip(no_lugar, completa):
+        pd.testing.assert_frame_equal(a, b, check_dtype=False)
+
+    precos = completa[0]
+    assert list(precos.columns) == ["ID", "Nome do Produto", f"Preço_{DIA1.replace('-', '')}",
+                                    f"Preço_{DIA2.replace('-', '')}"]
+    assert precos["ID"].tolist()[:4] == ["115657", "271203", "466506", "665017"]
+
+
+def test_rerun_do_dia_substitui_no_lugar(pasta_dados):
+    _gravar(DIA1)
+    exportar_excel(CIDADE)
+    _gravar(DIA2)
+    assert anexar_dia_excel(CIDADE, REGISTROS[DIA2], DIA2)
+    assert anexar_dia_excel(CIDADE, REGISTROS[DIA2], DIA2)
+    precos, historico, erros = _planilhas()
+    assert (historico["Data"] == DIA2).sum() == 3
+    assert (erros["Data"] == DIA2).sum() == 1
+
+
+def test_sem_indice_pede_exportacao_completa(pasta_dados):
+    assert not anexar_dia_excel(CIDADE, REGISTROS[DIA1], DIA1)
+
+
+def test_gravar_celulas_so_toca_as_linhas_dadas(pasta_dados):
+    paths = caminhos_cidade(CIDADE)
+    pd.DataFrame({"ID": ["1", "2", "3"], "Preço_20251001": [1.5, 2.5, 3.5]}).to_excel(
+        paths["mensal"], index=False, sheet_name="Precos")
+    planilha = PlanilhaXlsx(paths["mensal"])
+    antes = planilha._xml("Precos")
+    linha3 = re.search(r'<row r="3".*?</row>', antes).group(0)
+
+    planilha.gravar_celulas("Precos", {(1, 3): "Preço_20251002", (2, 3): 9.9, (2, 2): 1.25, (6, 1): "6"})
+    depois = planilha._xml("Precos")
+    assert linha3 in depois  # linha não tocada: copiada como estava
+    assert depois.index('<row r="6">') > depois.index('<row r="4"')  # linha nova no fim
+    assert '<dimension ref="A1:C6"/>' in depois
+    planilha.salvar()
+
+    df = pd.read_excel(paths["mensal"], sheet_name="Precos", dtype={"ID": "string"})
+    assert df.columns.tolist() == ["ID", "Preço_20251001", "Preço_20251002"]
+    assert df["Preço_20251001"].tolist()[:3] == [1.25, 2.5, 3.5]
+    assert df["Preço_20251002"].tolist()[0] == 9.9
+    assert df["ID"].tolist()[-1] == "6"
+
+
+def test_renomeado_fica_na_mesma_linha_e_sem_id_nao_se_junta(pasta_dados):
+    _gravar(DIA1)
+    _gravar(DIA2)
+    exportar_excel(CIDADE)
+    precos = _planilhas()[0].set_index("ID")
+    arroz = precos.loc["115657"]
+    assert arroz["Nome do Produto"] == "Arroz Tio João Tipo 1 2kg"  # o nome mais recente
+    assert (arroz[f"Preço_{DIA1.replace('-', '')}"], arroz[f"Preço_{DIA2.replace('-', '')}"]) == (27.9, 28.5)
+    assert precos.index.dropna().is_unique
+
+
+def test_itens_de_busca_sem_url_propria_ficam_em_linhas_separadas(pasta_dados):
+    busca = SITE + "busca/pao"
+    df = pd.DataFrame([registro("Teste", busca, "Pão Francês kg", 15.9), registro("Teste", busca, "Pão de Forma", 8.5),
+                       registro("Teste", None, "Café Melitta 500g", 18.9)],
+                      columns=["Cidade", "Nome do Produto", "Preço", "URL", "Falha"])
+    gravar_dia(CIDADE, df, DIA1)  # o café sem URL é um dia migrado do Excel antigo
+    _gravar(DIA2)
+    exportar_excel(CIDADE)
+    precos = _planilhas()[0]
+    paes = precos[precos["Nome do Produto"].str.startswith("Pão")]
+    assert len(paes) == 2 and paes["ID"].isna().all()
+    cafe = precos[precos["ID"] == "271203"]
+    assert len(cafe) == 1 and cafe[f"Preço_{DIA1.replace('-', '')}"].iloc[0] == 18.9  # pegou o id pelo nome
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""Prazo da execução: cesta básica primeiro; o que não cabe é pulado com Falha "prazo"."""
+
+import time
+
+from carrefour_comum import FALHA_PRAZO, ORCAMENTO_URL
+from scraper_multicidades import FilaCidades, Prazo
+
+
+def _prazo(segundos: float) -> Prazo:
+    p = Prazo()
+    p.fim = time.monotonic() + segundos
+    return p
+
+
+def test_sem_prazo():
+    assert Prazo().restante() == float("inf")
+    assert Prazo(1).restante() > 59
+
+
+def test_prioridade_zero_primeiro():
+    fila = FilaCidades({"sp": [(0, "a"), (1, "b"), (2, "c")]}, prioridades={0: 1, 1: 0, 2: 1})
+    assert [fila.proxima("sp")[1] for _ in range(3)] == [1, 0, 2]
+
+
+def test_sem_tempo_para_uma_url_pula_tudo():
+    fila = FilaCidades({"sp": [(0, "a"), (1, "b")]}, prazo=_prazo(ORCAMENTO_URL - 1))
+    assert fila.proxima("sp") is None
+    assert [(p[1], p[3]) for p in fila.puladas] == [(0, FALHA_PRAZO), (1, FALHA_PRAZO)]
+
+
+def test_ritmo_medido_pula_so_a_menor_prioridade():
+    itens = [(i, f"u{i}") for i in range(6)]
+    prioridades = {0: 0, 1: 0, 2: 1, 3: 0, 4: 1, 5: 1}
+    fila = FilaCidades({"sp": itens}, prazo=_prazo(ORCAMENTO_URL + 60), prioridades=prioridades)
+    assert fila.proxima("sp")[1] == 0
+    fila._inicio -= 1000  # centenas de segundos por URL: o resto não cabe em ~80 s
+    servidos = []
+    while (item := fila.proxima("sp")) is not None:
+        servidos.append(item[1])
+    assert servidos == [1, 3]
+    assert sorted(p[1] for p in fila.puladas) == [2, 4, 5]
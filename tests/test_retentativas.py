@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""Política de novas tentativas por classe de falha e a fila de repetições."""
+
+import time
+
+import carrefour_retentativas as r
+from carrefour_comum import FALHA_PRAZO, FALHA_SEM_PRECO, FALHA_TIMEOUT, registro
+from scraper_multicidades import FilaCidades
+
+
+def test_falha_de():
+    assert r.falha_de(registro("SP", "u", "A", 1.0)) is None
+    assert r.falha_de(registro("SP", "u", falha="timeout")) == "timeout"
+    assert r.falha_de([registro("SP", "u", falha="bloqueio")]) == "bloqueio"
+    assert r.falha_de([registro("SP", "u", "A", 1.0), registro("SP", "v", "B", 2.0)]) is None
+    assert r.falha_de(None) is None
+
+
+def test_tentativas_por_classe():
+    assert r.tentativas_max(FALHA_TIMEOUT) == 3
+    assert r.tentativas_max(FALHA_SEM_PRECO) == 2
+    assert r.tentativas_max(FALHA_PRAZO) == 1  # sem política: não repete
+
+
+def test_atraso_exponencial_com_jitter_e_teto():
+    base = r.POLITICAS[FALHA_TIMEOUT]["base"]
+    for tentativa in (1, 2, 3):
+        esperado = base * 2 ** (tentativa - 1)
+        assert all(0.5 * esperado <= r.atraso(FALHA_TIMEOUT, tentativa) <= 1.5 * esperado for _ in range(50))
+    assert r.atraso(FALHA_TIMEOUT, 20) == r.ATRASO_MAX
+
+
+def test_repeticao_sai_depois_do_atraso_e_respeita_o_limite(monkeypatch):
+    monkeypatch.setattr(r, "atraso", lambda falha, tentativa: 0.05)
+    monkeypatch.setattr("scraper_multicidades.atraso", lambda falha, tentativa: 0.05)
+    fila = FilaCidades({"sp": [(0, "a"), (1, "b")]})
+    assert fila.proxima("sp") == ("sp", 0, "a")
+    assert fila.reagendar("sp", 0, "a", FALHA_SEM_PRECO)
+    # a repetição só é servida depois das filas normais
+    assert fila.proxima("sp") == ("sp", 1, "b")
+    inicio = time.monotonic()
+    assert fila.proxima("sp") == ("sp", 0, "a")
+    assert time.monotonic() - inicio >= 0.03
+    # sem_preco: 2 tentativas no total
+    assert not fila.reagendar("sp", 0, "a", FALHA_SEM_PRECO)
+    assert fila.proxima("sp") is None
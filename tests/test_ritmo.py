@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""Controle de ritmo AIMD: cresce devagar com respostas boas, corta pela metade nos sinais de sobrecarga."""
+
+from carrefour_comum import scrape_product_via_json
+from carrefour_ritmo import ControleAIMD, controle, retry_after, sinal_http
+
+
+def _usar_janela(c: ControleAIMD, latencia: float = 0.1):
+    """Uma rodada cheia: ocupa a janela inteira e libera tudo com `ok`."""
+    n = int(c.janela)
+    for _ in range(n):
+        assert c.tentar()
+    for _ in range(n):
+        c.liberar("ok", latencia)
+
+
+def test_crescimento_aditivo():
+    c = ControleAIMD("t", inicial=4, maximo=8)
+    _usar_janela(c)
+    assert 4 < c.janela < 5.5
+    for _ in range(40):
+        _usar_janela(c)
+    assert c.janela == 8
+
+
+def test_nao_cresce_com_janela_ociosa():
+    c = ControleAIMD("t", inicial=4)
+    for _ in range(10):
+        assert c.tentar()
+        c.liberar("ok", 0.1)
+    assert c.janela == 4
+
+
+def test_resposta_lenta_nao_cresce():
+    c = ControleAIMD("t", inicial=2)
+    _usar_janela(c, 0.1)
+    janela = c.janela
+    _usar_janela(c, 5.0)
+    assert c.janela == janela
+
+
+def test_corte_multiplicativo_com_pausa():
+    c = ControleAIMD("t", inicial=8, pausa_corte=0.5)
+    assert c.tentar()
+    c.liberar("limite")
+    assert c.janela == 4
+    assert not c.tentar()  # em pausa
+
+
+def test_rajada_de_erros_corta_uma_vez():
+    c = ControleAIMD("t", inicial=8, pausa_corte=0.0)
+    for _ in range(3):
+        c.tentar()
+    for _ in range(3):
+        c.liberar("servidor")
+    assert c.janela == 4
+
+
+def test_neutro_nao_mexe_na_janela():
+    c = ControleAIMD("t", inicial=4)
+    c.tentar()
+    c.liberar("neutro", 0.1)
+    assert c.janela == 4 and c.base is None
+
+
+def test_sinal_http():
+    assert sinal_http(200, "<html>ok</html>") == "ok"
+    assert sinal_http(429) == "limite"
+    assert sinal_http(503) == "servidor"
+    assert sinal_http(403) == "bloqueio"
+    assert sinal_http(200, "<html><title>Access Denied</title></html>") == "bloqueio"
+    assert retry_after("7") == 7.0 and retry_after("Wed, 21 Oct 2026 07:28:00 GMT") == 0.0
+
+
+class _DriverMorto:
+    def get(self, url):
+        raise RuntimeError("invalid session id")
+
+
+def test_erro_do_driver_nao_conta_como_resposta_boa():
+    url = "https://teste-ritmo.local/a-1/p"
+    c = controle(url, "chrome")
+    janela, base = c.janela, c.base
+    rec = scrape_product_via_json(url, _DriverMorto(), "SP")
+    assert rec["Falha"] == "navegacao"
+    assert c.base == base and c.janela <= janela